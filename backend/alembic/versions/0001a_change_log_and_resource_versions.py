@@ -0,0 +1,60 @@
+"""change log and resource versions
+
+Revision ID: 0001a
+Revises: 0001
+Create Date: 2026-10-19
+
+Tables behind sync deltas and ETags. Kept out of the baseline so databases
+stamped at 0001 (created before migrations existed) get them on upgrade.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001a'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Earlier builds of 0001 already created these tables
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('change_log'):
+        op.create_table('change_log',
+        sa.Column('seq', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('resource', sa.String(), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('is_deleted', sa.Boolean(), nullable=True),
+        sa.Column('changed_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('seq'),
+        sqlite_autoincrement=True
+        )
+        with op.batch_alter_table('change_log', schema=None) as batch_op:
+            batch_op.create_index('ix_change_log_entity', ['user_id', 'resource', 'entity_id', 'seq'], unique=False)
+            batch_op.create_index('ix_change_log_user_seq', ['user_id', 'seq'], unique=False)
+
+    if not inspector.has_table('resource_versions'):
+        op.create_table('resource_versions',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('resource', sa.String(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('user_id', 'resource')
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('resource_versions')
+    with op.batch_alter_table('change_log', schema=None) as batch_op:
+        batch_op.drop_index('ix_change_log_user_seq')
+        batch_op.drop_index('ix_change_log_entity')
+
+    op.drop_table('change_log')
@@ -0,0 +1,161 @@
+"""shared articles
+
+Split feed_items into a shared, content-addressed articles table and a thin
+per-user state table.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def _content_hash(url, title, content):
+    # Same key as the ingestion service: the url, or title + content without one
+    key = url.strip() if url else f"{title}\n{content or ''}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('articles',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('content_hash', sa.String(), nullable=False),
+    sa.Column('source_id', sa.Integer(), nullable=True),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('content', sa.Text(), nullable=True),
+    sa.Column('url', sa.String(), nullable=True),
+    sa.Column('source', sa.String(), nullable=True),
+    sa.Column('feed_type', sa.String(), nullable=True),
+    sa.Column('published_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('fetched_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['source_id'], ['feed_sources.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('articles', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_articles_content_hash'), ['content_hash'], unique=True)
+        batch_op.create_index(batch_op.f('ix_articles_id'), ['id'], unique=False)
+
+    with op.batch_alter_table('feed_items', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('article_id', sa.Integer(), nullable=True))
+
+    # Move content into articles, one row per distinct hash, and point every
+    # per-user row at its article.
+    bind = op.get_bind()
+    feed_items = sa.table('feed_items',
+        sa.column('id', sa.Integer), sa.column('user_id', sa.Integer),
+        sa.column('title', sa.String), sa.column('content', sa.Text), sa.column('url', sa.String),
+        sa.column('source', sa.String), sa.column('feed_type', sa.String),
+        sa.column('published_at', sa.DateTime), sa.column('fetched_at', sa.DateTime),
+        sa.column('source_id', sa.Integer), sa.column('content_hash', sa.String),
+        sa.column('article_id', sa.Integer),
+    )
+    articles = sa.table('articles',
+        sa.column('id', sa.Integer), sa.column('content_hash', sa.String),
+        sa.column('source_id', sa.Integer), sa.column('title', sa.String),
+        sa.column('content', sa.Text), sa.column('url', sa.String), sa.column('source', sa.String),
+        sa.column('feed_type', sa.String), sa.column('published_at', sa.DateTime),
+        sa.column('fetched_at', sa.DateTime),
+    )
+
+    article_ids = {}
+    seen_per_user = set()
+    duplicate_ids = []
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(feed_items).where(feed_items.c.id > last_id).order_by(feed_items.c.id).limit(BATCH_SIZE)
+        ).mappings().all()
+        if not rows:
+            break
+        last_id = rows[-1]['id']
+        for row in rows:
+            content_hash = row['content_hash'] or _content_hash(row['url'], row['title'], row['content'])
+            if content_hash not in article_ids:
+                article_ids[content_hash] = bind.execute(articles.insert().values(
+                    content_hash=content_hash,
+                    source_id=row['source_id'],
+                    title=row['title'],
+                    content=row['content'],
+                    url=row['url'],
+                    source=row['source'],
+                    feed_type=row['feed_type'],
+                    published_at=row['published_at'],
+                    fetched_at=row['fetched_at'],
+                ).returning(articles.c.id)).scalar_one()
+            if (row['user_id'], content_hash) in seen_per_user:
+                # Same article stored twice for one user: keep the oldest row
+                duplicate_ids.append(row['id'])
+                continue
+            seen_per_user.add((row['user_id'], content_hash))
+            bind.execute(feed_items.update().where(feed_items.c.id == row['id']).values(
+                article_id=article_ids[content_hash]
+            ))
+
+    for start in range(0, len(duplicate_ids), BATCH_SIZE):
+        bind.execute(feed_items.delete().where(feed_items.c.id.in_(duplicate_ids[start:start + BATCH_SIZE])))
+
+    with op.batch_alter_table('feed_items', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_feed_items_user_hash', type_='unique')
+        batch_op.drop_constraint('fk_feed_items_source_id', type_='foreignkey')
+        batch_op.drop_column('title')
+        batch_op.drop_column('content')
+        batch_op.drop_column('url')
+        batch_op.drop_column('source')
+        batch_op.drop_column('feed_type')
+        batch_op.drop_column('published_at')
+        batch_op.drop_column('source_id')
+        batch_op.drop_column('content_hash')
+        batch_op.alter_column('article_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key('fk_feed_items_article_id', 'articles', ['article_id'], ['id'])
+        batch_op.create_index(batch_op.f('ix_feed_items_article_id'), ['article_id'], unique=False)
+        batch_op.create_unique_constraint('uq_feed_items_user_article', ['user_id', 'article_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('feed_items', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('title', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('content', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('url', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('source', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('feed_type', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('published_at', sa.DateTime(timezone=True), nullable=True))
+        batch_op.add_column(sa.Column('source_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('content_hash', sa.String(), nullable=True))
+
+    # Copy the shared content back onto every per-user row
+    for column in ('title', 'content', 'url', 'source', 'feed_type', 'published_at', 'source_id', 'content_hash'):
+        op.execute(
+            f"UPDATE feed_items SET {column} = "
+            f"(SELECT articles.{column} FROM articles WHERE articles.id = feed_items.article_id)"
+        )
+
+    with op.batch_alter_table('feed_items', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_feed_items_user_article', type_='unique')
+        batch_op.drop_index(batch_op.f('ix_feed_items_article_id'))
+        batch_op.drop_constraint('fk_feed_items_article_id', type_='foreignkey')
+        batch_op.drop_column('article_id')
+        batch_op.alter_column('title', existing_type=sa.String(), nullable=False)
+        batch_op.create_foreign_key('fk_feed_items_source_id', 'feed_sources', ['source_id'], ['id'])
+        batch_op.create_unique_constraint('uq_feed_items_user_hash', ['user_id', 'content_hash'])
+
+    with op.batch_alter_table('articles', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_articles_id'))
+        batch_op.drop_index(batch_op.f('ix_articles_content_hash'))
+
+    op.drop_table('articles')
@@ -0,0 +1,49 @@
+"""task priority rank
+
+Store a numeric sort key next to each task's priority string (urgent 0,
+high 1, medium 2, low 3, anything else 4) and index open tasks by owner,
+rank and due date. Sorting the string itself ordered priorities
+alphabetically.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, Sequence[str], None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of models.PRIORITY_RANKS at this revision
+PRIORITY_RANKS = {"urgent": 0, "high": 1, "medium": 2, "low": 3}
+UNRANKED = len(PRIORITY_RANKS)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('priority_rank', sa.Integer(), nullable=True))
+
+    tasks = sa.table('tasks', sa.column('priority', sa.String), sa.column('priority_rank', sa.Integer))
+    op.execute(tasks.update().values(
+        priority_rank=sa.case(PRIORITY_RANKS, value=tasks.c.priority, else_=UNRANKED)
+    ))
+
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.alter_column('priority_rank', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_index('ix_tasks_owner_open_priority', ['owner_id', 'is_completed', 'priority_rank', 'due_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_index('ix_tasks_owner_open_priority')
+        batch_op.drop_column('priority_rank')
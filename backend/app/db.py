@@ -1,18 +1,32 @@
 # backend/app/db.py
-from sqlalchemy import create_engine
+from sqlalchemy import cast, create_engine, exists, func, insert, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+import glob
 import os
+import re
 
-# Database URL for SQLite
-DATABASE_URL = "sqlite:///./eunoiaflow.db"
+# Database URL (SQLite by default, PostgreSQL via DATABASE_URL)
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./eunoiaflow.db")
+SQL_ECHO = os.getenv("SQL_ECHO", "true").lower() == "true"  # Set to false in production
+# Startup check that the database is at the latest migration: error, warn or off
+DB_SCHEMA_CHECK = os.getenv("DB_SCHEMA_CHECK", "error").lower()
+# Connections opened at startup so the first requests don't pay for connecting
+DB_POOL_PREWARM = int(os.getenv("DB_POOL_PREWARM", "2"))
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic", "versions")
+
+# Engine with the app's connection settings; also used for replicas and shards
+def create_db_engine(url: str, **kwargs):
+    return create_engine(
+        url,
+        connect_args={"check_same_thread": False} if url.startswith("sqlite") else {},
+        echo=SQL_ECHO,
+        **kwargs
+    )
 
 # Create engine
-engine = create_engine(
-    DATABASE_URL, 
-    connect_args={"check_same_thread": False},
-    echo=True  # Set to False in production
-)
+engine = create_db_engine(DATABASE_URL)
 
 # Session maker
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -20,16 +34,87 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Base class for models
 Base = declarative_base()
 
-# Dependency to get database session
-def get_db():
-    db = SessionLocal()
+# Dependency to get a session on the main database: auth, and every user's
+# data unless sharded storage is on (see app.routers.auth.get_db). Objects stay
+# loaded after commit: the response is built from them right after, and
+# server-generated columns were already read back by the flush
+# (eager_defaults), so no reload is needed.
+def get_directory_db():
+    db = SessionLocal(expire_on_commit=False)
     try:
         yield db
     finally:
         db.close()
 
-# Create all tables
-def create_tables():
-    # Import models here to avoid circular imports
-    from app import models
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+# INSERT that skips rows hitting one of the model's unique constraints
+def insert_ignoring_duplicates(db, model):
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        return insert(model)
+    return dialect_insert(model).on_conflict_do_nothing()
+
+# Filter for rows whose JSON array column has ``value`` as one of its elements
+def json_array_contains(db, column, value):
+    if db.get_bind().dialect.name == "sqlite":
+        elements = func.json_each(column).table_valued("value")
+        return exists().where(elements.c.value == value)
+    from sqlalchemy.dialects.postgresql import JSONB
+    return cast(column, JSONB).contains([value])
+
+class SchemaOutOfDate(RuntimeError):
+    """The database is not at the latest Alembic revision."""
+
+_REVISION = re.compile(r"^revision\b[^=]*=\s*['\"](\w+)['\"]", re.MULTILINE)
+_DOWN_REVISION = re.compile(r"^down_revision\b[^=]*=(.*)$", re.MULTILINE)
+
+# Head revision(s) read from the migration files; much cheaper than importing alembic
+def migration_heads(directory: str = MIGRATIONS_DIR) -> set:
+    revisions, parents = set(), set()
+    for path in glob.glob(os.path.join(directory, "*.py")):
+        with open(path, encoding="utf-8") as f:
+            source = f.read()
+        revision = _REVISION.search(source)
+        if revision is None:
+            continue
+        revisions.add(revision.group(1))
+        down_revision = _DOWN_REVISION.search(source)
+        if down_revision:
+            parents.update(re.findall(r"['\"](\w+)['\"]", down_revision.group(1)))
+    return revisions - parents
+
+# Read-only replacement for the old create_tables() at startup: schema changes go through Alembic
+def check_schema_version(bind=None, hint: str = "alembic upgrade head") -> str:
+    heads = migration_heads()
+    with (bind or engine).connect() as conn:
+        inspector = inspect(conn)
+        has_tables = inspector.has_table("users")
+        if not inspector.has_table("alembic_version"):
+            current = set()
+        else:
+            current = {row[0] for row in conn.execute(text("SELECT version_num FROM alembic_version"))}
+    if current != heads:
+        if not current and has_tables:
+            # Created by the old create_tables() before migrations existed
+            hint = "alembic stamp 0001 && alembic upgrade head"
+        raise SchemaOutOfDate(
+            f"Database is at revision {', '.join(sorted(current)) or '(none)'}, migrations are at "
+            f"{', '.join(sorted(heads))}; run `{hint}`"
+        )
+    return ", ".join(sorted(current))
+
+# Open (and return to the pool) a few connections ahead of the first requests
+def prewarm_pool(connections: int = DB_POOL_PREWARM) -> int:
+    opened = []
+    try:
+        for _ in range(connections):
+            conn = engine.connect()
+            opened.append(conn)
+            conn.execute(text("SELECT 1"))
+    finally:
+        for conn in opened:
+            conn.close()
+    return len(opened)
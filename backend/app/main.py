@@ -1,21 +1,155 @@
 # backend/app/main.py
-from fastapi import FastAPI, Depends, HTTPException, WebSocket, WebSocketDisconnect
+import time
+
+# Reference point for the cold-start report: everything below is import cost
+_import_started = time.perf_counter()
+
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-import json
 import asyncio
-from typing import List
-import os
+import logging
 from dotenv import load_dotenv
 
-from app.db import get_db, create_tables
-from app.routers import auth, tasks, timer, ai, feeds, user_settings
-from app.services.websocket_manager import ConnectionManager
-
+# Load .env before importing modules that read configuration at import time
 load_dotenv()
 
-app = FastAPI(title="EunoiaFlow", description="AI-Powered Productivity Planner", version="1.0.0")
+from app.db import DB_POOL_PREWARM, DB_SCHEMA_CHECK, check_schema_version, engine, prewarm_pool
+from app.metrics import METRICS_ENABLED, MetricsMiddleware, instrument_engine, metrics_response, registry
+from app.profiler import SQL_PROFILER_ENABLED, SQLProfilerMiddleware
+from app.replicas import LAST_WRITE_HEADER, LastWriteMiddleware, replica_router
+from app.sharding import SHARD_COUNT, SHARDING_ENABLED, check_shard_schemas, session_factory_for, shard_engines
+from app.routers import auth, tasks, timer, ai, feeds, user_settings, sync, automation, reading, calendar, planner
+from app.services.websocket_manager import decode_message, manager, websocket_bad_frames_total
+from app.services.password_hasher import password_hasher
+from app.services.feed_ingestion import FEED_INGESTION_ENABLED, FeedIngestionService, feed_ingestion
+from app.services.maintenance import MAINTENANCE_ENABLED, MaintenanceService, maintenance
+from app.services.recurrence import RECURRENCE_ENABLED, RecurrenceScheduler, recurrence_scheduler
+from app.services.automation import AUTOMATION_ENABLED, automation_engine
+from app.services.job_scheduler import SCHEDULER_ENABLED, job_scheduler
+from app.services.reading_progress import reading_progress
+from app.services.settings_cache import SETTINGS_CACHE_ENABLED, SettingsInvalidationPoller, settings_invalidation
+from app.services.write_batcher import WRITE_BATCHING_ENABLED, write_batcher
+from app.services.ai_service import AI_PREWARM, prewarm_ai_service
+
+# uvicorn's own logger, so the startup report shows up without extra logging setup
+logger = logging.getLogger("uvicorn.error")
+
+app_startup_seconds = registry.gauge(
+    "app_startup_seconds", "Time spent in each cold-start phase of this worker.", ("phase",)
+)
+_import_seconds = time.perf_counter() - _import_started
+
+async def _prewarm_ai():
+    started = time.perf_counter()
+    try:
+        if await asyncio.to_thread(prewarm_ai_service):
+            app_startup_seconds.set(time.perf_counter() - started, phase="ai_prewarm")
+            logger.info("AI client ready in %.0f ms", (time.perf_counter() - started) * 1000)
+    except Exception as e:
+        logger.warning("AI client prewarm failed: %s", e)
+
+def _shard_services() -> list:
+    """Per-database background services for each shard (the singletons cover the main database)."""
+    services = []
+    for shard in range(SHARD_COUNT):
+        session_factory = session_factory_for(shard)
+        if FEED_INGESTION_ENABLED:
+            services.append(FeedIngestionService(session_factory=session_factory))
+        if MAINTENANCE_ENABLED:
+            services.append(MaintenanceService(session_factory=session_factory))
+        if RECURRENCE_ENABLED:
+            services.append(RecurrenceScheduler(session_factory=session_factory))
+        if SETTINGS_CACHE_ENABLED:
+            services.append(SettingsInvalidationPoller(session_factory=session_factory))
+    return services
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    phases = {"imports": _import_seconds}
+    started = time.perf_counter()
+    if DB_SCHEMA_CHECK != "off":
+        try:
+            check_schema_version()
+        except Exception as e:
+            if DB_SCHEMA_CHECK == "error":
+                raise
+            logger.warning("Database schema check failed: %s", e)
+        if SHARDING_ENABLED:
+            try:
+                check_shard_schemas()
+            except Exception as e:
+                if DB_SCHEMA_CHECK == "error":
+                    raise
+                logger.warning("Shard schema check failed: %s", e)
+    phases["schema_check"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    prewarm_pool(DB_POOL_PREWARM)
+    phases["db_prewarm"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    if FEED_INGESTION_ENABLED:
+        feed_ingestion.start()
+    if MAINTENANCE_ENABLED:
+        maintenance.start()
+    if RECURRENCE_ENABLED:
+        recurrence_scheduler.start()
+    shard_services = _shard_services() if SHARDING_ENABLED else []
+    for service in shard_services:
+        service.start()
+    if SHARDING_ENABLED:
+        # These keep per-database state (job ids, one write transaction) and
+        # only know the main database
+        skipped = [name for name, enabled in (
+            ("automation", AUTOMATION_ENABLED), ("job scheduler", SCHEDULER_ENABLED),
+            ("write batching", WRITE_BATCHING_ENABLED)
+        ) if enabled]
+        if skipped:
+            logger.warning("Sharded storage: not starting %s", ", ".join(skipped))
+    else:
+        if AUTOMATION_ENABLED:
+            automation_engine.start()
+        if SCHEDULER_ENABLED:
+            job_scheduler.start()
+        if WRITE_BATCHING_ENABLED:
+            write_batcher.start()
+    reading_progress.start()
+    if SETTINGS_CACHE_ENABLED:
+        settings_invalidation.start()
+    # Reads stay on the primary until the first lag check
+    replica_router.start()
+    phases["services"] = time.perf_counter() - started
+
+    # Not awaited: the openai import shouldn't delay readiness
+    ai_prewarm = asyncio.create_task(_prewarm_ai()) if AI_PREWARM else None
+
+    phases["total"] = time.perf_counter() - _import_started
+    for phase, seconds in phases.items():
+        app_startup_seconds.set(seconds, phase=phase)
+    logger.info("Cold start: %s", ", ".join(f"{phase} {seconds * 1000:.0f} ms" for phase, seconds in phases.items()))
+
+    yield
+
+    if ai_prewarm is not None:
+        ai_prewarm.cancel()
+    await write_batcher.stop()
+    await feed_ingestion.stop()
+    await maintenance.stop()
+    await recurrence_scheduler.stop()
+    for service in shard_services:
+        await service.stop()
+    await job_scheduler.stop()
+    await reading_progress.stop()
+    await settings_invalidation.stop()
+    await automation_engine.stop()
+    await replica_router.stop()
+    shard_engines.dispose()
+    for replica_engine in replica_router.engines:
+        replica_engine.dispose()
+    password_hasher.shutdown()
+
+app = FastAPI(title="EunoiaFlow", description="AI-Powered Productivity Planner", version="1.0.0", lifespan=lifespan)
 
 # CORS middleware
 app.add_middleware(
@@ -24,13 +158,24 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[LAST_WRITE_HEADER],
 )
 
-# Create database tables on startup
-create_tables()
+# Read-your-writes across workers: clients echo the X-Last-Write of their last write
+if replica_router.enabled:
+    app.add_middleware(LastWriteMiddleware)
 
-# WebSocket manager
-manager = ConnectionManager()
+# Per-route latency, in-flight requests and DB usage, served at /metrics
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    instrument_engine(engine)
+    shard_engines.on_open.append(lambda shard_engine: instrument_engine(shard_engine, pool_gauges=False))
+    for replica_engine in replica_router.engines:
+        instrument_engine(replica_engine, pool_gauges=False)
+
+# Debug aid: per-request SQL report in X-SQL-* headers and the log
+if SQL_PROFILER_ENABLED:
+    app.add_middleware(SQLProfilerMiddleware, engine=engine)
 
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["authentication"])
@@ -39,6 +184,11 @@ app.include_router(timer.router, prefix="/api/timer", tags=["timer"])
 app.include_router(ai.router, prefix="/api/ai", tags=["ai"])
 app.include_router(feeds.router, prefix="/api/feeds", tags=["feeds"])
 app.include_router(user_settings.settings_router, prefix="/api/settings", tags=["settings"])
+app.include_router(sync.router, prefix="/api/sync", tags=["sync"])
+app.include_router(automation.router, prefix="/api/automation", tags=["automation"])
+app.include_router(reading.router, prefix="/api/reading", tags=["reading"])
+app.include_router(calendar.router, prefix="/api/calendar", tags=["calendar"])
+app.include_router(planner.router, prefix="/api/plan", tags=["planner"])
 
 @app.get("/")
 async def root():
@@ -48,28 +198,42 @@ async def root():
 async def health():
     return {"status": "healthy"}
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return metrics_response()
+
 # WebSocket endpoint for real-time features
 @app.websocket("/ws/{client_id}")
 async def websocket_endpoint(websocket: WebSocket, client_id: str):
     await manager.connect(websocket, client_id)
     try:
         while True:
-            data = await websocket.receive_text()
-            message_data = json.loads(data)
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000))
+            try:
+                message_data = decode_message(frame, manager.get_encoding(client_id))
+            except ValueError as e:
+                # One bad frame shouldn't cost the client its connection
+                websocket_bad_frames_total.inc()
+                logger.debug("Ignoring WebSocket frame from %s: %s", client_id, e)
+                continue
             
             # Handle different message types
             if message_data.get("type") == "timer_update":
                 # Broadcast timer updates to all connected clients of this user
-                await manager.send_personal_message(json.dumps({
+                await manager.send_personal_message({
                     "type": "timer_update",
                     "data": message_data.get("data")
-                }), client_id)
+                }, client_id)
             elif message_data.get("type") == "ai_chat":
                 # Handle AI chat streaming (will be implemented in ai service)
-                await manager.send_personal_message(json.dumps({
+                await manager.send_personal_message({
                     "type": "ai_response",
                     "data": "Processing your request..."
-                }), client_id)
+                }, client_id)
                 
     except WebSocketDisconnect:
         manager.disconnect(client_id)
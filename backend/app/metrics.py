@@ -0,0 +1,375 @@
+# backend/app/metrics.py
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import os
+import re
+import threading
+import time
+
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import event
+
+# In-process metrics in the Prometheus text format. Each API worker keeps its
+# own registry, so scrape every worker (or run one worker per target).
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}" for key, v in values]
+
+
+class Gauge(Metric):
+    """A value that goes up and down, or is read from ``function`` at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        function: Optional[Callable[[], float]] = None
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.function = function
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def get(self, **labels) -> float:
+        if self.function is not None:
+            return self.function()
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        if self.function is not None:
+            try:
+                return [f"{self.name} {_format_value(self.function())}"]
+            except Exception:
+                return []
+        with self._lock:
+            values = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}" for key, v in values]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket (+Inf last), sum]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def get_count(self, **labels) -> int:
+        state = self._values.get(self._key(labels))
+        return sum(state[0]) if state else 0
+
+    def get_sum(self, **labels) -> float:
+        state = self._values.get(self._key(labels))
+        return state[1] if state else 0.0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = [(key, list(counts), total) for key, (counts, total) in self._values.items()]
+        lines = []
+        for key, counts, total in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = (), function=None) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames, function))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+registry = Registry()
+
+# HTTP
+http_requests_total = registry.counter(
+    "http_requests_total", "HTTP requests by route template and status.", ("method", "route", "status")
+)
+http_request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency.", ("method", "route")
+)
+http_requests_in_progress = registry.gauge(
+    "http_requests_in_progress", "HTTP requests currently being served."
+)
+http_request_db_queries = registry.histogram(
+    "http_request_db_queries", "Database queries issued per HTTP request.", ("method", "route"),
+    buckets=QUERY_COUNT_BUCKETS
+)
+http_request_db_seconds = registry.histogram(
+    "http_request_db_seconds", "Time spent in database queries per HTTP request.", ("method", "route")
+)
+
+# Database
+db_queries_total = registry.counter(
+    "db_queries_total", "Database queries by route, statement type and table.", ("route", "operation", "table")
+)
+db_query_seconds_total = registry.counter(
+    "db_query_seconds_total", "Time spent in database queries by route, statement type and table.",
+    ("route", "operation", "table")
+)
+db_query_duration_seconds = registry.histogram(
+    "db_query_duration_seconds", "Database query latency.", ("operation",), buckets=QUERY_BUCKETS
+)
+db_pool_checkouts_total = registry.counter(
+    "db_pool_checkouts_total", "Connections checked out of the pool."
+)
+db_pool_connections_total = registry.counter(
+    "db_pool_connections_total", "New DBAPI connections opened by the pool."
+)
+
+
+def route_template(scope) -> Optional[str]:
+    """
+    Path template of the matched route, e.g. /api/tasks/{task_id}. Routing
+    stores the route in the (shared) scope; depending on the FastAPI version
+    its path may lack the router prefix, which is taken from the request path.
+    """
+    path = getattr(scope.get("route"), "path", None)
+    if path is None:
+        return None
+    tail = path.count("/")
+    prefix = scope["path"].split("/")[:-tail]
+    return "/".join(prefix) + path
+
+
+class RequestStats:
+    __slots__ = ("scope", "queries", "db_seconds", "_route")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.queries = 0
+        self.db_seconds = 0.0
+        self._route = None
+
+    @property
+    def route(self) -> str:
+        if self._route is None:
+            self._route = route_template(self.scope)
+        return self._route or "unmatched"
+
+
+# Set by the middleware; shared with the threadpool that runs sync endpoints
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+_TABLE_PATTERN = re.compile(r'\b(?:FROM|INTO|UPDATE|JOIN)\s+"?(\w+)"?', re.IGNORECASE)
+
+
+def _classify(statement: str) -> Tuple[str, str]:
+    """(operation, first table) of a SQL statement, for low-cardinality labels."""
+    stripped = statement.lstrip()
+    operation = stripped.split(None, 1)[0].upper() if stripped else "OTHER"
+    if operation not in ("SELECT", "INSERT", "UPDATE", "DELETE"):
+        return "OTHER", ""
+    match = _TABLE_PATTERN.search(stripped)
+    return operation, match.group(1) if match else ""
+
+
+def instrument_engine(engine, pool_gauges: bool = True):
+    """Count and time every query and pool checkout on ``engine``."""
+    pool = engine.pool
+    # Only for the main engine: shard engines come and go (app.sharding), replicas are reported by app.replicas
+    if pool_gauges and hasattr(pool, "checkedout"):
+        registry.gauge("db_pool_checked_out", "Connections currently checked out of the pool.",
+                       function=pool.checkedout)
+    if pool_gauges and hasattr(pool, "size"):
+        registry.gauge("db_pool_size", "Configured pool size.", function=pool.size)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        operation, table = _classify(statement)
+        stats = _request_stats.get()
+        route = stats.route if stats is not None else "background"
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += elapsed
+        db_query_duration_seconds.observe(elapsed, operation=operation)
+        db_queries_total.inc(route=route, operation=operation, table=table)
+        db_query_seconds_total.inc(elapsed, route=route, operation=operation, table=table)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(context):
+        conn = context.connection
+        if conn is not None and conn.info.get("query_start"):
+            conn.info["query_start"].pop()
+
+    @event.listens_for(pool, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        db_pool_checkouts_total.inc()
+
+    @event.listens_for(pool, "connect")
+    def _connect(dbapi_connection, connection_record):
+        db_pool_connections_total.inc()
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording per-route latency, status and DB usage. Routes
+    are labelled by their path template, so /api/tasks/1 and /api/tasks/2
+    share a series.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = _request_stats.set(stats)
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_progress.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_progress.dec()
+            _request_stats.reset(token)
+            route_path = stats.route
+            method = scope["method"]
+            http_requests_total.inc(method=method, route=route_path, status=str(status_code))
+            http_request_duration_seconds.observe(elapsed, method=method, route=route_path)
+            http_request_db_queries.observe(stats.queries, method=method, route=route_path)
+            http_request_db_seconds.observe(stats.db_seconds, method=method, route=route_path)
+
+
+def metrics_response() -> PlainTextResponse:
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
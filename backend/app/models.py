@@ -1,11 +1,27 @@
 # backend/app/models.py
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, Text, ForeignKey, JSON
-from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, Date, DateTime, Boolean, Float, Text, ForeignKey, JSON, Index, UniqueConstraint
+from sqlalchemy.orm import relationship, validates
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.sql import func, null
 from app.db import Base
 
+# Read server-generated columns (created_at, updated_at) back with RETURNING in
+# the INSERT/UPDATE itself, so write endpoints don't need a refresh() SELECT.
+# updated_at is inserted as an explicit SQL NULL: a column with only an
+# onupdate expression would otherwise be re-selected after every INSERT.
+EAGER_DEFAULTS = {"eager_defaults": True}
+
+# Sort key for task priorities: lower ranks come first
+PRIORITY_RANKS = {"urgent": 0, "high": 1, "medium": 2, "low": 3}
+# Unknown or missing priorities sort after low
+UNRANKED = len(PRIORITY_RANKS)
+
+def priority_rank(priority) -> int:
+    return PRIORITY_RANKS.get(priority, UNRANKED)
+
 class User(Base):
     __tablename__ = "users"
+    __mapper_args__ = EAGER_DEFAULTS
     
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
@@ -13,8 +29,10 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     full_name = Column(String)
     is_active = Column(Boolean, default=True)
+    # Sharded storage: the shard file holding the user's data (NULL: this database)
+    shard = Column(Integer, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), default=null(), onupdate=func.now())
     
     # Relationships
     tasks = relationship("Task", back_populates="owner")
@@ -24,6 +42,7 @@ class User(Base):
 
 class UserSettings(Base):
     __tablename__ = "user_settings"
+    __mapper_args__ = EAGER_DEFAULTS
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), unique=True)
@@ -50,13 +69,14 @@ class UserSettings(Base):
     domains_of_interest = Column(JSON, default=["AI/ML", "productivity", "technology"])
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), default=null(), onupdate=func.now())
     
     # Relationships
     user = relationship("User", back_populates="user_settings")
 
 class Task(Base):
     __tablename__ = "tasks"
+    __mapper_args__ = EAGER_DEFAULTS
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -65,12 +85,14 @@ class Task(Base):
     # Status and priority
     is_completed = Column(Boolean, default=False)
     priority = Column(String, default="medium")  # low, medium, high, urgent
+    # Kept in step with priority by the ORM; raw inserts must set it too
+    priority_rank = Column(Integer, nullable=False, default=PRIORITY_RANKS["medium"])
     
     # Dates
     due_date = Column(DateTime(timezone=True))
     completed_at = Column(DateTime(timezone=True))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), default=null(), onupdate=func.now())
     
     # Organization
     tags = Column(JSON, default=[])
@@ -79,13 +101,35 @@ class Task(Base):
     # Recurrence (for repeating tasks)
     is_recurring = Column(Boolean, default=False)
     recurrence_pattern = Column(JSON)  # {"type": "daily", "interval": 1, "end_date": null}
+    # Series: occurrences exist up to generated_until; next_at is the next one
+    # still to materialize (NULL once the series has ended)
+    recurrence_generated_until = Column(Date)
+    recurrence_next_at = Column(Date, index=True)
+    # Occurrence: the series it was generated from
+    recurrence_parent_id = Column(Integer, ForeignKey("tasks.id"), index=True)
+    occurrence_date = Column(Date)
     
     # Relationships
     owner_id = Column(Integer, ForeignKey("users.id"))
     owner = relationship("User", back_populates="tasks")
+    
+    __table_args__ = (
+        UniqueConstraint("recurrence_parent_id", "occurrence_date", name="uq_tasks_recurrence_occurrence"),
+        Index("ix_tasks_due_date", "due_date"),
+        # Open tasks by priority, then due date: "what's next" reads it in order
+        Index("ix_tasks_owner_open_priority", "owner_id", "is_completed", "priority_rank", "due_date"),
+        # A user's tasks due in a date range, in order (calendar)
+        Index("ix_tasks_owner_due", "owner_id", "due_date"),
+    )
+    
+    @validates("priority")
+    def _set_priority_rank(self, key, value):
+        self.priority_rank = priority_rank(value)
+        return value
 
 class TimerSession(Base):
     __tablename__ = "timer_sessions"
+    __mapper_args__ = EAGER_DEFAULTS
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -110,22 +154,64 @@ class TimerSession(Base):
     
     # Relationships
     user = relationship("User", back_populates="timer_sessions")
+    
+    __table_args__ = (
+        Index("ix_timer_sessions_started_at", "started_at"),  # retention scans
+        Index("ix_timer_sessions_user_started", "user_id", "started_at"),  # calendar ranges
+    )
 
-class FeedItem(Base):
-    __tablename__ = "feed_items"
+class TimerSessionRollup(Base):
+    __tablename__ = "timer_session_rollups"
     
+    # Daily aggregate of timer sessions that were compacted by the maintenance job
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    day = Column(Date, nullable=False)
+    session_type = Column(String, nullable=False)
+    
+    session_count = Column(Integer, default=0)
+    completed_count = Column(Integer, default=0)
+    total_duration = Column(Integer, default=0)  # sum of duration_actual in seconds
+    interruptions = Column(Integer, default=0)
+    
+    __table_args__ = (
+        UniqueConstraint("user_id", "day", "session_type", name="uq_timer_rollups_user_day_type"),
+    )
+
+def _article_field(name):
+    """Read-through attribute to the shared Article, usable in queries as Article.<name>."""
+    prop = hybrid_property(lambda self: getattr(self.article, name) if self.article else None)
+    return prop.expression(lambda cls: getattr(Article, name))
+
+class Article(Base):
+    __tablename__ = "articles"
+    
+    # Shared, content-addressed feed content: stored once however many users see it
+    id = Column(Integer, primary_key=True, index=True)
+    content_hash = Column(String, unique=True, index=True, nullable=False)  # hash of the url (or title + content)
+    source_id = Column(Integer, ForeignKey("feed_sources.id"), nullable=True)
     
     # Content
     title = Column(String, nullable=False)
     content = Column(Text)
     url = Column(String)
     source = Column(String)  # RSS feed name, API source, etc.
+    feed_type = Column(String)  # news, fact, paper, article
+    
+    # Timestamps
+    published_at = Column(DateTime(timezone=True))
+    fetched_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class FeedItem(Base):
+    __tablename__ = "feed_items"
+    
+    # Thin per-user state over a shared Article
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"))
+    article_id = Column(Integer, ForeignKey("articles.id"), nullable=False, index=True)
     
     # Metadata
-    category = Column(String)  # AI/ML, productivity, news, facts, etc.
-    feed_type = Column(String)  # news, fact, paper, article
+    category = Column(String)  # AI/ML, productivity, news, facts, etc. (per subscription)
     
     # User interaction
     is_read = Column(Boolean, default=False)
@@ -133,14 +219,80 @@ class FeedItem(Base):
     is_archived = Column(Boolean, default=False)
     
     # Timestamps
-    published_at = Column(DateTime(timezone=True))
     fetched_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
     user = relationship("User", back_populates="feed_items")
+    article = relationship("Article", lazy="joined", innerjoin=True)
+    
+    # Article content, read through so FeedItem keeps its API shape
+    title = _article_field("title")
+    content = _article_field("content")
+    url = _article_field("url")
+    source = _article_field("source")
+    feed_type = _article_field("feed_type")
+    published_at = _article_field("published_at")
+    
+    __table_args__ = (
+        UniqueConstraint("user_id", "article_id", name="uq_feed_items_user_article"),
+        Index("ix_feed_items_fetched_at", "fetched_at"),  # retention scans
+    )
+
+class ExpiredFeedItem(Base):
+    __tablename__ = "expired_feed_items"
+    
+    # Feed items removed by retention, by article content hash, so ingestion
+    # doesn't hand the article to the user again while it's still in the feed
+    # (the shared article may be purged and stored again with a new id)
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    content_hash = Column(String, primary_key=True)
+    expired_at = Column(DateTime, nullable=False, server_default=func.now())
+    
+    __table_args__ = (
+        Index("ix_expired_feed_items_expired_at", "expired_at"),  # pruning
+    )
+
+class FeedSource(Base):
+    __tablename__ = "feed_sources"
+    
+    # One row per RSS/Atom URL, shared by every subscriber so it is fetched once
+    id = Column(Integer, primary_key=True, index=True)
+    url = Column(String, unique=True, index=True, nullable=False)
+    title = Column(String)
+    category = Column(String)
+    feed_type = Column(String, default="article")
+    
+    # Conditional request state
+    etag = Column(String)
+    last_modified = Column(String)
+    last_fetched_at = Column(DateTime(timezone=True))
+    last_status = Column(Integer)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relationships
+    subscriptions = relationship("FeedSubscription", back_populates="source")
+
+class FeedSubscription(Base):
+    __tablename__ = "feed_subscriptions"
+    __mapper_args__ = EAGER_DEFAULTS
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    source_id = Column(Integer, ForeignKey("feed_sources.id"), nullable=False, index=True)
+    category = Column(String)  # overrides the source category for this user
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relationships
+    source = relationship("FeedSource", back_populates="subscriptions")
+    
+    __table_args__ = (
+        UniqueConstraint("user_id", "source_id", name="uq_feed_subscriptions_user_source"),
+    )
 
 class ReadingItem(Base):
     __tablename__ = "reading_items"
+    __mapper_args__ = EAGER_DEFAULTS
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -170,10 +322,32 @@ class ReadingItem(Base):
     
     # Notes and highlights
     notes = Column(Text)
-    highlights = Column(JSON, default=[])
+    # Highlights are appended as rows instead of rewriting a JSON array
+    highlights = relationship("ReadingHighlight", order_by="ReadingHighlight.id")
+
+    __table_args__ = (
+        Index("ix_reading_items_user_status_added", "user_id", "status", "added_at"),
+    )
+
+class ReadingHighlight(Base):
+    __tablename__ = "reading_highlights"
+    __mapper_args__ = EAGER_DEFAULTS
+
+    id = Column(Integer, primary_key=True, index=True)
+    reading_item_id = Column(Integer, ForeignKey("reading_items.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+
+    text = Column(Text, nullable=False)
+    note = Column(Text)
+    page = Column(Integer)
+    location = Column(String)  # reader-specific position, e.g. an EPUB CFI
+    color = Column(String)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 class AutomationRule(Base):
     __tablename__ = "automation_rules"
+    __mapper_args__ = EAGER_DEFAULTS
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -195,4 +369,89 @@ class AutomationRule(Base):
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), default=null(), onupdate=func.now())
+    
+    # Rule index loads all of a user's rules; dispatch filters by trigger type
+    __table_args__ = (
+        Index("ix_automation_rules_user_trigger", "user_id", "trigger_type"),
+    )
+
+class ScheduledJob(Base):
+    __tablename__ = "scheduled_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    
+    # What fires: task_reminder (ref = task), automation_rule (ref = rule),
+    # timer_end (ref = timer session)
+    kind = Column(String, nullable=False)
+    ref_id = Column(Integer, nullable=False)
+    fire_at = Column(DateTime, nullable=False)
+    payload = Column(JSON)
+    
+    # pending -> claimed -> done, or cancelled / failed. A worker owns a job
+    # only if its conditional pending -> claimed UPDATE matched.
+    status = Column(String, nullable=False, default="pending")
+    claimed_by = Column(String)
+    claimed_at = Column(DateTime)
+    attempts = Column(Integer, nullable=False, default=0)
+    fired_at = Column(DateTime)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        UniqueConstraint("kind", "ref_id", "fire_at", name="uq_scheduled_jobs_kind_ref_fire_at"),
+        Index("ix_scheduled_jobs_status_fire_at", "status", "fire_at"),
+    )
+
+class ResourceVersion(Base):
+    __tablename__ = "resource_versions"
+    
+    # One counter per user and resource ("tasks", "timer", "feeds", "settings"),
+    # bumped in the same transaction as every mutation of that resource.
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    resource = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+class FeedCounter(Base):
+    __tablename__ = "feed_counters"
+    
+    # Per-user, per-category feed item counts, adjusted in the same transaction
+    # as every insert, state change and delete of feed items. Items without a
+    # category are counted under "".
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    category = Column(String, primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    unread = Column(Integer, nullable=False, default=0)
+    bookmarked = Column(Integer, nullable=False, default=0)
+
+
+class ChangeLogEntry(Base):
+    __tablename__ = "change_log"
+    
+    # Monotonic sequence; clients sync from the last seq they have seen
+    seq = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    
+    # What changed: resource is one of tasks, timer, feeds, settings
+    resource = Column(String, nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    is_deleted = Column(Boolean, default=False)  # tombstone
+    
+    changed_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        Index("ix_change_log_user_seq", "user_id", "seq"),
+        Index("ix_change_log_entity", "user_id", "resource", "entity_id", "seq"),
+        {"sqlite_autoincrement": True},  # never reuse sequence numbers
+    )
+
+class ServiceLease(Base):
+    __tablename__ = "service_leases"
+    
+    # One row per background job that must run in a single worker at a time
+    # (maintenance). A worker holds the lease while expires_at is in the future
+    # and its conditional UPDATE claimed or renewed the row.
+    name = Column(String, primary_key=True)
+    holder = Column(String)
+    expires_at = Column(DateTime, nullable=False)
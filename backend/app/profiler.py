@@ -0,0 +1,162 @@
+# backend/app/profiler.py
+from collections import Counter
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+import logging
+import os
+import re
+import threading
+import time
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# Opt-in: per-request SQL report in response headers and the log (debug use)
+SQL_PROFILER_ENABLED = os.getenv("SQL_PROFILER_ENABLED", "false").lower() == "true"
+# The same statement run this many times in one request is flagged as N+1
+SQL_PROFILER_REPEAT_THRESHOLD = int(os.getenv("SQL_PROFILER_REPEAT_THRESHOLD", "3"))
+# Requests issuing more queries than this are logged as warnings
+SQL_PROFILER_WARN_QUERIES = int(os.getenv("SQL_PROFILER_WARN_QUERIES", "20"))
+
+# Collapse expanded IN lists so "IN (?, ?)" and "IN (?, ?, ?)" count as one statement
+_IN_LIST = re.compile(r"\((?:\s*(?:\?|%\(\w+\)s|:\w+)\s*,)+\s*(?:\?|%\(\w+\)s|:\w+)\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    return _IN_LIST.sub("(...)", _WHITESPACE.sub(" ", statement).strip())
+
+
+class QueryProfile:
+    """Statements and timings collected over one request or code block."""
+
+    def __init__(self):
+        self.statements: List[Tuple[str, float]] = []
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, duration: float):
+        with self._lock:
+            self.statements.append((normalize_statement(statement), duration))
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def total_time(self) -> float:
+        return sum(duration for _, duration in self.statements)
+
+    def repeated(self, threshold: int = SQL_PROFILER_REPEAT_THRESHOLD) -> List[Tuple[str, int]]:
+        """Statements run at least ``threshold`` times, most frequent first (likely N+1 loops)."""
+        counts = Counter(statement for statement, _ in self.statements)
+        return [(statement, n) for statement, n in counts.most_common() if n >= threshold]
+
+    def report(self, threshold: int = SQL_PROFILER_REPEAT_THRESHOLD) -> str:
+        lines = [f"{self.count} queries in {self.total_time * 1000:.1f} ms"]
+        for statement, n in self.repeated(threshold):
+            lines.append(f"  repeated {n}x: {statement[:200]}")
+        return "\n".join(lines)
+
+
+# Profile of the request being served; shared with the threadpool running sync endpoints
+_current_profile: ContextVar[Optional[QueryProfile]] = ContextVar("sql_profile", default=None)
+
+# Profiles that collect from every thread, e.g. QueryCounter in tests
+_global_profiles: List[QueryProfile] = []
+_installed_engines = set()
+
+
+def install(engine):
+    """Attach the statement hooks to ``engine`` (once)."""
+    if id(engine) in _installed_engines:
+        return
+    _installed_engines.add(id(engine))
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("profiler_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info["profiler_start"].pop()
+        profile = _current_profile.get()
+        if profile is not None:
+            profile.record(statement, duration)
+        for profile in list(_global_profiles):
+            profile.record(statement, duration)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(context):
+        conn = context.connection
+        if conn is not None and conn.info.get("profiler_start"):
+            conn.info["profiler_start"].pop()
+
+
+class QueryCounter:
+    """
+    Collects every statement run on ``engine`` from any thread while active:
+
+        with QueryCounter(engine) as profile:
+            client.get("/api/tasks/stats")
+        assert profile.count <= 4
+    """
+
+    def __init__(self, engine):
+        install(engine)
+        self.profile = QueryProfile()
+
+    def __enter__(self) -> QueryProfile:
+        _global_profiles.append(self.profile)
+        return self.profile
+
+    def __exit__(self, *exc):
+        _global_profiles.remove(self.profile)
+        return False
+
+
+class SQLProfilerMiddleware:
+    """
+    Profiles the SQL of each HTTP request. Adds X-SQL-Queries, X-SQL-Time-Ms,
+    X-SQL-Repeated and a Server-Timing entry to the response, and logs the
+    report (as a warning when N+1 patterns or too many queries show up).
+    Queries run after the response has started (streaming bodies) are only
+    in the log.
+    """
+
+    def __init__(self, app, engine):
+        self.app = app
+        install(engine)
+        logger.setLevel(logging.INFO)
+        if not logger.handlers and not logging.getLogger().handlers:
+            # Nothing configured logging (plain uvicorn); make the reports visible
+            logger.addHandler(logging.StreamHandler())
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile()
+        token = _current_profile.set(profile)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                repeated = profile.repeated()
+                headers = list(message.get("headers", []))
+                headers.extend([
+                    (b"x-sql-queries", str(profile.count).encode()),
+                    (b"x-sql-time-ms", f"{profile.total_time * 1000:.1f}".encode()),
+                    (b"x-sql-repeated", str(len(repeated)).encode()),
+                    (b"server-timing", f"db;desc=\"{profile.count} queries\";dur={profile.total_time * 1000:.1f}".encode()),
+                ])
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_profile.reset(token)
+            repeated = profile.repeated()
+            level = logging.WARNING if repeated or profile.count > SQL_PROFILER_WARN_QUERIES else logging.INFO
+            logger.log(level, "%s %s: %s", scope["method"], scope["path"], profile.report())
@@ -0,0 +1,75 @@
+# backend/app/pytest_query_budget.py
+"""
+pytest plugin that fails tests exceeding a SQL query budget on app.db.engine.
+Enable it with ``pytest -p app.pytest_query_budget`` or by adding
+``pytest_plugins = ["app.pytest_query_budget"]`` to a conftest.py.
+
+    @pytest.mark.query_budget(4)
+    def test_task_stats(client):
+        client.get("/api/tasks/stats/summary")
+
+    def test_feed_stats(client, query_budget):
+        client.post(...)  # setup isn't counted
+        with query_budget(3, allow_repeats=False):
+            client.get("/api/feeds/stats")
+
+Statements from every thread are counted, so requests made through
+TestClient are included.
+"""
+from contextlib import contextmanager
+
+import pytest
+
+
+def _query_counter():
+    # App modules read their configuration at import time, so import them only
+    # once tests run and a conftest has had the chance to set DATABASE_URL etc.
+    from app.db import engine
+    from app.profiler import QueryCounter
+    return QueryCounter(engine)
+
+
+def check_budget(profile, max_queries: int, allow_repeats: bool = True, label: str = "Test"):
+    problems = []
+    if profile.count > max_queries:
+        problems.append(f"{label} ran {profile.count} SQL queries, budget is {max_queries}")
+    if not allow_repeats and profile.repeated():
+        problems.append(f"{label} repeated statements (possible N+1)")
+    if problems:
+        pytest.fail("\n".join(problems) + "\n" + profile.report(), pytrace=False)
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "query_budget(max_queries, allow_repeats=True): fail if the test runs more than "
+        "max_queries SQL statements (or repeats one, with allow_repeats=False)"
+    )
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    marker = item.get_closest_marker("query_budget")
+    if marker is None:
+        return (yield)
+
+    max_queries = marker.args[0] if marker.args else marker.kwargs["max_queries"]
+    allow_repeats = marker.kwargs.get("allow_repeats", True)
+    with _query_counter() as profile:
+        # A failing test raises here and keeps its own error
+        result = yield
+    check_budget(profile, max_queries, allow_repeats, label=item.name)
+    return result
+
+
+@pytest.fixture
+def query_budget():
+    """Context manager enforcing a budget on just the enclosed block."""
+
+    @contextmanager
+    def budget(max_queries: int, allow_repeats: bool = True):
+        with _query_counter() as profile:
+            yield profile
+        check_budget(profile, max_queries, allow_repeats, label="Block")
+
+    return budget
@@ -0,0 +1,193 @@
+# backend/app/replicas.py
+from itertools import count
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import logging
+import os
+import threading
+import time
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db import create_db_engine
+from app.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+# Comma-separated read replica URLs; empty: every read goes to DATABASE_URL, as before
+DB_REPLICA_URLS = [url.strip() for url in os.getenv("DB_REPLICA_URLS", "").split(",") if url.strip()]
+# After a user's write, their reads stay on the primary this long (read-your-writes)
+DB_REPLICA_STICKY_SECONDS = float(os.getenv("DB_REPLICA_STICKY_SECONDS", "5"))
+# Replicas further behind than this get no reads until they catch up
+DB_REPLICA_MAX_LAG_SECONDS = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "2"))
+# Seconds between replica lag measurements
+DB_REPLICA_LAG_CHECK_INTERVAL = float(os.getenv("DB_REPLICA_LAG_CHECK_INTERVAL", "5"))
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+# Set on responses to writes (server time in epoch seconds); clients send it
+# back so whichever worker serves their next read keeps it on the primary
+LAST_WRITE_HEADER = "X-Last-Write"
+
+db_reads_total = registry.counter(
+    "db_reads_total", "Read-only requests by the database serving them and why.", ("target", "reason")
+)
+db_replica_lag_seconds = registry.gauge(
+    "db_replica_lag_seconds", "Replication lag at the last check (-1: unreachable).", ("replica",)
+)
+
+# Seconds since the last replayed transaction, 0 while nothing is waiting to be replayed
+_POSTGRES_LAG = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+def parse_last_write(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+def measure_lag(engine: Engine) -> float:
+    if engine.dialect.name != "postgresql":
+        # No replication to measure (e.g. SQLite files standing in for replicas locally)
+        return 0.0
+    with engine.connect() as conn:
+        return float(conn.execute(_POSTGRES_LAG).scalar() or 0.0)
+
+
+class ReplicaRouter:
+    """
+    Picks the database for read-only requests. Reads go round-robin to the
+    replicas whose last measured lag is within ``max_lag``, except for users
+    who wrote in the last ``sticky_seconds``: their reads stay on the primary
+    so they see their own changes. Until the first lag check, or when every
+    replica lags or is unreachable, reads go to the primary.
+
+    Recent writes are known from this worker's own record and from the
+    X-Last-Write time clients send back, which covers writes served by other
+    workers.
+    """
+
+    def __init__(
+        self,
+        engines: List[Engine],
+        sticky_seconds: float = DB_REPLICA_STICKY_SECONDS,
+        max_lag: float = DB_REPLICA_MAX_LAG_SECONDS
+    ):
+        self.engines = engines
+        self.sticky_seconds = sticky_seconds
+        self.max_lag = max_lag
+        # None: not measured yet, or the last check failed
+        self.lag: List[Optional[float]] = [None] * len(engines)
+        self._session = sessionmaker(autocommit=False, autoflush=False)
+        self._sticky_until: Dict[int, float] = {}
+        self._lock = threading.Lock()
+        self._turn = count()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.engines)
+
+    def mark_write(self, user_id: int):
+        if not self.engines:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._sticky_until[user_id] = now + self.sticky_seconds
+            if len(self._sticky_until) > 10000:
+                # Forget expired windows once in a while
+                self._sticky_until = {u: t for u, t in self._sticky_until.items() if t > now}
+
+    def is_sticky(self, user_id: int, last_write: Optional[float] = None) -> bool:
+        # Workers share the wall clock, not the monotonic one; a time further
+        # off than the window either way is stale or made up
+        if last_write is not None and abs(time.time() - last_write) < self.sticky_seconds:
+            return True
+        with self._lock:
+            until = self._sticky_until.get(user_id)
+        return until is not None and until > time.monotonic()
+
+    def choose(self, user_id: int, last_write: Optional[float] = None) -> Tuple[Optional[Engine], str]:
+        """(replica engine, reason); engine None means the primary."""
+        if not self.engines:
+            return None, "no_replicas"
+        if self.is_sticky(user_id, last_write):
+            return None, "recent_write"
+        healthy = [engine for engine, lag in zip(self.engines, self.lag) if lag is not None and lag <= self.max_lag]
+        if not healthy:
+            return None, "replica_lag"
+        return healthy[next(self._turn) % len(healthy)], "replica"
+
+    def read_session(self, user_id: int, last_write: Optional[float] = None, **kwargs) -> Optional[Session]:
+        """A session on a replica for this user's read, or None to use the primary."""
+        engine, reason = self.choose(user_id, last_write)
+        db_reads_total.inc(target="primary" if engine is None else "replica", reason=reason)
+        if engine is None:
+            return None
+        return self._session(bind=engine, **kwargs)
+
+    def check_lag(self) -> List[Optional[float]]:
+        for index, engine in enumerate(self.engines):
+            try:
+                self.lag[index] = measure_lag(engine)
+            except Exception as e:
+                logger.warning("Replica %d lag check failed: %s", index, e)
+                self.lag[index] = None
+            db_replica_lag_seconds.set(-1 if self.lag[index] is None else self.lag[index], replica=str(index))
+        return list(self.lag)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            sticky = len(self._sticky_until)
+        return {"replicas": len(self.engines), "lag": list(self.lag), "sticky_users": sticky}
+
+    async def _run_forever(self, interval: float):
+        while True:
+            try:
+                await asyncio.to_thread(self.check_lag)
+            except Exception:
+                logger.exception("Replica lag check failed")
+            await asyncio.sleep(interval)
+
+    def start(self, interval: float = DB_REPLICA_LAG_CHECK_INTERVAL):
+        if self._task is None and self.engines:
+            self._task = asyncio.create_task(self._run_forever(interval))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+class LastWriteMiddleware:
+    """ASGI middleware adding X-Last-Write to successful responses of writing requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            # The handler has committed by the time the response starts
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                stamp = f"{time.time():.3f}".encode("latin-1")
+                message["headers"] = [*message.get("headers", []), (LAST_WRITE_HEADER.lower().encode("latin-1"), stamp)]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+replica_router = ReplicaRouter([create_db_engine(url) for url in DB_REPLICA_URLS])
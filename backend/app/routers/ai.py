@@ -1,10 +1,11 @@
 # backend/app/routers/ai.py
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.db import get_db
 from app import models, schemas
-from app.routers.auth import get_current_user
-from app.services.ai_service import AIService
+from app.routers.auth import get_current_settings, get_current_user, get_db
+from app.services.settings_cache import CachedSettings
+from app.services.ai_service import get_ai_service
 from datetime import datetime
 
 router = APIRouter()
@@ -13,18 +14,16 @@ router = APIRouter()
 async def chat_with_ai(
     chat_message: schemas.ChatMessage,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    cached: Optional[CachedSettings] = Depends(get_current_settings)
 ):
     """
     Chat with AI assistant. Supports general questions and task-related queries.
     """
     try:
-        ai_service = AIService()
+        ai_service = get_ai_service()
         
         # Get user context for personalized responses
-        user_settings = db.query(models.UserSettings).filter(
-            models.UserSettings.user_id == current_user.id
-        ).first()
+        user_settings = cached.settings if cached else None
         
         # Prepare context with user's recent tasks, preferences, etc.
         context = {
@@ -61,7 +60,7 @@ async def get_task_suggestions(
     Get AI-powered task suggestions based on user's current tasks and patterns.
     """
     try:
-        ai_service = AIService()
+        ai_service = get_ai_service()
         
         # Get user's recent tasks
         recent_tasks = db.query(models.Task).filter(
@@ -94,7 +93,7 @@ async def analyze_productivity(
     Get AI analysis of user's productivity patterns and recommendations.
     """
     try:
-        ai_service = AIService()
+        ai_service = get_ai_service()
         
         # Get comprehensive user data for analysis
         tasks = db.query(models.Task).filter(
@@ -131,19 +130,16 @@ async def analyze_productivity(
 
 @router.post("/quick-fact")
 async def get_quick_fact(
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    cached: Optional[CachedSettings] = Depends(get_current_settings)
 ):
     """
     Get a quick interesting fact related to user's interests.
     """
     try:
-        ai_service = AIService()
+        ai_service = get_ai_service()
         
         # Get user's domains of interest
-        user_settings = db.query(models.UserSettings).filter(
-            models.UserSettings.user_id == current_user.id
-        ).first()
+        user_settings = cached.settings if cached else None
         
         domains = user_settings.domains_of_interest if user_settings else ["technology", "productivity"]
         
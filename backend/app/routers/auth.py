@@ -1,15 +1,21 @@
 # backend/app/routers/auth.py
 from datetime import datetime, timedelta
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
 from jose import JWTError, jwt
 import os
 
-from app.db import get_db
+from app.db import SessionLocal, get_directory_db
 from app import models, schemas
+from app.replicas import LAST_WRITE_HEADER, SAFE_METHODS, parse_last_write, replica_router
+from app.sharding import SHARDING_ENABLED, bucket_for, session_factory_for, shard_session
+from app.services.password_hasher import (
+    PasswordHasherBusy, hash_password_sync, password_hasher, verify_password_sync
+)
+from app.services.settings_cache import CachedSettings, settings_cache
 
 # Configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
@@ -17,14 +23,13 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30 * 24 * 60  # 30 days
 
 router = APIRouter()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return verify_password_sync(plain_password, hashed_password)[0]
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    return hash_password_sync(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -42,17 +47,34 @@ def get_user_by_email(db: Session, email: str):
 def get_user_by_username(db: Session, username: str):
     return db.query(models.User).filter(models.User.username == username).first()
 
-def authenticate_user(db: Session, email: str, password: str):
-    user = get_user_by_email(db, email)
+def _save_password_hash(db: Session, user: models.User, hashed_password: str):
+    user.hashed_password = hashed_password
+    db.commit()
+    db.refresh(user)
+
+async def authenticate_user(db: Session, email: str, password: str):
+    # Sessions are blocking: database work goes to the threadpool, not the event loop
+    user = await run_in_threadpool(get_user_by_email, db, email)
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+    is_valid, new_hash = await password_hasher.verify(password, user.hashed_password)
+    if not is_valid:
         return False
+    if new_hash:
+        # Stored hash uses an outdated work factor, upgrade it transparently
+        await run_in_threadpool(_save_password_hash, db, user, new_hash)
     return user
 
-async def get_current_user(
+def password_service_busy():
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication service is busy, please retry",
+        headers={"Retry-After": "1"},
+    )
+
+def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_directory_db)
 ):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -75,22 +97,77 @@ async def get_current_user(
         raise credentials_exception
     return user
 
-def create_user_with_settings(db: Session, user: schemas.UserCreate):
-    # Create user
-    hashed_password = get_password_hash(user.password)
-    db_user = models.User(
-        email=user.email,
-        username=user.username,
-        full_name=user.full_name,
-        hashed_password=hashed_password
+def get_db(
+    request: Request,
+    current_user: models.User = Depends(get_current_user),
+    directory_db: Session = Depends(get_directory_db)
+):
+    """Session on the database holding the authenticated user's data."""
+    if not SHARDING_ENABLED or current_user.shard is None:
+        # Same session get_current_user used: one connection per request, as before
+        try:
+            yield directory_db
+        finally:
+            if request.method not in SAFE_METHODS:
+                # Read-your-writes: keep this user's reads off the replicas for a while
+                replica_router.mark_write(current_user.id)
+        return
+    # The user is loaded; don't hold a directory connection for the whole request
+    directory_db.close()
+    db = shard_session(current_user.shard, expire_on_commit=False)
+    try:
+        yield db
+    finally:
+        db.close()
+
+def get_read_db(
+    request: Request,
+    current_user: models.User = Depends(get_current_user),
+    directory_db: Session = Depends(get_directory_db)
+):
+    """
+    Session for read-only endpoints: a read replica when configured, unless the
+    user wrote recently or the replicas lag. Never use it for writes.
+    """
+    if SHARDING_ENABLED and current_user.shard is not None:
+        # Shards have no replicas
+        db = shard_session(current_user.shard, expire_on_commit=False)
+    else:
+        last_write = parse_last_write(request.headers.get(LAST_WRITE_HEADER))
+        db = replica_router.read_session(current_user.id, last_write, expire_on_commit=False)
+        if db is None:
+            yield directory_db
+            return
+    # The user is loaded; don't hold a directory connection for the whole request
+    directory_db.close()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def open_read_session(user: models.User, request: Optional[Request] = None) -> Session:
+    """
+    New read-only session chosen like get_read_db, for work that outlives the
+    request's dependencies (e.g. a streamed response). The caller closes it.
+    """
+    if SHARDING_ENABLED and user.shard is not None:
+        return shard_session(user.shard, expire_on_commit=False)
+    last_write = parse_last_write(request.headers.get(LAST_WRITE_HEADER)) if request else None
+    return (
+        replica_router.read_session(user.id, last_write, expire_on_commit=False)
+        or SessionLocal(expire_on_commit=False)
     )
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-    
-    # Create default user settings
-    db_settings = models.UserSettings(
-        user_id=db_user.id,
+
+def get_current_settings(
+    current_user: models.User = Depends(get_current_user)
+) -> Optional[CachedSettings]:
+    """The authenticated user's settings from the per-worker cache; None if they have none."""
+    shard = current_user.shard if SHARDING_ENABLED else None
+    return settings_cache.get(current_user.id, session_factory_for(shard))
+
+def default_settings(user_id: int) -> models.UserSettings:
+    return models.UserSettings(
+        user_id=user_id,
         enabled_widgets=["calendar", "tasks", "timer", "ai_chat"],
         theme="light",
         work_hours_start="09:00",
@@ -103,33 +180,76 @@ def create_user_with_settings(db: Session, user: schemas.UserCreate):
         ai_personality="helpful",
         domains_of_interest=["AI/ML", "productivity", "technology"]
     )
-    db.add(db_settings)
+
+def create_user_with_settings(db: Session, user: schemas.UserCreate, hashed_password: Optional[str] = None):
+    # Create user
+    if hashed_password is None:
+        hashed_password = get_password_hash(user.password)
+    db_user = models.User(
+        email=user.email,
+        username=user.username,
+        full_name=user.full_name,
+        hashed_password=hashed_password
+    )
+    db.add(db_user)
+    # One transaction for the user and their settings; the flush assigns the id
+    db.flush()
+    
+    if SHARDING_ENABLED:
+        # Settings go to the user's shard: commit the directory entry first so
+        # the shard never holds rows of a user that doesn't exist
+        db_user.shard = bucket_for(db_user.id)
+        db.commit()
+        try:
+            with shard_session(db_user.shard) as shard_db:
+                shard_db.add(default_settings(db_user.id))
+                shard_db.commit()
+        except Exception:
+            db.delete(db_user)
+            db.commit()
+            raise
+        return db_user
+    
+    # Create default user settings
+    db.add(default_settings(db_user.id))
     db.commit()
     
     return db_user
 
+def _register_user(db: Session, user: schemas.UserCreate, hashed_password: str) -> schemas.User:
+    return schemas.User.model_validate(create_user_with_settings(db=db, user=user, hashed_password=hashed_password))
+
 @router.post("/register", response_model=schemas.User)
-def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
+async def register(user: schemas.UserCreate, db: Session = Depends(get_directory_db)):
+    # Async for the password hashing; database work goes to the threadpool
     # Check if user already exists
-    db_user = get_user_by_email(db, email=user.email)
+    db_user = await run_in_threadpool(get_user_by_email, db, user.email)
     if db_user:
         raise HTTPException(
             status_code=400,
             detail="Email already registered"
         )
     
-    db_user = get_user_by_username(db, username=user.username)
+    db_user = await run_in_threadpool(get_user_by_username, db, user.username)
     if db_user:
         raise HTTPException(
             status_code=400,
             detail="Username already taken"
         )
     
-    return create_user_with_settings(db=db, user=user)
+    try:
+        hashed_password = await password_hasher.hash(user.password)
+    except PasswordHasherBusy:
+        raise password_service_busy()
+    
+    return await run_in_threadpool(_register_user, db, user, hashed_password)
 
 @router.post("/login", response_model=schemas.Token)
-def login(user_credentials: schemas.UserLogin, db: Session = Depends(get_db)):
-    user = authenticate_user(db, user_credentials.email, user_credentials.password)
+async def login(user_credentials: schemas.UserLogin, db: Session = Depends(get_directory_db)):
+    try:
+        user = await authenticate_user(db, user_credentials.email, user_credentials.password)
+    except PasswordHasherBusy:
+        raise password_service_busy()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
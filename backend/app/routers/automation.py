@@ -0,0 +1,134 @@
+# backend/app/routers/automation.py
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from sqlalchemy import and_
+from typing import List
+
+from app import models, schemas
+from app.routers.auth import get_current_user, get_db, get_read_db
+from app.services import versioning
+from app.services.automation import automation_engine, validate_rule
+from app.services.job_scheduler import AUTOMATION_RULE, cancel_jobs, schedule_rule
+from app.sharding import SHARDING_ENABLED
+
+router = APIRouter()
+
+def _require_engine():
+    # The engine and job scheduler don't run in sharded mode, so rules would never fire
+    if SHARDING_ENABLED:
+        raise HTTPException(status_code=503, detail="Automation rules are not available with sharded storage")
+
+def _get_rule(db: Session, user_id: int, rule_id: int) -> models.AutomationRule:
+    rule = db.query(models.AutomationRule).filter(
+        and_(models.AutomationRule.id == rule_id, models.AutomationRule.user_id == user_id)
+    ).first()
+    if not rule:
+        raise HTTPException(status_code=404, detail="Automation rule not found")
+    return rule
+
+@router.get("/", response_model=List[schemas.AutomationRule])
+def get_rules(
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """Get user's automation rules."""
+    return db.query(models.AutomationRule).filter(
+        models.AutomationRule.user_id == current_user.id
+    ).order_by(models.AutomationRule.created_at.desc()).all()
+
+@router.post("/", response_model=schemas.AutomationRule)
+def create_rule(
+    rule: schemas.AutomationRuleCreate,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Create an automation rule."""
+    _require_engine()
+    try:
+        validate_rule(rule.trigger_type, rule.trigger_config, rule.action_type, rule.action_config)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    db_rule = models.AutomationRule(**rule.dict(), user_id=current_user.id)
+    db.add(db_rule)
+    db.flush()
+    schedule_rule(db, db_rule)
+    # Version bump makes every worker's rule index reload this user
+    versioning.bump_version(db, current_user.id, versioning.AUTOMATION)
+    db.commit()
+    return db_rule
+
+@router.get("/stats")
+def get_automation_stats(
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """Execution stats for the user's rules and the engine in this worker."""
+    rules = db.query(models.AutomationRule).filter(
+        models.AutomationRule.user_id == current_user.id
+    ).all()
+    return {
+        "rules": [
+            {
+                "id": r.id,
+                "name": r.name,
+                "is_active": r.is_active,
+                "execution_count": r.execution_count or 0,
+                "last_executed": r.last_executed
+            }
+            for r in rules
+        ],
+        "engine": automation_engine.get_stats()
+    }
+
+@router.get("/{rule_id}", response_model=schemas.AutomationRule)
+def get_rule(
+    rule_id: int,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """Get a specific automation rule."""
+    return _get_rule(db, current_user.id, rule_id)
+
+@router.put("/{rule_id}", response_model=schemas.AutomationRule)
+def update_rule(
+    rule_id: int,
+    rule_update: schemas.AutomationRuleUpdate,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Update an automation rule."""
+    _require_engine()
+    rule = _get_rule(db, current_user.id, rule_id)
+    update_data = rule_update.dict(exclude_unset=True)
+    try:
+        validate_rule(
+            rule.trigger_type,
+            update_data.get("trigger_config", rule.trigger_config) or {},
+            rule.action_type,
+            update_data.get("action_config", rule.action_config) or {}
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    for field, value in update_data.items():
+        setattr(rule, field, value)
+    schedule_rule(db, rule)
+
+    versioning.bump_version(db, current_user.id, versioning.AUTOMATION)
+    db.commit()
+    return rule
+
+@router.delete("/{rule_id}")
+def delete_rule(
+    rule_id: int,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Delete an automation rule."""
+    rule = _get_rule(db, current_user.id, rule_id)
+    cancel_jobs(db, AUTOMATION_RULE, rule.id)
+    db.delete(rule)
+    versioning.bump_version(db, current_user.id, versioning.AUTOMATION)
+    db.commit()
+    return {"message": "Automation rule deleted successfully"}
@@ -0,0 +1,199 @@
+# backend/app/routers/calendar.py
+from datetime import datetime, timedelta, timezone
+from heapq import merge
+from typing import Iterator, Set, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app import models
+from app.routers.auth import get_current_user, get_read_db, open_read_session
+from app.serialization import FastJSONResponse, encode_json
+from app.services.recurrence import is_series, pending_occurrences, validate_pattern
+
+# Configuration
+# Longest window one request may cover
+CALENDAR_MAX_DAYS = int(os.getenv("CALENDAR_MAX_DAYS", "400"))
+# Longer windows are streamed instead of built in memory
+CALENDAR_STREAM_DAYS = int(os.getenv("CALENDAR_STREAM_DAYS", "62"))
+# Sessions are looked up by start time: ones starting this long before the
+# window may still overlap it, longer ones that do are left out
+CALENDAR_MAX_SESSION_HOURS = int(os.getenv("CALENDAR_MAX_SESSION_HOURS", "24"))
+STREAM_BATCH_SIZE = 500
+
+EVENT_KINDS = ("tasks", "sessions", "recurring")
+
+router = APIRouter()
+
+# (start in naive UTC, event), ordered by start
+Events = Iterator[Tuple[datetime, dict]]
+
+def _zone(name: str) -> ZoneInfo:
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(status_code=400, detail=f"Unknown timezone: {name}")
+
+def _to_utc(value: datetime, zone: ZoneInfo) -> datetime:
+    """Naive UTC, like stored times; naive values are wall-clock times in ``zone``."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=zone)
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+def _stored(value: datetime) -> datetime:
+    # SQLite hands back naive UTC, PostgreSQL aware datetimes
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def _local(value: datetime, zone: ZoneInfo) -> str:
+    return value.replace(tzinfo=timezone.utc).astimezone(zone).isoformat()
+
+def _task_events(db: Session, user_id: int, start: datetime, end: datetime, zone: ZoneInfo) -> Events:
+    query = db.query(
+        models.Task.id, models.Task.title, models.Task.due_date, models.Task.priority,
+        models.Task.is_completed, models.Task.recurrence_parent_id
+    ).filter(
+        models.Task.owner_id == user_id,
+        models.Task.due_date >= start,
+        models.Task.due_date < end
+    ).order_by(models.Task.due_date)
+    for row in query.yield_per(STREAM_BATCH_SIZE):
+        due = _stored(row.due_date)
+        yield due, {
+            "type": "task",
+            "id": row.id,
+            "title": row.title,
+            "start": _local(due, zone),
+            "end": None,
+            "priority": row.priority,
+            "is_completed": row.is_completed,
+            "series_id": row.recurrence_parent_id,
+            "virtual": False,
+        }
+
+def _session_events(db: Session, user_id: int, start: datetime, end: datetime, zone: ZoneInfo) -> Events:
+    query = db.query(
+        models.TimerSession.id, models.TimerSession.session_type, models.TimerSession.task_id,
+        models.TimerSession.task_title, models.TimerSession.started_at, models.TimerSession.ended_at,
+        models.TimerSession.was_completed
+    ).filter(
+        models.TimerSession.user_id == user_id,
+        models.TimerSession.started_at >= start - timedelta(hours=CALENDAR_MAX_SESSION_HOURS),
+        models.TimerSession.started_at < end
+    ).order_by(models.TimerSession.started_at)
+    for row in query.yield_per(STREAM_BATCH_SIZE):
+        started = _stored(row.started_at)
+        ended = _stored(row.ended_at) if row.ended_at else None
+        if started < start and ended is not None and ended <= start:
+            continue
+        yield started, {
+            "type": "timer_session",
+            "id": row.id,
+            "title": row.task_title or row.session_type,
+            "start": _local(started, zone),
+            # None while the session is running
+            "end": _local(ended, zone) if ended else None,
+            "session_type": row.session_type,
+            "task_id": row.task_id,
+            "was_completed": row.was_completed,
+        }
+
+def _occurrence_events(db: Session, user_id: int, start: datetime, end: datetime, zone: ZoneInfo) -> Events:
+    """Occurrences of the user's series beyond what's materialized as tasks so far."""
+    series = db.query(models.Task).filter(
+        models.Task.owner_id == user_id,
+        models.Task.is_recurring == True,
+        models.Task.recurrence_parent_id.is_(None)
+    ).all()
+
+    def occurrences(task: models.Task) -> Events:
+        for occurrence in pending_occurrences(task, start, end):
+            yield occurrence, {
+                "type": "task",
+                "id": None,
+                "title": task.title,
+                "start": _local(occurrence, zone),
+                "end": None,
+                "priority": task.priority,
+                "is_completed": False,
+                "series_id": task.id,
+                "virtual": True,
+            }
+
+    streams = []
+    for task in series:
+        if not is_series(task) or (task.recurrence_generated_until and task.recurrence_next_at is None):
+            continue  # Not a series, or one that has ended
+        try:
+            validate_pattern(task)
+        except ValueError:
+            continue
+        streams.append(occurrences(task))
+    return merge(*streams, key=lambda event: event[0])
+
+def calendar_events(db: Session, user_id: int, start: datetime, end: datetime, zone: ZoneInfo, kinds: Set[str]) -> Events:
+    """Every event in [start, end) (naive UTC) in start order, read lazily in index order."""
+    streams = []
+    if "tasks" in kinds:
+        streams.append(_task_events(db, user_id, start, end, zone))
+    if "sessions" in kinds:
+        streams.append(_session_events(db, user_id, start, end, zone))
+    if "recurring" in kinds:
+        streams.append(_occurrence_events(db, user_id, start, end, zone))
+    return merge(*streams, key=lambda event: event[0])
+
+def _stream(db: Session, header: dict, events: Events) -> Iterator[bytes]:
+    try:
+        # The header object, left open for the events array
+        yield encode_json(header)[:-1] + b',"events":['
+        separator = b""
+        batch = []
+        for _, event in events:
+            batch.append(encode_json(event))
+            if len(batch) >= STREAM_BATCH_SIZE:
+                yield separator + b",".join(batch)
+                separator, batch = b",", []
+        if batch:
+            yield separator + b",".join(batch)
+        yield b"]}"
+    finally:
+        db.close()
+
+@router.get("/")
+def get_calendar(
+    request: Request,
+    start: datetime,
+    end: datetime,
+    tz: str = "UTC",
+    include: str = ",".join(EVENT_KINDS),
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Tasks due, timer sessions and upcoming recurring occurrences in [start, end),
+    ordered by start. Times without an offset are in ``tz`` (an IANA name) and
+    events are returned in it. ``include`` picks from tasks, sessions, recurring.
+    """
+    zone = _zone(tz)
+    start_utc, end_utc = _to_utc(start, zone), _to_utc(end, zone)
+    if end_utc <= start_utc:
+        raise HTTPException(status_code=400, detail="end must be after start")
+    if end_utc - start_utc > timedelta(days=CALENDAR_MAX_DAYS):
+        raise HTTPException(status_code=400, detail=f"Windows are limited to {CALENDAR_MAX_DAYS} days")
+    kinds = {kind.strip() for kind in include.split(",") if kind.strip()}
+    if not kinds or not kinds.issubset(EVENT_KINDS):
+        raise HTTPException(status_code=400, detail=f"include must list some of: {', '.join(EVENT_KINDS)}")
+
+    header = {"start": _local(start_utc, zone), "end": _local(end_utc, zone), "timezone": tz}
+    if end_utc - start_utc <= timedelta(days=CALENDAR_STREAM_DAYS):
+        events = calendar_events(db, current_user.id, start_utc, end_utc, zone, kinds)
+        return FastJSONResponse({**header, "events": [event for _, event in events]})
+
+    # Own session: request dependencies may be closed before the body is sent
+    stream_db = open_read_session(current_user, request)
+    events = calendar_events(stream_db, current_user.id, start_utc, end_utc, zone, kinds)
+    return StreamingResponse(_stream(stream_db, header, events), media_type="application/json")
@@ -1,27 +1,44 @@
 # backend/app/routers/feeds.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.orm import Session, contains_eager, joinedload
 from sqlalchemy import and_
 from typing import List, Optional
 
-from app.db import get_db
 from app import models, schemas
-from app.routers.auth import get_current_user
+from app.routers.auth import get_current_user, get_db, get_read_db
+from app.serialization import FAST_JSON_RESPONSES, fast_list_response
+from app.sharding import SHARDING_ENABLED, session_factory_for
+from app.services import versioning
+from app.services.change_log import record_change
+from app.services.feed_counters import apply_feed_item_update, get_counters
+from app.services.feed_ingestion import FeedIngestionService, feed_ingestion
+from app.services.url_safety import UnsafeURL, check_public_url
+from app.services.write_batcher import run_write
 
 router = APIRouter()
 
 @router.get("/", response_model=List[schemas.FeedItem])
 def get_feed_items(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 20,
     category: Optional[str] = None,
     feed_type: Optional[str] = None,
     unread_only: bool = False,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get user's feed items with optional filtering."""
-    query = db.query(models.FeedItem).filter(models.FeedItem.user_id == current_user.id)
+    not_modified = versioning.check_not_modified(request, response, db, current_user.id, versioning.FEEDS)
+    if not_modified is not None:
+        return not_modified
+    
+    query = db.query(models.FeedItem).join(models.FeedItem.article).options(
+        contains_eager(models.FeedItem.article)
+    ).filter(models.FeedItem.user_id == current_user.id)
     
     if category:
         query = query.filter(models.FeedItem.category == category)
@@ -32,7 +49,11 @@ def get_feed_items(
     if unread_only:
         query = query.filter(models.FeedItem.is_read == False)
     
-    items = query.order_by(models.FeedItem.fetched_at.desc()).offset(skip).limit(limit).all()
+    query = query.order_by(models.FeedItem.fetched_at.desc()).offset(skip).limit(limit)
+    if FAST_JSON_RESPONSES:
+        return fast_list_response(query, models.FeedItem, schemas.FeedItem, headers=response.headers)
+    
+    items = query.all()
     return items
 
 @router.put("/{item_id}", response_model=schemas.FeedItem)
@@ -43,51 +64,161 @@ def update_feed_item(
     db: Session = Depends(get_db)
 ):
     """Update feed item (mark as read, bookmark, etc.)."""
-    item = db.query(models.FeedItem).filter(
-        and_(models.FeedItem.id == item_id, models.FeedItem.user_id == current_user.id)
-    ).first()
+    def update(db: Session) -> schemas.FeedItem:
+        item = db.query(models.FeedItem).filter(
+            and_(models.FeedItem.id == item_id, models.FeedItem.user_id == current_user.id)
+        ).first()
+        
+        if not item:
+            raise HTTPException(status_code=404, detail="Feed item not found")
+        
+        apply_feed_item_update(db, item, item_update.dict(exclude_unset=True))
+        record_change(db, current_user.id, versioning.FEEDS, item.id)
+        db.flush()
+        return schemas.FeedItem.model_validate(item)
     
-    if not item:
-        raise HTTPException(status_code=404, detail="Feed item not found")
-    
-    update_data = item_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(item, field, value)
-    
-    db.commit()
-    db.refresh(item)
-    return item
+    # Mark-read bursts are group-committed when write batching is enabled
+    return run_write(db, update)
 
 @router.get("/categories")
 def get_categories(
+    request: Request,
+    response: Response,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get list of available feed categories."""
-    categories = db.query(models.FeedItem.category).filter(
-        models.FeedItem.user_id == current_user.id
-    ).distinct().all()
+    not_modified = versioning.check_not_modified(request, response, db, current_user.id, versioning.FEEDS)
+    if not_modified is not None:
+        return not_modified
     
-    return {"categories": [c[0] for c in categories if c[0]]}
+    counters = get_counters(db, current_user.id)
+    return {"categories": [c.category for c in counters if c.category]}
 
 @router.get("/stats")
 def get_feed_stats(
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get feed statistics."""
-    total_items = db.query(models.FeedItem).filter(models.FeedItem.user_id == current_user.id).count()
-    unread_items = db.query(models.FeedItem).filter(
-        and_(models.FeedItem.user_id == current_user.id, models.FeedItem.is_read == False)
-    ).count()
-    bookmarked_items = db.query(models.FeedItem).filter(
-        and_(models.FeedItem.user_id == current_user.id, models.FeedItem.is_bookmarked == True)
-    ).count()
+    counters = get_counters(db, current_user.id)
+    total_items = sum(c.total for c in counters)
+    unread_items = sum(c.unread for c in counters)
+    bookmarked_items = sum(c.bookmarked for c in counters)
     
     return {
         "total_items": total_items,
         "unread_items": unread_items,
         "bookmarked_items": bookmarked_items,
-        "read_percentage": round((total_items - unread_items) / total_items * 100, 2) if total_items > 0 else 0
+        "read_percentage": round((total_items - unread_items) / total_items * 100, 2) if total_items > 0 else 0,
+        "categories": {
+            c.category: {"total": c.total, "unread": c.unread, "bookmarked": c.bookmarked}
+            for c in counters if c.category
+        }
     }
 
+def _subscription_out(subscription: models.FeedSubscription) -> dict:
+    return {
+        "id": subscription.id,
+        "source_id": subscription.source_id,
+        "url": subscription.source.url,
+        "title": subscription.source.title,
+        "category": subscription.category or subscription.source.category,
+        "last_fetched_at": subscription.source.last_fetched_at,
+        "created_at": subscription.created_at
+    }
+
+@router.get("/sources", response_model=List[schemas.FeedSubscription])
+def get_feed_sources(
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """Get the feed sources the user is subscribed to."""
+    subscriptions = db.query(models.FeedSubscription).options(
+        joinedload(models.FeedSubscription.source)
+    ).filter(models.FeedSubscription.user_id == current_user.id).all()
+    return [_subscription_out(s) for s in subscriptions]
+
+@router.post("/sources", response_model=schemas.FeedSubscription)
+def subscribe_to_feed(
+    source_data: schemas.FeedSourceCreate,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Subscribe to an RSS/Atom feed. Sources are shared between subscribers."""
+    try:
+        check_public_url(source_data.url)
+    except UnsafeURL as e:
+        raise HTTPException(status_code=400, detail=f"Feed URL not allowed: {e}")
+    source = db.query(models.FeedSource).filter(models.FeedSource.url == source_data.url).first()
+    if not source:
+        source = models.FeedSource(
+            url=source_data.url,
+            title=source_data.title,
+            category=source_data.category,
+            feed_type=source_data.feed_type
+        )
+        db.add(source)
+        db.flush()
+    
+    existing = db.query(models.FeedSubscription).filter(
+        and_(
+            models.FeedSubscription.user_id == current_user.id,
+            models.FeedSubscription.source_id == source.id
+        )
+    ).first()
+    if existing:
+        raise HTTPException(status_code=400, detail="Already subscribed to this feed")
+    
+    subscription = models.FeedSubscription(
+        user_id=current_user.id,
+        source_id=source.id,
+        category=source_data.category
+    )
+    db.add(subscription)
+    db.commit()
+    return _subscription_out(subscription)
+
+@router.delete("/sources/{subscription_id}")
+def unsubscribe_from_feed(
+    subscription_id: int,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Unsubscribe from a feed. Already ingested items are kept."""
+    subscription = db.query(models.FeedSubscription).filter(
+        and_(
+            models.FeedSubscription.id == subscription_id,
+            models.FeedSubscription.user_id == current_user.id
+        )
+    ).first()
+    
+    if not subscription:
+        raise HTTPException(status_code=404, detail="Subscription not found")
+    
+    db.delete(subscription)
+    db.commit()
+    return {"message": "Unsubscribed successfully"}
+
+def _subscribed_source_ids(db: Session, user_id: int) -> List[int]:
+    return [
+        source_id for (source_id,) in db.query(models.FeedSubscription.source_id).filter(
+            models.FeedSubscription.user_id == user_id
+        )
+    ]
+
+@router.post("/refresh")
+async def refresh_feeds(
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Fetch the user's feed sources now instead of waiting for the next cycle."""
+    # Async for the fetches; the query runs off the event loop
+    source_ids = await asyncio.to_thread(_subscribed_source_ids, db, current_user.id)
+    if not source_ids:
+        return {"sources": 0, "not_modified": 0, "failed": 0, "inserted": 0}
+    ingestion = feed_ingestion
+    if SHARDING_ENABLED and current_user.shard is not None:
+        # The user's sources and articles live in their shard
+        ingestion = FeedIngestionService(session_factory=session_factory_for(current_user.shard))
+    return await ingestion.run_cycle(source_ids)
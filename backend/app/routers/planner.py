@@ -0,0 +1,98 @@
+# backend/app/routers/planner.py
+from datetime import date, datetime, timezone
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app import models
+from app.routers.auth import default_settings, get_current_settings, get_current_user, get_read_db
+from app.serialization import FastJSONResponse
+from app.services.planner import FOCUS, Plan, backlog_cache, plan_days
+from app.services.settings_cache import CachedSettings
+
+router = APIRouter()
+
+def _zone(name: str) -> ZoneInfo:
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(status_code=400, detail=f"Unknown timezone: {name}")
+
+def _local(value: Optional[datetime], zone: ZoneInfo) -> Optional[str]:
+    if value is None:
+        return None
+    return value.replace(tzinfo=timezone.utc).astimezone(zone).isoformat()
+
+def _plan_response(plan: Plan, first_day: date, days: int, zone: ZoneInfo, tz: str) -> FastJSONResponse:
+    by_day = {}
+    for planned in plan.blocks:
+        block, task = planned.block, planned.task
+        entry = {"type": block.kind, "start": _local(block.start, zone), "end": _local(block.end, zone)}
+        if block.kind == FOCUS:
+            entry["task"] = task and {
+                "id": task.id,
+                "title": task.title,
+                "priority": task.priority,
+                "due_date": _local(task.due_date, zone),
+                "project": task.project,
+            }
+            entry["late"] = planned.late
+        day = block.start.replace(tzinfo=timezone.utc).astimezone(zone).date().isoformat()
+        by_day.setdefault(day, []).append(entry)
+
+    scheduled = plan.scheduled
+    return FastJSONResponse({
+        "start": first_day.isoformat(),
+        "days": days,
+        "timezone": tz,
+        "plan": [{"date": day, "blocks": blocks} for day, blocks in by_day.items()],
+        "summary": {
+            "open_tasks": plan.open_tasks,
+            "scheduled": scheduled,
+            "unscheduled": plan.open_tasks - scheduled,
+            "missed_deadlines": plan.missed_deadlines,
+        },
+    })
+
+def _plan(
+    first_day: Optional[date],
+    days: int,
+    tz: str,
+    current_user: models.User,
+    cached: Optional[CachedSettings],
+    db: Session
+) -> FastJSONResponse:
+    zone = _zone(tz)
+    if first_day is None:
+        first_day = datetime.now(zone).date()
+    settings = cached.settings if cached else default_settings(current_user.id)
+    backlog = backlog_cache.get(db, current_user.id)
+    plan = plan_days(backlog, first_day, days, zone, settings)
+    return _plan_response(plan, first_day, days, zone, tz)
+
+@router.get("/day")
+def plan_day(
+    day: Optional[date] = None,
+    tz: str = "UTC",
+    current_user: models.User = Depends(get_current_user),
+    cached: Optional[CachedSettings] = Depends(get_current_settings),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Open tasks packed into the day's pomodoro blocks within work hours (default
+    today in ``tz``, an IANA name). Blocks that already started are left out.
+    """
+    return _plan(day, 1, tz, current_user, cached, db)
+
+@router.get("/week")
+def plan_week(
+    start: Optional[date] = None,
+    tz: str = "UTC",
+    current_user: models.User = Depends(get_current_user),
+    cached: Optional[CachedSettings] = Depends(get_current_settings),
+    db: Session = Depends(get_read_db)
+):
+    """Like /day, for the seven days from ``start`` (default today in ``tz``)."""
+    return _plan(start, 7, tz, current_user, cached, db)
@@ -0,0 +1,249 @@
+# backend/app/routers/reading.py
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import and_
+from typing import List, Optional, Tuple
+from datetime import datetime
+
+from app import models, schemas
+from app.db import json_array_contains
+from app.routers.auth import get_current_user, get_db
+from app.services import versioning
+from app.services.reading_progress import PendingProgress, reading_progress
+
+router = APIRouter()
+
+READING_STATUSES = ("to_read", "reading", "completed", "paused")
+
+def _get_item(db: Session, user_id: int, item_id: int) -> models.ReadingItem:
+    item = db.query(models.ReadingItem).filter(
+        and_(models.ReadingItem.id == item_id, models.ReadingItem.user_id == user_id)
+    ).first()
+    if not item:
+        raise HTTPException(status_code=404, detail="Reading item not found")
+    return item
+
+def _compute_progress(
+    total_pages: Optional[int],
+    current_page: int,
+    progress_percentage: float,
+    update: schemas.ReadingProgressUpdate
+) -> Tuple[int, float]:
+    """New (current_page, progress_percentage); one is derived from the other when total_pages is known."""
+    if update.current_page is not None:
+        current_page = max(0, update.current_page)
+        if total_pages:
+            current_page = min(current_page, total_pages)
+            progress_percentage = round(current_page * 100.0 / total_pages, 2)
+    if update.progress_percentage is not None:
+        progress_percentage = min(100.0, max(0.0, update.progress_percentage))
+        if total_pages and update.current_page is None:
+            current_page = round(total_pages * progress_percentage / 100.0)
+    return current_page, progress_percentage
+
+def _status_for_progress(status: str, progress_percentage: float, current_page: int) -> str:
+    if progress_percentage >= 100:
+        return "completed"
+    if status in ("to_read", "paused") and (current_page > 0 or progress_percentage > 0):
+        return "reading"
+    return status
+
+def _apply_status(item: models.ReadingItem, status: str):
+    if status not in READING_STATUSES:
+        raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {', '.join(READING_STATUSES)}")
+    if status == "reading" and item.started_reading_at is None:
+        item.started_reading_at = datetime.utcnow()
+    if status == "completed" and item.status != "completed":
+        item.completed_at = datetime.utcnow()
+    elif status != "completed":
+        item.completed_at = None
+    item.status = status
+
+@router.get("/", response_model=List[schemas.ReadingItem])
+def get_reading_items(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(20, le=100),
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    tag: Optional[str] = None,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get user's reading list with optional filtering."""
+    reading_progress.flush_user(db, current_user.id)
+    not_modified = versioning.check_not_modified(request, response, db, current_user.id, versioning.READING)
+    if not_modified is not None:
+        return not_modified
+
+    query = db.query(models.ReadingItem).options(
+        selectinload(models.ReadingItem.highlights)
+    ).filter(models.ReadingItem.user_id == current_user.id)
+
+    if status:
+        query = query.filter(models.ReadingItem.status == status)
+
+    if category:
+        query = query.filter(models.ReadingItem.category == category)
+
+    if tag:
+        query = query.filter(json_array_contains(db, models.ReadingItem.tags, tag))
+
+    return query.order_by(models.ReadingItem.added_at.desc(), models.ReadingItem.id.desc()).offset(skip).limit(limit).all()
+
+@router.post("/", response_model=schemas.ReadingItem)
+def create_reading_item(
+    item: schemas.ReadingItemCreate,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Add an item to the reading list."""
+    db_item = models.ReadingItem(**item.dict(), user_id=current_user.id, highlights=[])
+    db.add(db_item)
+    versioning.bump_version(db, current_user.id, versioning.READING)
+    db.commit()
+    return db_item
+
+@router.get("/{item_id}", response_model=schemas.ReadingItem)
+def get_reading_item(
+    item_id: int,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get a specific reading item."""
+    reading_progress.flush_user(db, current_user.id)
+    return _get_item(db, current_user.id, item_id)
+
+@router.put("/{item_id}", response_model=schemas.ReadingItem)
+def update_reading_item(
+    item_id: int,
+    item_update: schemas.ReadingItemUpdate,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Update a reading item."""
+    item = _get_item(db, current_user.id, item_id)
+    update_data = item_update.dict(exclude_unset=True)
+    status = update_data.pop("status", None)
+
+    if "current_page" in update_data or "progress_percentage" in update_data:
+        # This write supersedes any buffered page turns
+        reading_progress.discard(current_user.id, item.id)
+    for field, value in update_data.items():
+        setattr(item, field, value)
+    if status is not None:
+        _apply_status(item, status)
+
+    versioning.bump_version(db, current_user.id, versioning.READING)
+    db.commit()
+    return item
+
+@router.patch("/{item_id}/progress", response_model=schemas.ReadingProgress)
+def update_reading_progress(
+    item_id: int,
+    progress: schemas.ReadingProgressUpdate,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Record reading progress. Page turns are buffered and written in batches;
+    only starting or finishing the item writes immediately.
+    """
+    if progress.current_page is None and progress.progress_percentage is None:
+        raise HTTPException(status_code=400, detail="current_page or progress_percentage is required")
+
+    pending = reading_progress.get(current_user.id, item_id)
+    if pending is None:
+        item = _get_item(db, current_user.id, item_id)
+        pending = PendingProgress(
+            user_id=current_user.id,
+            total_pages=item.total_pages,
+            status=item.status,
+            current_page=item.current_page or 0,
+            progress_percentage=item.progress_percentage or 0.0
+        )
+
+    current_page, progress_percentage = _compute_progress(
+        pending.total_pages, pending.current_page, pending.progress_percentage, progress
+    )
+    status = _status_for_progress(pending.status, progress_percentage, current_page)
+
+    if status == pending.status:
+        reading_progress.add(item_id, PendingProgress(
+            user_id=current_user.id,
+            total_pages=pending.total_pages,
+            status=status,
+            current_page=current_page,
+            progress_percentage=progress_percentage
+        ))
+    else:
+        reading_progress.discard(current_user.id, item_id)
+        item = _get_item(db, current_user.id, item_id)
+        item.current_page = current_page
+        item.progress_percentage = progress_percentage
+        _apply_status(item, status)
+        versioning.bump_version(db, current_user.id, versioning.READING)
+        db.commit()
+
+    return schemas.ReadingProgress(
+        id=item_id,
+        current_page=current_page,
+        progress_percentage=progress_percentage,
+        status=status
+    )
+
+@router.delete("/{item_id}")
+def delete_reading_item(
+    item_id: int,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Remove an item from the reading list."""
+    item = _get_item(db, current_user.id, item_id)
+    reading_progress.discard(current_user.id, item.id)
+    db.query(models.ReadingHighlight).filter(
+        models.ReadingHighlight.reading_item_id == item.id
+    ).delete(synchronize_session=False)
+    db.delete(item)
+    versioning.bump_version(db, current_user.id, versioning.READING)
+    db.commit()
+    return {"message": "Reading item deleted successfully"}
+
+@router.post("/{item_id}/highlights", response_model=schemas.ReadingHighlight)
+def add_highlight(
+    item_id: int,
+    highlight: schemas.ReadingHighlightCreate,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Append a highlight to a reading item."""
+    item = _get_item(db, current_user.id, item_id)
+    db_highlight = models.ReadingHighlight(
+        **highlight.dict(),
+        reading_item_id=item.id,
+        user_id=current_user.id
+    )
+    db.add(db_highlight)
+    versioning.bump_version(db, current_user.id, versioning.READING)
+    db.commit()
+    return db_highlight
+
+@router.delete("/{item_id}/highlights/{highlight_id}")
+def delete_highlight(
+    item_id: int,
+    highlight_id: int,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Remove one highlight."""
+    deleted = db.query(models.ReadingHighlight).filter(
+        models.ReadingHighlight.id == highlight_id,
+        models.ReadingHighlight.reading_item_id == item_id,
+        models.ReadingHighlight.user_id == current_user.id
+    ).delete(synchronize_session=False)
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Highlight not found")
+    versioning.bump_version(db, current_user.id, versioning.READING)
+    db.commit()
+    return {"message": "Highlight deleted successfully"}
@@ -0,0 +1,212 @@
+# backend/app/routers/sync.py
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from pydantic import ValidationError
+
+from app import models, schemas
+from app.routers.auth import get_current_user, get_db
+from app.routers.tasks import apply_task_update
+from app.services import versioning
+from app.services.feed_counters import apply_feed_item_update
+from app.services.recurrence import is_series, refresh_series, remove_series
+from app.services.change_log import (
+    RESOURCE_MODELS, changes_since, current_watermark, latest_seq, load_entities, record_change
+)
+from app.services.settings_cache import settings_cache
+
+router = APIRouter()
+
+# Operations clients may replay from offline queues, per resource
+ALLOWED_OPS = {
+    versioning.TASKS: {"create", "update", "delete"},
+    versioning.TIMER: {"create", "update", "delete"},
+    versioning.FEEDS: {"update"},
+    versioning.SETTINGS: {"update"},
+}
+
+CREATE_SCHEMAS = {
+    versioning.TASKS: schemas.TaskCreate,
+    versioning.TIMER: schemas.TimerSessionCreate,
+}
+
+UPDATE_SCHEMAS = {
+    versioning.TASKS: schemas.TaskUpdate,
+    versioning.TIMER: schemas.TimerSessionUpdate,
+    versioning.FEEDS: schemas.FeedItemUpdate,
+    versioning.SETTINGS: schemas.UserSettingsUpdate,
+}
+
+RESPONSE_SCHEMAS = {
+    versioning.TASKS: schemas.Task,
+    versioning.TIMER: schemas.TimerSession,
+    versioning.FEEDS: schemas.FeedItem,
+    versioning.SETTINGS: schemas.UserSettings,
+}
+
+CONFLICT_STRATEGIES = ("server_wins", "client_wins")
+
+def _owner_column(model):
+    return model.owner_id if model is models.Task else model.user_id
+
+def _get_entity(db: Session, user_id: int, resource: str, entity_id):
+    model = RESOURCE_MODELS[resource]
+    query = db.query(model).filter(_owner_column(model) == user_id)
+    if resource == versioning.SETTINGS:
+        # One settings row per user, the id is optional
+        return query.first()
+    if entity_id is None:
+        return None
+    return query.filter(model.id == entity_id).first()
+
+def _apply_update(db: Session, resource: str, entity, update_data: dict):
+    if resource == versioning.TASKS:
+        apply_task_update(db, entity, update_data)
+        return
+    if resource == versioning.FEEDS:
+        apply_feed_item_update(db, entity, update_data)
+        return
+    for field, value in update_data.items():
+        setattr(entity, field, value)
+
+def _apply_mutation(
+    db: Session,
+    user_id: int,
+    mutation: schemas.SyncMutation,
+    conflict_strategy: str
+) -> dict:
+    resource = mutation.resource
+    result = {"resource": resource, "id": mutation.id, "client_ref": mutation.client_ref}
+
+    if mutation.op == "create":
+        fields = CREATE_SCHEMAS[resource](**mutation.data).dict()
+        # Offline clients may also have completed/ended the item already
+        fields.update(UPDATE_SCHEMAS[resource](**mutation.data).dict(exclude_unset=True))
+        model = RESOURCE_MODELS[resource]
+        entity = model(**fields)
+        setattr(entity, "owner_id" if model is models.Task else "user_id", user_id)
+        db.add(entity)
+        db.flush()
+        record_change(db, user_id, resource, entity.id)
+        if resource == versioning.TASKS and is_series(entity):
+            refresh_series(db, entity)
+        return {**result, "status": "applied", "id": entity.id}
+
+    entity = _get_entity(db, user_id, resource, mutation.id)
+    if entity is None:
+        # Deleted on the server (or never existed): deleting again is a no-op
+        if mutation.op == "delete":
+            return {**result, "status": "applied"}
+        return {**result, "status": "conflict", "detail": "Entity no longer exists on the server"}
+
+    result["id"] = entity.id
+    if mutation.base_seq is not None and conflict_strategy == "server_wins":
+        if latest_seq(db, user_id, resource, entity.id) > mutation.base_seq:
+            server_version = RESPONSE_SCHEMAS[resource].model_validate(entity).model_dump(mode="json")
+            return {
+                **result,
+                "status": "conflict",
+                "detail": "Entity changed on the server since base_seq",
+                "server_version": server_version
+            }
+
+    if mutation.op == "delete":
+        if resource == versioning.TASKS and entity.recurrence_parent_id is None:
+            remove_series(db, entity)
+        record_change(db, user_id, resource, entity.id, deleted=True)
+        db.delete(entity)
+    else:
+        _apply_update(db, resource, entity, UPDATE_SCHEMAS[resource](**mutation.data).dict(exclude_unset=True))
+        record_change(db, user_id, resource, entity.id)
+    db.flush()
+    return {**result, "status": "applied"}
+
+@router.get("/", response_model=schemas.SyncPullResponse)
+def pull_changes(
+    since: int = 0,
+    limit: int = Query(1000, ge=1, le=5000),
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get everything that changed since the client's watermark. With since=0 the
+    full current dataset is returned as the initial snapshot.
+    """
+    if since <= 0:
+        watermark = current_watermark(db, current_user.id)
+        settings = load_entities(db, current_user.id, versioning.SETTINGS)
+        return {
+            "watermark": watermark,
+            "has_more": False,
+            "tasks": load_entities(db, current_user.id, versioning.TASKS),
+            "timer_sessions": load_entities(db, current_user.id, versioning.TIMER),
+            "feed_items": load_entities(db, current_user.id, versioning.FEEDS),
+            "settings": settings[0] if settings else None,
+            "tombstones": {}
+        }
+
+    changed, deleted, watermark, has_more = changes_since(db, current_user.id, since, limit)
+    settings = load_entities(db, current_user.id, versioning.SETTINGS, changed.get(versioning.SETTINGS, []))
+    return {
+        "watermark": watermark,
+        "has_more": has_more,
+        "tasks": load_entities(db, current_user.id, versioning.TASKS, changed.get(versioning.TASKS, [])),
+        "timer_sessions": load_entities(db, current_user.id, versioning.TIMER, changed.get(versioning.TIMER, [])),
+        "feed_items": load_entities(db, current_user.id, versioning.FEEDS, changed.get(versioning.FEEDS, [])),
+        "settings": settings[0] if settings else None,
+        "tombstones": deleted
+    }
+
+@router.post("/", response_model=schemas.SyncPushResponse)
+def push_changes(
+    payload: schemas.SyncPushRequest,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Apply a batch of offline mutations in order. Each mutation succeeds or
+    fails on its own; with server_wins, a mutation whose entity changed after
+    its base_seq is rejected and the current server copy is returned instead.
+    """
+    if payload.conflict_strategy not in CONFLICT_STRATEGIES:
+        raise HTTPException(status_code=400, detail=f"Unknown conflict strategy: {payload.conflict_strategy}")
+
+    results = []
+    for index, mutation in enumerate(payload.mutations):
+        if mutation.op not in ALLOWED_OPS.get(mutation.resource, set()):
+            results.append({
+                "index": index,
+                "status": "error",
+                "resource": mutation.resource,
+                "id": mutation.id,
+                "client_ref": mutation.client_ref,
+                "detail": f"Operation '{mutation.op}' is not supported for '{mutation.resource}'"
+            })
+            continue
+
+        detail = None
+        try:
+            # Savepoint per mutation so one bad entry doesn't undo the batch
+            with db.begin_nested():
+                result = _apply_mutation(db, current_user.id, mutation, payload.conflict_strategy)
+        except (ValidationError, TypeError, ValueError) as e:
+            detail = str(e)
+        except IntegrityError as e:
+            detail = str(e.orig)
+        except HTTPException as e:
+            # From the shared update helpers; here it only fails this mutation
+            detail = e.detail
+        if detail is not None:
+            result = {
+                "resource": mutation.resource,
+                "id": mutation.id,
+                "client_ref": mutation.client_ref,
+                "status": "error",
+                "detail": detail
+            }
+        results.append({"index": index, **result})
+
+    db.commit()
+    if any(r["status"] == "applied" and r["resource"] == versioning.SETTINGS for r in results):
+        settings_cache.invalidate([current_user.id])
+    return {"watermark": current_watermark(db, current_user.id), "results": results}
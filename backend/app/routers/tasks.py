@@ -1,18 +1,88 @@
 # backend/app/routers/tasks.py
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
-from typing import List, Optional
-from datetime import datetime, date
+from sqlalchemy import and_, func, or_
+from typing import List, Optional, Union
+from datetime import datetime, date, timedelta
 
-from app.db import get_db
 from app import models, schemas
-from app.routers.auth import get_current_user
+from app.db import json_array_contains
+from app.routers.auth import get_current_user, get_db, get_read_db
+from app.serialization import FAST_JSON_RESPONSES, fast_list_response
+from app.services import versioning
+from app.services.change_log import record_change
+from app.services.event_bus import TASK_COMPLETED, Event, event_bus
+from app.services.job_scheduler import schedule_task_reminder
+from app.services.recurrence import is_series, refresh_series, remove_series
+from app.services.write_batcher import run_write
 
 router = APIRouter()
 
+# Changing any of these re-plans a recurring series' upcoming occurrences
+RECURRENCE_FIELDS = {"is_recurring", "recurrence_pattern", "due_date"}
+
+def apply_task_update(db: Session, task: models.Task, update_data: dict):
+    """
+    Apply a partial update to a task, keeping completed_at consistent.
+    Raises ValueError if the update leaves a series with an invalid pattern.
+    """
+    # If marking as completed, set completed_at timestamp
+    if update_data.get("is_completed") == True and not task.is_completed:
+        update_data["completed_at"] = datetime.utcnow()
+    elif update_data.get("is_completed") == False:
+        update_data["completed_at"] = None
+    
+    for field, value in update_data.items():
+        setattr(task, field, value)
+    
+    if task.recurrence_parent_id is None and RECURRENCE_FIELDS.intersection(update_data):
+        refresh_series(db, task)
+    if "due_date" in update_data:
+        # The old reminder is dropped when it fires and no longer matches
+        schedule_task_reminder(db, task)
+
+def publish_task_completed(task: Union[models.Task, schemas.Task]):
+    """Tell automation rules a task was completed. Call after the commit."""
+    event_bus.publish(Event(TASK_COMPLETED, task.owner_id, {
+        "task_id": task.id,
+        "title": task.title,
+        "project": task.project,
+        "priority": task.priority,
+        "tags": task.tags or [],
+        "recurrence_parent_id": task.recurrence_parent_id
+    }))
+
+def day_bounds(day: date):
+    """[start, end) datetimes of a day, so due_date filters can use an index."""
+    start = datetime.combine(day, datetime.min.time())
+    return start, start + timedelta(days=1)
+
+def next_tasks(db: Session, user_id: int, limit: int) -> List[models.Task]:
+    """
+    Open tasks in the order to do them: by priority, then earliest due date,
+    undated tasks after the dated ones of the same priority. Dated and undated
+    are read separately so each comes straight off ix_tasks_owner_open_priority
+    with LIMIT (SQLite sorts NULL due dates first, PostgreSQL last).
+    """
+    open_tasks = db.query(models.Task).filter(
+        models.Task.owner_id == user_id,
+        models.Task.is_completed == False
+    )
+    dated = open_tasks.filter(models.Task.due_date.isnot(None)).order_by(
+        models.Task.priority_rank, models.Task.due_date
+    ).limit(limit).all()
+    no_due_date = models.Task.due_date.is_(None)
+    if db.get_bind().dialect.name == "sqlite":
+        # Otherwise SQLite picks ix_tasks_due_date for the NULLs and sorts them all
+        no_due_date = func.likely(no_due_date)
+    undated = open_tasks.filter(no_due_date).order_by(models.Task.priority_rank).limit(limit).all()
+    # Stable sort: each half keeps its index order
+    return sorted(dated + undated, key=lambda task: (task.priority_rank, task.due_date is None))[:limit]
+
 @router.get("/", response_model=List[schemas.Task])
 def get_tasks(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     completed: Optional[bool] = None,
@@ -21,9 +91,13 @@ def get_tasks(
     tag: Optional[str] = None,
     due_date: Optional[date] = None,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get user's tasks with optional filtering."""
+    not_modified = versioning.check_not_modified(request, response, db, current_user.id, versioning.TASKS)
+    if not_modified is not None:
+        return not_modified
+    
     query = db.query(models.Task).filter(models.Task.owner_id == current_user.id)
     
     if completed is not None:
@@ -36,50 +110,65 @@ def get_tasks(
         query = query.filter(models.Task.project == project)
         
     if tag:
-        query = query.filter(models.Task.tags.contains([tag]))
+        query = query.filter(json_array_contains(db, models.Task.tags, tag))
         
     if due_date:
-        query = query.filter(models.Task.due_date.cast(date) == due_date)
+        day_start, day_end = day_bounds(due_date)
+        query = query.filter(models.Task.due_date >= day_start, models.Task.due_date < day_end)
+    
+    query = query.order_by(models.Task.created_at.desc()).offset(skip).limit(limit)
+    if FAST_JSON_RESPONSES:
+        return fast_list_response(query, models.Task, schemas.Task, headers=response.headers)
     
-    tasks = query.order_by(models.Task.created_at.desc()).offset(skip).limit(limit).all()
+    tasks = query.all()
     return tasks
 
 @router.get("/today", response_model=List[schemas.Task])
 def get_today_tasks(
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get tasks due today."""
-    today = datetime.now().date()
+    today_start, today_end = day_bounds(datetime.now().date())
     tasks = db.query(models.Task).filter(
         and_(
             models.Task.owner_id == current_user.id,
-            models.Task.due_date.cast(date) == today,
+            models.Task.due_date >= today_start,
+            models.Task.due_date < today_end,
             models.Task.is_completed == False
         )
-    ).order_by(models.Task.priority.desc()).all()
+    ).order_by(models.Task.priority_rank, models.Task.due_date).all()
     return tasks
 
 @router.get("/overdue", response_model=List[schemas.Task])
 def get_overdue_tasks(
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get overdue tasks."""
-    today = datetime.now().date()
+    today_start, _ = day_bounds(datetime.now().date())
     tasks = db.query(models.Task).filter(
         and_(
             models.Task.owner_id == current_user.id,
-            models.Task.due_date.cast(date) < today,
+            models.Task.due_date < today_start,
             models.Task.is_completed == False
         )
     ).order_by(models.Task.due_date.asc()).all()
     return tasks
 
+@router.get("/next", response_model=List[schemas.Task])
+def get_next_tasks(
+    limit: int = Query(10, ge=1, le=100),
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """Get the open tasks to work on next, most urgent first."""
+    return next_tasks(db, current_user.id, limit)
+
 @router.get("/stats")
 def get_task_stats(
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get task statistics for the user."""
     total_tasks = db.query(models.Task).filter(models.Task.owner_id == current_user.id).count()
@@ -87,11 +176,12 @@ def get_task_stats(
         and_(models.Task.owner_id == current_user.id, models.Task.is_completed == True)
     ).count()
     
-    today = datetime.now().date()
+    today_start, today_end = day_bounds(datetime.now().date())
     tasks_due_today = db.query(models.Task).filter(
         and_(
             models.Task.owner_id == current_user.id,
-            models.Task.due_date.cast(date) == today,
+            models.Task.due_date >= today_start,
+            models.Task.due_date < today_end,
             models.Task.is_completed == False
         )
     ).count()
@@ -99,7 +189,7 @@ def get_task_stats(
     overdue_tasks = db.query(models.Task).filter(
         and_(
             models.Task.owner_id == current_user.id,
-            models.Task.due_date.cast(date) < today,
+            models.Task.due_date < today_start,
             models.Task.is_completed == False
         )
     ).count()
@@ -127,15 +217,22 @@ def create_task(
         owner_id=current_user.id
     )
     db.add(db_task)
+    db.flush()
+    record_change(db, current_user.id, versioning.TASKS, db_task.id)
+    schedule_task_reminder(db, db_task)
+    if is_series(db_task):
+        try:
+            refresh_series(db, db_task)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid recurrence pattern: {e}")
     db.commit()
-    db.refresh(db_task)
     return db_task
 
 @router.get("/{task_id}", response_model=schemas.Task)
 def get_task(
     task_id: int,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get a specific task."""
     task = db.query(models.Task).filter(
@@ -159,19 +256,15 @@ def update_task(
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    update_data = task_update.dict(exclude_unset=True)
-    
-    # If marking as completed, set completed_at timestamp
-    if update_data.get("is_completed") == True and not task.is_completed:
-        update_data["completed_at"] = datetime.utcnow()
-    elif update_data.get("is_completed") == False:
-        update_data["completed_at"] = None
-    
-    for field, value in update_data.items():
-        setattr(task, field, value)
-    
+    was_completed = task.is_completed
+    try:
+        apply_task_update(db, task, task_update.dict(exclude_unset=True))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid recurrence pattern: {e}")
+    record_change(db, current_user.id, versioning.TASKS, task.id)
     db.commit()
-    db.refresh(task)
+    if task.is_completed and not was_completed:
+        publish_task_completed(task)
     return task
 
 @router.delete("/{task_id}")
@@ -187,6 +280,9 @@ def delete_task(
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
+    if task.recurrence_parent_id is None:
+        remove_series(db, task)
+    record_change(db, current_user.id, versioning.TASKS, task.id, deleted=True)
     db.delete(task)
     db.commit()
     return {"message": "Task deleted successfully"}
@@ -198,28 +294,41 @@ def toggle_task_completion(
     db: Session = Depends(get_db)
 ):
     """Toggle task completion status."""
-    task = db.query(models.Task).filter(
-        and_(models.Task.id == task_id, models.Task.owner_id == current_user.id)
-    ).first()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
+    def toggle(db: Session) -> schemas.Task:
+        task = db.query(models.Task).filter(
+            and_(models.Task.id == task_id, models.Task.owner_id == current_user.id)
+        ).first()
+        if not task:
+            raise HTTPException(status_code=404, detail="Task not found")
+        
+        task.is_completed = not task.is_completed
+        if task.is_completed:
+            task.completed_at = datetime.utcnow()
+        else:
+            task.completed_at = None
+        
+        record_change(db, current_user.id, versioning.TASKS, task.id)
+        db.flush()
+        return schemas.Task.model_validate(task)
     
-    task.is_completed = not task.is_completed
+    # Group-committed with concurrent toggles when write batching is enabled
+    task = run_write(db, toggle)
     if task.is_completed:
-        task.completed_at = datetime.utcnow()
-    else:
-        task.completed_at = None
-    
-    db.commit()
-    db.refresh(task)
+        publish_task_completed(task)
     return task
 
 @router.get("/projects/list")
 def get_projects(
+    request: Request,
+    response: Response,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get list of unique projects for the user."""
+    not_modified = versioning.check_not_modified(request, response, db, current_user.id, versioning.TASKS)
+    if not_modified is not None:
+        return not_modified
+    
     projects = db.query(models.Task.project).filter(
         and_(
             models.Task.owner_id == current_user.id,
@@ -232,10 +341,16 @@ def get_projects(
 
 @router.get("/tags/list")
 def get_tags(
+    request: Request,
+    response: Response,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get list of unique tags for the user."""
+    not_modified = versioning.check_not_modified(request, response, db, current_user.id, versioning.TASKS)
+    if not_modified is not None:
+        return not_modified
+    
     tasks_with_tags = db.query(models.Task.tags).filter(
         and_(
             models.Task.owner_id == current_user.id,
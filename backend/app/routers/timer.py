@@ -1,16 +1,32 @@
 # backend/app/routers/timer.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, func
 from typing import List, Optional
 from datetime import datetime, timedelta
 
-from app.db import get_db
 from app import models, schemas
-from app.routers.auth import get_current_user
+from app.routers.auth import get_current_settings, get_current_user, get_db, get_read_db
+from app.serialization import FAST_JSON_RESPONSES, fast_list_response
+from app.services import versioning
+from app.services.job_scheduler import schedule_timer_end
+from app.services.settings_cache import CachedSettings
+from app.services.change_log import record_change
+from app.services.event_bus import TIMER_FINISHED, Event, event_bus
+from app.services.write_batcher import run_write
 
 router = APIRouter()
 
+def get_rollups(db: Session, user_id: int, start, end) -> List[models.TimerSessionRollup]:
+    """Daily rollups of compacted sessions in [start, end)."""
+    return db.query(models.TimerSessionRollup).filter(
+        and_(
+            models.TimerSessionRollup.user_id == user_id,
+            models.TimerSessionRollup.day >= start,
+            models.TimerSessionRollup.day < end
+        )
+    ).all()
+
 @router.post("/sessions", response_model=schemas.TimerSession)
 def start_timer_session(
     session: schemas.TimerSessionCreate,
@@ -23,21 +39,29 @@ def start_timer_session(
         user_id=current_user.id
     )
     db.add(db_session)
+    db.flush()
+    record_change(db, current_user.id, versioning.TIMER, db_session.id)
+    schedule_timer_end(db, db_session)
     db.commit()
-    db.refresh(db_session)
     return db_session
 
 @router.get("/sessions", response_model=List[schemas.TimerSession])
 def get_timer_sessions(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 50,
     session_type: Optional[str] = None,
     date_from: Optional[datetime] = None,
     date_to: Optional[datetime] = None,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get user's timer sessions with optional filtering."""
+    not_modified = versioning.check_not_modified(request, response, db, current_user.id, versioning.TIMER)
+    if not_modified is not None:
+        return not_modified
+    
     query = db.query(models.TimerSession).filter(models.TimerSession.user_id == current_user.id)
     
     if session_type:
@@ -49,13 +73,17 @@ def get_timer_sessions(
     if date_to:
         query = query.filter(models.TimerSession.started_at <= date_to)
     
-    sessions = query.order_by(models.TimerSession.started_at.desc()).offset(skip).limit(limit).all()
+    query = query.order_by(models.TimerSession.started_at.desc()).offset(skip).limit(limit)
+    if FAST_JSON_RESPONSES:
+        return fast_list_response(query, models.TimerSession, schemas.TimerSession, headers=response.headers)
+    
+    sessions = query.all()
     return sessions
 
 @router.get("/sessions/today", response_model=List[schemas.TimerSession])
 def get_today_sessions(
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get today's timer sessions."""
     today = datetime.now().date()
@@ -79,30 +107,44 @@ def update_timer_session(
     db: Session = Depends(get_db)
 ):
     """Update a timer session (usually to end it)."""
-    session = db.query(models.TimerSession).filter(
-        and_(
-            models.TimerSession.id == session_id,
-            models.TimerSession.user_id == current_user.id
-        )
-    ).first()
-    
-    if not session:
-        raise HTTPException(status_code=404, detail="Timer session not found")
-    
-    update_data = session_update.dict(exclude_unset=True)
-    
-    for field, value in update_data.items():
-        setattr(session, field, value)
+    def update(db: Session):
+        session = db.query(models.TimerSession).filter(
+            and_(
+                models.TimerSession.id == session_id,
+                models.TimerSession.user_id == current_user.id
+            )
+        ).first()
+        
+        if not session:
+            raise HTTPException(status_code=404, detail="Timer session not found")
+        
+        was_completed = session.was_completed
+        update_data = session_update.dict(exclude_unset=True)
+        
+        for field, value in update_data.items():
+            setattr(session, field, value)
+        
+        record_change(db, current_user.id, versioning.TIMER, session.id)
+        db.flush()
+        return schemas.TimerSession.model_validate(session), was_completed
     
-    db.commit()
-    db.refresh(session)
+    # Group-committed with other small writes when write batching is enabled
+    session, was_completed = run_write(db, update)
+    if session.was_completed and not was_completed:
+        event_bus.publish(Event(TIMER_FINISHED, current_user.id, {
+            "session_id": session.id,
+            "session_type": session.session_type,
+            "duration": session.duration_actual or 0,
+            "task_id": session.task_id,
+            "task_title": session.task_title
+        }))
     return session
 
 @router.get("/sessions/{session_id}", response_model=schemas.TimerSession)
 def get_timer_session(
     session_id: int,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get a specific timer session."""
     session = db.query(models.TimerSession).filter(
@@ -134,6 +176,7 @@ def delete_timer_session(
     if not session:
         raise HTTPException(status_code=404, detail="Timer session not found")
     
+    record_change(db, current_user.id, versioning.TIMER, session.id, deleted=True)
     db.delete(session)
     db.commit()
     return {"message": "Timer session deleted successfully"}
@@ -142,7 +185,7 @@ def delete_timer_session(
 def get_daily_stats(
     date: Optional[datetime] = None,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get daily timer statistics."""
     if date is None:
@@ -161,14 +204,21 @@ def get_daily_stats(
         )
     ).all()
     
+    # Days older than the compaction window only exist as rollups
+    rollups = get_rollups(db, current_user.id, date, tomorrow)
+    pomodoro_rollups = [r for r in rollups if r.session_type == "pomodoro"]
+    break_rollups = [r for r in rollups if r.session_type == "break"]
+    
     # Calculate statistics
-    total_time = sum(s.duration_actual or 0 for s in sessions)
+    total_time = sum(s.duration_actual or 0 for s in sessions) + sum(r.total_duration for r in rollups)
+    total_sessions = len(sessions) + sum(r.session_count for r in rollups)
     pomodoro_sessions = [s for s in sessions if s.session_type == "pomodoro"]
     break_sessions = [s for s in sessions if s.session_type == "break"]
-    completed_pomodoros = len([s for s in pomodoro_sessions if s.was_completed])
+    pomodoro_count = len(pomodoro_sessions) + sum(r.session_count for r in pomodoro_rollups)
+    completed_pomodoros = len([s for s in pomodoro_sessions if s.was_completed]) + sum(r.completed_count for r in pomodoro_rollups)
     
-    pomodoro_time = sum(s.duration_actual or 0 for s in pomodoro_sessions)
-    break_time = sum(s.duration_actual or 0 for s in break_sessions)
+    pomodoro_time = sum(s.duration_actual or 0 for s in pomodoro_sessions) + sum(r.total_duration for r in pomodoro_rollups)
+    break_time = sum(s.duration_actual or 0 for s in break_sessions) + sum(r.total_duration for r in break_rollups)
     
     return {
         "date": date.isoformat(),
@@ -178,18 +228,18 @@ def get_daily_stats(
         "pomodoro_time_minutes": round(pomodoro_time / 60, 2),
         "break_time_seconds": break_time,
         "break_time_minutes": round(break_time / 60, 2),
-        "total_sessions": len(sessions),
-        "pomodoro_sessions": len(pomodoro_sessions),
+        "total_sessions": total_sessions,
+        "pomodoro_sessions": pomodoro_count,
         "completed_pomodoros": completed_pomodoros,
-        "average_session_length": round(total_time / len(sessions), 2) if sessions else 0,
-        "productivity_score": round((completed_pomodoros / len(pomodoro_sessions) * 100), 2) if pomodoro_sessions else 0
+        "average_session_length": round(total_time / total_sessions, 2) if total_sessions else 0,
+        "productivity_score": round((completed_pomodoros / pomodoro_count * 100), 2) if pomodoro_count else 0
     }
 
 @router.get("/stats/weekly")
 def get_weekly_stats(
     weeks_back: int = 0,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get weekly timer statistics."""
     today = datetime.now().date()
@@ -204,32 +254,41 @@ def get_weekly_stats(
         )
     ).all()
     
+    rollups = get_rollups(db, current_user.id, start_of_week, end_of_week)
+    
     # Group by day
     daily_stats = {}
     for i in range(7):
         day = start_of_week + timedelta(days=i)
         day_sessions = [s for s in sessions if s.started_at.date() == day]
+        day_rollups = [r for r in rollups if r.day == day]
         
-        total_time = sum(s.duration_actual or 0 for s in day_sessions)
+        total_time = sum(s.duration_actual or 0 for s in day_sessions) + sum(r.total_duration for r in day_rollups)
         pomodoro_sessions = [s for s in day_sessions if s.session_type == "pomodoro"]
-        completed_pomodoros = len([s for s in pomodoro_sessions if s.was_completed])
+        completed_pomodoros = len([s for s in pomodoro_sessions if s.was_completed]) + sum(
+            r.completed_count for r in day_rollups if r.session_type == "pomodoro"
+        )
         
         daily_stats[day.isoformat()] = {
             "total_time_minutes": round(total_time / 60, 2),
-            "total_sessions": len(day_sessions),
+            "total_sessions": len(day_sessions) + sum(r.session_count for r in day_rollups),
             "completed_pomodoros": completed_pomodoros
         }
     
     # Overall week stats
-    total_time = sum(s.duration_actual or 0 for s in sessions)
-    total_pomodoros = len([s for s in sessions if s.session_type == "pomodoro"])
-    completed_pomodoros = len([s for s in sessions if s.session_type == "pomodoro" and s.was_completed])
+    pomodoro_rollups = [r for r in rollups if r.session_type == "pomodoro"]
+    total_time = sum(s.duration_actual or 0 for s in sessions) + sum(r.total_duration for r in rollups)
+    total_sessions = len(sessions) + sum(r.session_count for r in rollups)
+    total_pomodoros = len([s for s in sessions if s.session_type == "pomodoro"]) + sum(r.session_count for r in pomodoro_rollups)
+    completed_pomodoros = len([s for s in sessions if s.session_type == "pomodoro" and s.was_completed]) + sum(
+        r.completed_count for r in pomodoro_rollups
+    )
     
     return {
         "week_start": start_of_week.isoformat(),
         "week_end": (end_of_week - timedelta(days=1)).isoformat(),
         "total_time_hours": round(total_time / 3600, 2),
-        "total_sessions": len(sessions),
+        "total_sessions": total_sessions,
         "total_pomodoros": total_pomodoros,
         "completed_pomodoros": completed_pomodoros,
         "daily_breakdown": daily_stats,
@@ -239,15 +298,10 @@ def get_weekly_stats(
 
 @router.get("/settings/pomodoro")
 def get_pomodoro_settings(
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    cached: Optional[CachedSettings] = Depends(get_current_settings)
 ):
     """Get user's Pomodoro settings."""
-    settings = db.query(models.UserSettings).filter(
-        models.UserSettings.user_id == current_user.id
-    ).first()
-    
-    if not settings:
+    if not cached:
         # Return default settings
         return {
             "work_duration": 25,
@@ -255,6 +309,7 @@ def get_pomodoro_settings(
             "long_break_duration": 15
         }
     
+    settings = cached.settings
     return {
         "work_duration": settings.pomodoro_work_duration,
         "break_duration": settings.pomodoro_break_duration,
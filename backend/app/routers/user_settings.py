@@ -1,27 +1,35 @@
 # backend/app/routers/user_settings.py
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 
-from app.db import get_db
 from app import models, schemas
-from app.routers.auth import get_current_user
+from app.routers.auth import get_current_settings, get_current_user, get_db
+from app.services import versioning
+from app.services.change_log import record_change
+from app.services.settings_cache import CachedSettings, settings_cache
 
 settings_router = APIRouter()
 
 @settings_router.get("/", response_model=schemas.UserSettings)
 def get_user_settings(
+    request: Request,
+    response: Response,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    cached: Optional[CachedSettings] = Depends(get_current_settings)
 ):
     """Get user settings."""
-    settings = db.query(models.UserSettings).filter(
-        models.UserSettings.user_id == current_user.id
-    ).first()
-    
-    if not settings:
+    if not cached:
         raise HTTPException(status_code=404, detail="Settings not found")
     
-    return settings
+    not_modified = versioning.check_not_modified(
+        request, response, None, current_user.id, versioning.SETTINGS, version=cached.version
+    )
+    if not_modified is not None:
+        return not_modified
+    
+    return cached.settings
 
 @settings_router.put("/", response_model=schemas.UserSettings)
 def update_user_settings(
@@ -41,21 +49,27 @@ def update_user_settings(
     for field, value in update_data.items():
         setattr(settings, field, value)
     
+    record_change(db, current_user.id, versioning.SETTINGS, settings.id)
+    version = versioning.get_version(db, current_user.id, versioning.SETTINGS)
     db.commit()
-    db.refresh(settings)
+    settings_cache.put(current_user.id, settings, version)
     return settings
 
 @settings_router.get("/widgets")
 def get_enabled_widgets(
+    request: Request,
+    response: Response,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    cached: Optional[CachedSettings] = Depends(get_current_settings)
 ):
     """Get user's enabled widgets."""
-    settings = db.query(models.UserSettings).filter(
-        models.UserSettings.user_id == current_user.id
-    ).first()
+    not_modified = versioning.check_not_modified(
+        request, response, None, current_user.id, versioning.SETTINGS, version=cached.version if cached else 0
+    )
+    if not_modified is not None:
+        return not_modified
     
-    enabled_widgets = settings.enabled_widgets if settings else ["calendar", "tasks", "timer", "ai_chat"]
+    enabled_widgets = cached.settings.enabled_widgets if cached else ["calendar", "tasks", "timer", "ai_chat"]
     
     return {"enabled_widgets": enabled_widgets}
 
@@ -74,7 +88,9 @@ def update_enabled_widgets(
         raise HTTPException(status_code=404, detail="Settings not found")
     
     settings.enabled_widgets = widgets_data.get("enabled_widgets", [])
+    record_change(db, current_user.id, versioning.SETTINGS, settings.id)
+    version = versioning.get_version(db, current_user.id, versioning.SETTINGS)
     db.commit()
-    db.refresh(settings)
+    settings_cache.put(current_user.id, settings, version)
     
     return {"enabled_widgets": settings.enabled_widgets}
\ No newline at end of file
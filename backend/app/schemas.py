@@ -1,7 +1,7 @@
 # backend/app/schemas.py
 from pydantic import BaseModel, EmailStr
 from typing import Optional, List, Dict, Any
-from datetime import datetime
+from datetime import date, datetime
 
 # User schemas
 class UserBase(BaseModel):
@@ -92,6 +92,8 @@ class Task(TaskBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
     owner_id: int
+    recurrence_parent_id: Optional[int] = None
+    occurrence_date: Optional[date] = None
     
     class Config:
         from_attributes = True
@@ -165,6 +167,21 @@ class FeedItem(FeedItemBase):
     class Config:
         from_attributes = True
 
+class FeedSourceCreate(BaseModel):
+    url: str
+    title: Optional[str] = None
+    category: Optional[str] = None
+    feed_type: Optional[str] = "article"
+
+class FeedSubscription(BaseModel):
+    id: int
+    source_id: int
+    url: str
+    title: Optional[str] = None
+    category: Optional[str] = None
+    last_fetched_at: Optional[datetime] = None
+    created_at: datetime
+
 # Reading Item schemas
 class ReadingItemBase(BaseModel):
     title: str
@@ -179,11 +196,42 @@ class ReadingItemCreate(ReadingItemBase):
     pass
 
 class ReadingItemUpdate(BaseModel):
+    title: Optional[str] = None
+    url: Optional[str] = None
+    author: Optional[str] = None
+    source: Optional[str] = None
+    total_pages: Optional[int] = None
+    tags: Optional[List[str]] = None
+    category: Optional[str] = None
     current_page: Optional[int] = None
     progress_percentage: Optional[float] = None
     status: Optional[str] = None
     notes: Optional[str] = None
-    highlights: Optional[List[Dict[str, Any]]] = None
+
+class ReadingProgressUpdate(BaseModel):
+    current_page: Optional[int] = None
+    progress_percentage: Optional[float] = None
+
+class ReadingProgress(BaseModel):
+    id: int
+    current_page: int
+    progress_percentage: float
+    status: str
+
+class ReadingHighlightCreate(BaseModel):
+    text: str
+    note: Optional[str] = None
+    page: Optional[int] = None
+    location: Optional[str] = None
+    color: Optional[str] = None
+
+class ReadingHighlight(ReadingHighlightCreate):
+    id: int
+    reading_item_id: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
 
 class ReadingItem(ReadingItemBase):
     id: int
@@ -195,7 +243,7 @@ class ReadingItem(ReadingItemBase):
     started_reading_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     notes: Optional[str] = None
-    highlights: List[Dict[str, Any]]
+    highlights: List[ReadingHighlight] = []
     
     class Config:
         from_attributes = True
@@ -237,4 +285,39 @@ class DashboardData(BaseModel):
     tasks_overdue: List[Task]
     recent_timer_sessions: List[TimerSession]
     unread_feeds: List[FeedItem]
-    productivity_stats: Dict[str, Any]
\ No newline at end of file
+    productivity_stats: Dict[str, Any]
+
+# Sync schemas
+class SyncPullResponse(BaseModel):
+    watermark: int
+    has_more: bool
+    tasks: List[Task] = []
+    timer_sessions: List[TimerSession] = []
+    feed_items: List[FeedItem] = []
+    settings: Optional[UserSettings] = None
+    tombstones: Dict[str, List[int]] = {}
+
+class SyncMutation(BaseModel):
+    resource: str  # tasks, timer, feeds, settings
+    op: str  # create, update, delete
+    id: Optional[int] = None  # server id, for update/delete
+    client_ref: Optional[str] = None  # client-side temporary id, echoed back on create
+    base_seq: Optional[int] = None  # watermark the client's copy was based on
+    data: Dict[str, Any] = {}
+
+class SyncPushRequest(BaseModel):
+    mutations: List[SyncMutation]
+    conflict_strategy: str = "server_wins"  # server_wins, client_wins
+
+class SyncMutationResult(BaseModel):
+    index: int
+    status: str  # applied, conflict, error
+    resource: str
+    id: Optional[int] = None
+    client_ref: Optional[str] = None
+    detail: Optional[str] = None
+    server_version: Optional[Dict[str, Any]] = None
+
+class SyncPushResponse(BaseModel):
+    watermark: int
+    results: List[SyncMutationResult]
@@ -0,0 +1,69 @@
+# backend/app/serialization.py
+from datetime import date, datetime, time
+from functools import lru_cache
+from typing import Any, List, Mapping, Optional, Tuple
+import json
+import os
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson  # Optional: much faster JSON encoding for large list responses
+except ImportError:  # pragma: no cover - orjson is an optional dependency
+    orjson = None
+
+# Opt-in high-throughput path for list endpoints. When enabled, list queries
+# select only the columns the response schema needs, skip ORM object
+# construction and pydantic re-validation, and encode rows directly.
+FAST_JSON_RESPONSES = os.getenv("FAST_JSON_RESPONSES", "false").lower() == "true"
+
+
+def _json_default(value: Any) -> str:
+    # ISO 8601 like orjson and pydantic, not str()'s "2024-01-01 12:00:00"
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_json(content: Any) -> bytes:
+    """Compact JSON with orjson when available, stdlib json otherwise."""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, separators=(",", ":"), default=_json_default).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with orjson when available, stdlib json otherwise."""
+
+    def render(self, content: Any) -> bytes:
+        return encode_json(content)
+
+
+@lru_cache(maxsize=None)
+def schema_fields(schema) -> Tuple[str, ...]:
+    """Field names of a response schema, in declaration order."""
+    return tuple(schema.model_fields.keys())
+
+
+def schema_columns(model, schema) -> List:
+    """The mapped columns of ``model`` backing every field of ``schema``."""
+    return [getattr(model, field) for field in schema_fields(schema)]
+
+
+def rows_to_dicts(rows, fields) -> List[dict]:
+    """Turn row tuples into plain dicts keyed by ``fields``."""
+    return [dict(zip(fields, row)) for row in rows]
+
+
+def fast_list_response(query, model, schema, headers: Optional[Mapping[str, str]] = None) -> FastJSONResponse:
+    """Run ``query`` as a column select shaped for ``schema`` and encode it directly.
+
+    The rows come straight from our own tables, so they're trusted to already
+    match the schema and aren't validated again.
+    """
+    fields = schema_fields(schema)
+    rows = query.with_entities(*schema_columns(model, schema)).all()
+    if headers:
+        # Carry over headers already set on the endpoint's response (e.g. ETag)
+        headers = {k: v for k, v in headers.items() if k.lower() != "content-length"}
+    return FastJSONResponse(rows_to_dicts(rows, fields), headers=headers or None)
@@ -1,10 +1,26 @@
 # backend/app/services/ai_service.py
 import os
-from openai import AzureOpenAI
 from typing import List, Dict, Any, Optional
 import json
+import time
 from datetime import datetime
 
+from app.metrics import registry
+
+# Build the shared client at startup (off the request path) when a key is set
+AI_PREWARM = os.getenv("AI_PREWARM", "true").lower() == "true"
+
+ai_request_duration_seconds = registry.histogram(
+    "ai_request_duration_seconds", "LLM completion latency.", ("operation",),
+    buckets=(0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0)
+)
+ai_requests_total = registry.counter(
+    "ai_requests_total", "LLM completion calls by outcome.", ("operation", "outcome")
+)
+ai_tokens_total = registry.counter(
+    "ai_tokens_total", "LLM tokens used.", ("operation", "kind")
+)
+
 class AIService:
     def __init__(self):
         # Azure OpenAI configuration - adapted from the provided azure_openai_call.py
@@ -20,12 +36,31 @@ class AIService:
         if not self.subscription_key:
             raise ValueError("AZURE_OPENAI_KEY environment variable is required")
         
+        # openai is the heaviest import in the app; load it on first use only
+        from openai import AzureOpenAI
         self.client = AzureOpenAI(
             api_version=self.api_version,
             azure_endpoint=self.endpoint,
             api_key=self.subscription_key,
         )
 
+    def _complete(self, operation: str, **kwargs):
+        """Run a chat completion, recording latency and token usage."""
+        started = time.perf_counter()
+        try:
+            response = self.client.chat.completions.create(**kwargs)
+        except Exception:
+            ai_requests_total.inc(operation=operation, outcome="error")
+            raise
+        finally:
+            ai_request_duration_seconds.observe(time.perf_counter() - started, operation=operation)
+        ai_requests_total.inc(operation=operation, outcome="success")
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            ai_tokens_total.inc(usage.prompt_tokens or 0, operation=operation, kind="prompt")
+            ai_tokens_total.inc(usage.completion_tokens or 0, operation=operation, kind="completion")
+        return response
+
     def _get_system_prompt(self, personality: str = "helpful") -> str:
         """Get system prompt based on user's AI personality preference."""
         prompts = {
@@ -57,7 +92,8 @@ class AIService:
                 {"role": "user", "content": message}
             ]
             
-            response = self.client.chat.completions.create(
+            response = self._complete(
+                "chat",
                 messages=messages,
                 max_completion_tokens=800,
                 temperature=0.7,
@@ -97,7 +133,8 @@ class AIService:
                 {"role": "user", "content": prompt}
             ]
             
-            response = self.client.chat.completions.create(
+            response = self._complete(
+                "task_suggestions",
                 messages=messages,
                 max_completion_tokens=400,
                 temperature=0.8,
@@ -137,7 +174,8 @@ class AIService:
                 {"role": "user", "content": prompt}
             ]
             
-            response = self.client.chat.completions.create(
+            response = self._complete(
+                "productivity_analysis",
                 messages=messages,
                 max_completion_tokens=600,
                 temperature=0.6,
@@ -172,7 +210,8 @@ class AIService:
                 {"role": "user", "content": prompt}
             ]
             
-            response = self.client.chat.completions.create(
+            response = self._complete(
+                "quick_fact",
                 messages=messages,
                 max_completion_tokens=300,
                 temperature=0.9,
@@ -218,7 +257,8 @@ class AIService:
                 {"role": "user", "content": prompt}
             ]
             
-            response = self.client.chat.completions.create(
+            response = self._complete(
+                "task_parsing",
                 messages=messages,
                 max_completion_tokens=300,
                 temperature=0.3,
@@ -241,4 +281,23 @@ class AIService:
                 }
             
         except Exception as e:
-            raise Exception(f"Failed to parse task: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Failed to parse task: {str(e)}")
+
+
+_ai_service: Optional[AIService] = None
+
+
+def get_ai_service() -> AIService:
+    """Shared AIService; the client keeps its HTTP connection pool between requests."""
+    global _ai_service
+    if _ai_service is None:
+        _ai_service = AIService()
+    return _ai_service
+
+
+def prewarm_ai_service() -> bool:
+    """Import openai and build the shared client ahead of the first AI request."""
+    if not os.getenv("AZURE_OPENAI_KEY"):
+        return False
+    get_ai_service()
+    return True
@@ -0,0 +1,371 @@
+# backend/app/services/automation.py
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from datetime import datetime, time as clock_time, timedelta, timezone
+from typing import Any, Collection, Dict, List, Optional, Tuple
+import asyncio
+import logging
+import os
+import re
+import threading
+import time
+
+import httpx
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+from app import models
+from app.services import versioning
+from app.services.change_log import record_change
+from app.services.event_bus import TASK_COMPLETED, TIME_BASED, TIMER_FINISHED, Event, event_bus
+from app.services.recurrence import build_rule
+from app.services.url_safety import OUTBOUND_ALLOWED_HOSTS, check_public_url, public_url_guard
+from app.services.websocket_manager import manager
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+AUTOMATION_ENABLED = os.getenv("AUTOMATION_ENABLED", "true").lower() == "true"
+AUTOMATION_WORKERS = int(os.getenv("AUTOMATION_WORKERS", "4"))
+# Events waiting for a worker; beyond this new events are dropped and counted
+AUTOMATION_QUEUE_SIZE = int(os.getenv("AUTOMATION_QUEUE_SIZE", "1000"))
+AUTOMATION_INDEX_SIZE = int(os.getenv("AUTOMATION_INDEX_SIZE", "10000"))  # users kept in the rule index
+AUTOMATION_WEBHOOK_TIMEOUT = float(os.getenv("AUTOMATION_WEBHOOK_TIMEOUT", "10"))
+
+# Triggers fed by the event bus; time_based rules are fired by the job scheduler
+EVENT_TRIGGERS = (TASK_COMPLETED, TIMER_FINISHED)
+TRIGGER_TYPES = EVENT_TRIGGERS + (TIME_BASED,)
+ACTION_TYPES = ("send_notification", "create_task", "webhook")
+
+_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+
+@dataclass(frozen=True)
+class RuleSnapshot:
+    id: int
+    user_id: int
+    name: str
+    trigger_config: Dict[str, Any]
+    action_type: str
+    action_config: Dict[str, Any]
+
+
+def next_time_based_fire(trigger_config: Dict[str, Any], after: datetime) -> Optional[datetime]:
+    """
+    Next fire time strictly after `after` for a time_based trigger_config:
+    {"at": "2025-06-01T09:00"} fires once, {"time": "09:00"} daily and
+    {"time": "09:00", "days_of_week": ["MO", "FR"]} on those days, all in
+    naive UTC. Raises ValueError for anything else.
+    """
+    if trigger_config.get("at"):
+        at = datetime.fromisoformat(str(trigger_config["at"]))
+        if at.tzinfo is not None:
+            at = at.astimezone(timezone.utc).replace(tzinfo=None)
+        return at if at > after else None
+    if not trigger_config.get("time"):
+        raise ValueError("time_based triggers need 'at' or 'time'")
+    hour, minute = (int(part) for part in str(trigger_config["time"]).split(":")[:2])
+    start = datetime.combine(after.date(), clock_time(hour, minute))
+    days = trigger_config.get("days_of_week")
+    pattern = {"type": "weekly", "days_of_week": days} if days else {"type": "daily"}
+    return build_rule(pattern, start).after(after)
+
+
+def validate_rule(trigger_type: str, trigger_config: Dict[str, Any], action_type: str, action_config: Dict[str, Any]):
+    """Raise ValueError for rules the engine can't run."""
+    if trigger_type not in TRIGGER_TYPES:
+        raise ValueError(f"Unsupported trigger_type '{trigger_type}'. Supported: {', '.join(TRIGGER_TYPES)}")
+    if action_type not in ACTION_TYPES:
+        raise ValueError(f"Unsupported action_type '{action_type}'. Supported: {', '.join(ACTION_TYPES)}")
+    if trigger_type == TIME_BASED:
+        next_time_based_fire(trigger_config or {}, datetime.utcnow())
+    if action_type == "create_task" and not action_config.get("title"):
+        raise ValueError("create_task actions need a 'title'")
+    if action_type == "webhook":
+        if not action_config.get("url"):
+            raise ValueError("webhook actions need an http(s) 'url'")
+        check_public_url(str(action_config["url"]))
+
+
+def rule_matches(trigger_config: Dict[str, Any], payload: Dict[str, Any]) -> bool:
+    """
+    Every trigger_config key must hold for the event payload: "tags" needs
+    one shared tag, "min_<field>" a payload value at least that large, and
+    any other key an equal value.
+    """
+    for key, expected in (trigger_config or {}).items():
+        if key == "tags":
+            wanted = expected if isinstance(expected, list) else [expected]
+            if not set(wanted).intersection(payload.get("tags") or []):
+                return False
+        elif key.startswith("min_"):
+            value = payload.get(key[4:])
+            if value is None or value < expected:
+                return False
+        elif payload.get(key) != expected:
+            return False
+    return True
+
+
+def render(template: str, payload: Dict[str, Any]) -> str:
+    """Fill {field} placeholders from the event payload."""
+    return _PLACEHOLDER.sub(lambda m: str(payload.get(m.group(1), "")), template or "")
+
+
+def snapshot_rule(rule: models.AutomationRule) -> RuleSnapshot:
+    return RuleSnapshot(
+        id=rule.id,
+        user_id=rule.user_id,
+        name=rule.name,
+        trigger_config=dict(rule.trigger_config or {}),
+        action_type=rule.action_type,
+        action_config=dict(rule.action_config or {}),
+    )
+
+
+class RuleIndex:
+    """
+    Active rules per user, grouped by trigger type. An entry is reused while
+    the user's automation version is unchanged, so a lookup costs one primary
+    key read and rule edits in any worker are picked up on the next event.
+    """
+
+    def __init__(self, max_users: int = AUTOMATION_INDEX_SIZE):
+        self.max_users = max_users
+        self._entries: "OrderedDict[int, Tuple[int, Dict[str, List[RuleSnapshot]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+
+    def lookup(self, db: Session, user_id: int, trigger_type: str) -> List[RuleSnapshot]:
+        version = versioning.get_version(db, user_id, versioning.AUTOMATION)
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[1].get(trigger_type, [])
+
+        rules = self._load(db, user_id)
+        with self._lock:
+            self._entries[user_id] = (version, rules)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+            self.loads += 1
+        return rules.get(trigger_type, [])
+
+    def _load(self, db: Session, user_id: int) -> Dict[str, List[RuleSnapshot]]:
+        rules: Dict[str, List[RuleSnapshot]] = defaultdict(list)
+        for rule in db.query(models.AutomationRule).filter(
+            models.AutomationRule.user_id == user_id,
+            models.AutomationRule.is_active == True
+        ).order_by(models.AutomationRule.id):
+            rules[rule.trigger_type].append(snapshot_rule(rule))
+        return dict(rules)
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class AutomationEngine:
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        workers: int = AUTOMATION_WORKERS,
+        queue_size: int = AUTOMATION_QUEUE_SIZE,
+        bus=event_bus,
+        notifier=manager,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        allowed_hosts: Collection[str] = OUTBOUND_ALLOWED_HOSTS
+    ):
+        self.session_factory = session_factory
+        self.workers = workers
+        self.queue_size = queue_size
+        self.bus = bus
+        self.notifier = notifier
+        self.transport = transport
+        self.allowed_hosts = allowed_hosts
+        self.index = RuleIndex()
+        self.stats = {
+            "events_received": 0,
+            "events_dropped": 0,
+            "events_processed": 0,
+            "rules_matched": 0,
+        }
+        self.action_stats = defaultdict(lambda: {"succeeded": 0, "failed": 0, "seconds_total": 0.0})
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._client: Optional[httpx.AsyncClient] = None
+        self._actions = {
+            "send_notification": self._send_notification,
+            "create_task": self._create_task,
+            "webhook": self._webhook,
+        }
+
+    def submit(self, event: Event):
+        """Queue an event from any thread without waiting on its rules."""
+        if self._loop is None:
+            return
+        self._loop.call_soon_threadsafe(self._enqueue, event)
+
+    def _enqueue(self, event: Event):
+        try:
+            self._queue.put_nowait(event)
+            self.stats["events_received"] += 1
+        except asyncio.QueueFull:
+            self.stats["events_dropped"] += 1
+            logger.warning("Automation queue full, dropped %s event for user %s", event.type, event.user_id)
+
+    def _matching_rules(self, event: Event) -> List[RuleSnapshot]:
+        db = self.session_factory()
+        try:
+            rules = self.index.lookup(db, event.user_id, event.type)
+        finally:
+            db.close()
+        return [rule for rule in rules if rule_matches(rule.trigger_config, event.payload)]
+
+    async def process(self, event: Event) -> int:
+        """Run every matching rule for one event; returns how many matched."""
+        rules = await asyncio.to_thread(self._matching_rules, event)
+        for rule in rules:
+            await self.execute(rule, event)
+        self.stats["events_processed"] += 1
+        self.stats["rules_matched"] += len(rules)
+        return len(rules)
+
+    async def execute(self, rule: RuleSnapshot, event: Event):
+        """Run one rule's action and record the outcome."""
+        stats = self.action_stats[rule.action_type]
+        started = time.perf_counter()
+        try:
+            await self._actions[rule.action_type](rule, event)
+        except Exception as e:
+            stats["failed"] += 1
+            logger.warning("Automation rule %s (%s) failed: %s", rule.id, rule.action_type, e)
+            return
+        finally:
+            stats["seconds_total"] += time.perf_counter() - started
+        stats["succeeded"] += 1
+        await asyncio.to_thread(self._record_execution, rule.id)
+
+    def _record_execution(self, rule_id: int):
+        db = self.session_factory()
+        try:
+            db.query(models.AutomationRule).filter(models.AutomationRule.id == rule_id).update({
+                models.AutomationRule.execution_count: models.AutomationRule.execution_count + 1,
+                models.AutomationRule.last_executed: datetime.utcnow()
+            }, synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    async def _send_notification(self, rule: RuleSnapshot, event: Event):
+        config = rule.action_config
+        await self.notifier.send_notification(str(event.user_id), {
+            "title": render(config.get("title") or rule.name, event.payload),
+            "message": render(config.get("message", ""), event.payload),
+            "rule_id": rule.id,
+            "event": event.type,
+            "timestamp": event.occurred_at.isoformat()
+        })
+
+    async def _create_task(self, rule: RuleSnapshot, event: Event):
+        await asyncio.to_thread(self._insert_task, rule, event)
+
+    def _insert_task(self, rule: RuleSnapshot, event: Event):
+        config = rule.action_config
+        due_date = None
+        if config.get("due_in_days") is not None:
+            due_date = datetime.now() + timedelta(days=int(config["due_in_days"]))
+        db = self.session_factory()
+        try:
+            task = models.Task(
+                title=render(config["title"], event.payload),
+                description=render(config.get("description", ""), event.payload) or None,
+                priority=config.get("priority", "medium"),
+                project=config.get("project"),
+                tags=config.get("tags", []),
+                due_date=due_date,
+                owner_id=event.user_id
+            )
+            db.add(task)
+            db.flush()
+            record_change(db, event.user_id, versioning.TASKS, task.id)
+            db.commit()
+        finally:
+            db.close()
+
+    async def _webhook(self, rule: RuleSnapshot, event: Event):
+        if self._client is None:
+            # Checked again at send time: the host may resolve differently than when the rule was saved
+            self._client = httpx.AsyncClient(
+                transport=self.transport,
+                timeout=AUTOMATION_WEBHOOK_TIMEOUT,
+                event_hooks={"request": [public_url_guard(self.allowed_hosts)]}
+            )
+        response = await self._client.post(rule.action_config["url"], json={
+            "rule_id": rule.id,
+            "rule": rule.name,
+            "event": event.type,
+            "payload": event.payload,
+            "occurred_at": event.occurred_at.isoformat()
+        })
+        response.raise_for_status()
+
+    def get_stats(self) -> dict:
+        return {
+            **self.stats,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "workers": len(self._workers),
+            "indexed_users": len(self.index),
+            "index_hits": self.index.hits,
+            "index_loads": self.index.loads,
+            "actions": {name: dict(values) for name, values in self.action_stats.items()},
+        }
+
+    async def _worker(self):
+        while True:
+            event = await self._queue.get()
+            try:
+                await self.process(event)
+            except Exception:
+                logger.exception("Automation event %s failed", event.type)
+            finally:
+                self._queue.task_done()
+
+    def start(self):
+        if self._loop is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        for trigger_type in EVENT_TRIGGERS:
+            self.bus.subscribe(trigger_type, self.submit)
+
+    async def drain(self):
+        """Wait until every queued event has been processed."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def stop(self):
+        if self._loop is None:
+            return
+        for trigger_type in EVENT_TRIGGERS:
+            self.bus.unsubscribe(trigger_type, self.submit)
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self._loop = None
+
+
+automation_engine = AutomationEngine()
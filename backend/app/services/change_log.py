@@ -0,0 +1,125 @@
+# backend/app/services/change_log.py
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app import models
+from app.services import versioning
+
+# Model behind each synced resource
+RESOURCE_MODELS = {
+    versioning.TASKS: models.Task,
+    versioning.TIMER: models.TimerSession,
+    versioning.FEEDS: models.FeedItem,
+    versioning.SETTINGS: models.UserSettings,
+}
+
+
+def _lock_user_log(db: Session, user_id: int):
+    """
+    Serialize the user's logging transactions until this one ends. Sequence
+    numbers are handed out at insert but transactions commit in any order, so
+    without this a client could sync past a change that commits late and
+    never see it. SQLite already runs one writer at a time.
+    """
+    if db.get_bind().dialect.name != "sqlite":
+        db.query(models.User.id).filter(models.User.id == user_id).with_for_update().scalar()
+
+
+def record_change(db: Session, user_id: int, resource: str, entity_id: int, deleted: bool = False):
+    """Append a change (or tombstone) to the log and bump the resource version.
+
+    Call inside the mutation's transaction, after the entity has an id.
+    """
+    _lock_user_log(db, user_id)
+    db.add(models.ChangeLogEntry(
+        user_id=user_id,
+        resource=resource,
+        entity_id=entity_id,
+        is_deleted=deleted
+    ))
+    versioning.bump_version(db, user_id, resource)
+
+
+def record_changes(db: Session, user_id: int, resource: str, entity_ids: Iterable[int], deleted: bool = False):
+    """Bulk variant of record_change for batch inserts and deletes."""
+    rows = [
+        {"user_id": user_id, "resource": resource, "entity_id": entity_id, "is_deleted": deleted}
+        for entity_id in entity_ids
+    ]
+    if not rows:
+        return
+    _lock_user_log(db, user_id)
+    db.bulk_insert_mappings(models.ChangeLogEntry, rows)
+    versioning.bump_version(db, user_id, resource)
+
+
+def current_watermark(db: Session, user_id: int) -> int:
+    """Highest sequence number recorded for the user; every change up to it is visible."""
+    seq = db.query(func.max(models.ChangeLogEntry.seq)).filter(
+        models.ChangeLogEntry.user_id == user_id
+    ).scalar()
+    return seq or 0
+
+
+def latest_seq(db: Session, user_id: int, resource: str, entity_id: int) -> int:
+    """Sequence number of the last change to one entity (0 if never logged)."""
+    seq = db.query(func.max(models.ChangeLogEntry.seq)).filter(
+        models.ChangeLogEntry.user_id == user_id,
+        models.ChangeLogEntry.resource == resource,
+        models.ChangeLogEntry.entity_id == entity_id
+    ).scalar()
+    return seq or 0
+
+
+def changes_since(
+    db: Session,
+    user_id: int,
+    since: int,
+    limit: int = 1000
+) -> Tuple[Dict[str, List[int]], Dict[str, List[int]], int, bool]:
+    """
+    Collapse the log after ``since`` into the latest state per entity.
+
+    Returns (changed ids by resource, deleted ids by resource, new watermark,
+    has_more). At most ``limit`` log entries are read per call, so clients
+    page through a long backlog by calling again with the returned watermark.
+    """
+    entries = db.query(
+        models.ChangeLogEntry.seq,
+        models.ChangeLogEntry.resource,
+        models.ChangeLogEntry.entity_id,
+        models.ChangeLogEntry.is_deleted
+    ).filter(
+        models.ChangeLogEntry.user_id == user_id,
+        models.ChangeLogEntry.seq > since
+    ).order_by(models.ChangeLogEntry.seq.asc()).limit(limit + 1).all()
+
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    # Later entries win, so a create followed by a delete is just a tombstone
+    latest: Dict[Tuple[str, int], bool] = {}
+    for _, resource, entity_id, is_deleted in entries:
+        latest[(resource, entity_id)] = bool(is_deleted)
+
+    changed: Dict[str, List[int]] = {}
+    deleted: Dict[str, List[int]] = {}
+    for (resource, entity_id), is_deleted in latest.items():
+        (deleted if is_deleted else changed).setdefault(resource, []).append(entity_id)
+
+    watermark = entries[-1][0] if entries else since
+    return changed, deleted, watermark, has_more
+
+
+def load_entities(db: Session, user_id: int, resource: str, entity_ids: Optional[List[int]] = None) -> list:
+    """Fetch the user's current rows of a resource, optionally limited to ``entity_ids``."""
+    model = RESOURCE_MODELS[resource]
+    owner_column = model.owner_id if model is models.Task else model.user_id
+    query = db.query(model).filter(owner_column == user_id)
+    if entity_ids is not None:
+        if not entity_ids:
+            return []
+        query = query.filter(model.id.in_(entity_ids))
+    return query.all()
@@ -0,0 +1,56 @@
+# backend/app/services/event_bus.py
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Event types
+TASK_COMPLETED = "task_completed"
+TIMER_FINISHED = "timer_finished"
+# Fired by the job scheduler for one rule, never published on the bus
+TIME_BASED = "time_based"
+
+
+@dataclass
+class Event:
+    type: str
+    user_id: int
+    payload: Dict[str, Any] = field(default_factory=dict)
+    occurred_at: datetime = field(default_factory=datetime.utcnow)
+
+
+class EventBus:
+    """
+    In-process publish/subscribe. Publishers call publish() after their
+    transaction commits; handlers must only hand the event off (e.g. enqueue
+    it) since they run on the publisher's thread.
+    """
+
+    def __init__(self):
+        self._handlers: Dict[str, List[Callable[[Event], None]]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def subscribe(self, event_type: str, handler: Callable[[Event], None]):
+        with self._lock:
+            self._handlers[event_type].append(handler)
+
+    def unsubscribe(self, event_type: str, handler: Callable[[Event], None]):
+        with self._lock:
+            if handler in self._handlers[event_type]:
+                self._handlers[event_type].remove(handler)
+
+    def publish(self, event: Event):
+        with self._lock:
+            handlers = list(self._handlers.get(event.type, ()))
+        for handler in handlers:
+            try:
+                handler(event)
+            except Exception:
+                logger.exception("Event handler failed for %s", event.type)
+
+
+event_bus = EventBus()
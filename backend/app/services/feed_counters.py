@@ -0,0 +1,203 @@
+# backend/app/services/feed_counters.py
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+import argparse
+import json
+
+from sqlalchemy import case, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app import models
+
+# (total, unread, bookmarked)
+Counts = Tuple[int, int, int]
+
+
+def _category_key(category: Optional[str]) -> str:
+    return category or ""
+
+
+def _item_counts(is_read: bool, is_bookmarked: bool) -> Counts:
+    return (1, 0 if is_read else 1, 1 if is_bookmarked else 0)
+
+
+def adjust_counters(db: Session, user_id: int, category: Optional[str], total: int = 0, unread: int = 0, bookmarked: int = 0):
+    """Add deltas to a user's category counters. Call before the mutation's commit."""
+    if not (total or unread or bookmarked):
+        return
+    category = _category_key(category)
+    values = {
+        models.FeedCounter.total: models.FeedCounter.total + total,
+        models.FeedCounter.unread: models.FeedCounter.unread + unread,
+        models.FeedCounter.bookmarked: models.FeedCounter.bookmarked + bookmarked,
+    }
+    query = db.query(models.FeedCounter).filter(
+        models.FeedCounter.user_id == user_id,
+        models.FeedCounter.category == category
+    )
+    if query.update(values, synchronize_session=False):
+        return
+
+    # First item in this category: create the row, or fall back to the update
+    # if a concurrent writer just did.
+    try:
+        with db.begin_nested():
+            db.add(models.FeedCounter(
+                user_id=user_id, category=category, total=total, unread=unread, bookmarked=bookmarked
+            ))
+    except IntegrityError:
+        query.update(values, synchronize_session=False)
+
+
+def count_new_items(db: Session, user_id: int, category: Optional[str], count: int):
+    """Freshly ingested items start unread and unbookmarked."""
+    adjust_counters(db, user_id, category, total=count, unread=count)
+
+
+def count_removed_items(db: Session, items: Iterable[models.FeedItem]):
+    """Subtract feed items that are about to be deleted."""
+    deltas: Dict[Tuple[int, str], List[int]] = defaultdict(lambda: [0, 0, 0])
+    for item in items:
+        counts = _item_counts(item.is_read, item.is_bookmarked)
+        delta = deltas[(item.user_id, _category_key(item.category))]
+        for i, value in enumerate(counts):
+            delta[i] -= value
+    for (user_id, category), (total, unread, bookmarked) in deltas.items():
+        adjust_counters(db, user_id, category, total=total, unread=unread, bookmarked=bookmarked)
+
+
+def _flip_flag(db: Session, item: models.FeedItem, column, value: bool) -> bool:
+    """Set a counted flag with a conditional UPDATE; True if this call changed it."""
+    changed = db.query(models.FeedItem).filter(
+        models.FeedItem.id == item.id,
+        column.is_not(True) if value else column == True
+    ).update({column: value}, synchronize_session=False)
+    set_committed_value(item, column.key, value)
+    return changed == 1
+
+
+def apply_feed_item_update(db: Session, item: models.FeedItem, update_data: dict):
+    """
+    Apply a FeedItemUpdate to an item and move its counts accordingly. The
+    read and bookmark flags only move counts when this request's UPDATE
+    flipped them, so concurrent updates of one item can't count twice.
+    """
+    unread = bookmarked = 0
+    for field, value in update_data.items():
+        if field == "is_read" and value is not None:
+            if _flip_flag(db, item, models.FeedItem.is_read, value):
+                unread = -1 if value else 1
+        elif field == "is_bookmarked" and value is not None:
+            if _flip_flag(db, item, models.FeedItem.is_bookmarked, value):
+                bookmarked = 1 if value else -1
+        else:
+            setattr(item, field, value)
+    adjust_counters(db, item.user_id, item.category, unread=unread, bookmarked=bookmarked)
+
+
+def get_counters(db: Session, user_id: int) -> List[models.FeedCounter]:
+    return db.query(models.FeedCounter).filter(
+        models.FeedCounter.user_id == user_id,
+        models.FeedCounter.total > 0
+    ).order_by(models.FeedCounter.category).all()
+
+
+def compute_counters(db: Session, user_id: Optional[int] = None) -> Dict[Tuple[int, str], Counts]:
+    """Recount from feed_items with one grouped aggregate."""
+    query = db.query(
+        models.FeedItem.user_id,
+        func.coalesce(models.FeedItem.category, ""),
+        func.count(models.FeedItem.id),
+        func.sum(case((models.FeedItem.is_read == False, 1), else_=0)),
+        func.sum(case((models.FeedItem.is_bookmarked == True, 1), else_=0))
+    ).group_by(models.FeedItem.user_id, func.coalesce(models.FeedItem.category, ""))
+    if user_id is not None:
+        query = query.filter(models.FeedItem.user_id == user_id)
+    return {
+        (row_user_id, category): (total, unread or 0, bookmarked or 0)
+        for row_user_id, category, total, unread, bookmarked in query
+    }
+
+
+def _stored_counters(db: Session, user_id: Optional[int] = None) -> Dict[Tuple[int, str], Counts]:
+    query = db.query(models.FeedCounter)
+    if user_id is not None:
+        query = query.filter(models.FeedCounter.user_id == user_id)
+    return {
+        (c.user_id, c.category): (c.total, c.unread, c.bookmarked)
+        for c in query
+        if c.total or c.unread or c.bookmarked
+    }
+
+
+def check_counters(db: Session, user_id: Optional[int] = None) -> List[dict]:
+    """Compare stored counters with a fresh recount; returns the mismatches."""
+    expected = compute_counters(db, user_id)
+    stored = _stored_counters(db, user_id)
+    mismatches = []
+    for key in sorted(set(expected) | set(stored)):
+        if expected.get(key, (0, 0, 0)) != stored.get(key, (0, 0, 0)):
+            mismatches.append({
+                "user_id": key[0],
+                "category": key[1],
+                "expected": dict(zip(("total", "unread", "bookmarked"), expected.get(key, (0, 0, 0)))),
+                "stored": dict(zip(("total", "unread", "bookmarked"), stored.get(key, (0, 0, 0)))),
+            })
+    return mismatches
+
+
+def rebuild_counters(db: Session, user_id: Optional[int] = None) -> int:
+    """Replace stored counters with a recount. Commits; returns rows written."""
+    expected = compute_counters(db, user_id)
+    query = db.query(models.FeedCounter)
+    if user_id is not None:
+        query = query.filter(models.FeedCounter.user_id == user_id)
+    query.delete(synchronize_session=False)
+    db.add_all([
+        models.FeedCounter(user_id=key[0], category=key[1], total=total, unread=unread, bookmarked=bookmarked)
+        for key, (total, unread, bookmarked) in expected.items()
+    ])
+    db.commit()
+    return len(expected)
+
+
+if __name__ == "__main__":
+    # python -m app.services.feed_counters check|rebuild [--user-id N] [--shard main|N]
+    import os
+
+    from app.sharding import SHARD_COUNT, SHARDING_ENABLED, shard_path, shard_session, user_shards
+
+    parser = argparse.ArgumentParser(description="Check or rebuild per-category feed counters")
+    parser.add_argument("command", choices=["check", "rebuild"])
+    parser.add_argument("--user-id", type=int, default=None)
+    parser.add_argument(
+        "--shard", default=None,
+        help="'main' or a shard number (default: the user's database, or main and every shard)"
+    )
+    args = parser.parse_args()
+
+    if args.shard is not None:
+        shards = [None if args.shard == "main" else int(args.shard)]
+    elif args.user_id is not None:
+        shards = [user_shards([args.user_id]).get(args.user_id)]
+    else:
+        shards = [None] + [
+            shard for shard in range(SHARD_COUNT if SHARDING_ENABLED else 0) if os.path.exists(shard_path(shard))
+        ]
+
+    results = {}
+    for shard in shards:
+        db = shard_session(shard)
+        try:
+            name = "main" if shard is None else f"shard {shard}"
+            if args.command == "check":
+                results[name] = {"mismatches": check_counters(db, args.user_id)}
+            else:
+                results[name] = {"rebuilt": rebuild_counters(db, args.user_id)}
+        finally:
+            db.close()
+    print(json.dumps(results, indent=2))
+    if args.command == "check" and any(result["mismatches"] for result in results.values()):
+        raise SystemExit(1)
@@ -0,0 +1,395 @@
+# backend/app/services/feed_ingestion.py
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Collection, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+import asyncio
+import hashlib
+import logging
+import os
+import xml.etree.ElementTree as ET
+
+import httpx
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal, insert_ignoring_duplicates
+from app import models
+from app.services import versioning
+from app.services.change_log import record_changes
+from app.services.feed_counters import count_new_items
+from app.services.leases import WORKER_ID, acquire_lease
+from app.services.url_safety import OUTBOUND_ALLOWED_HOSTS, UnsafeURL, public_url_guard
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+FEED_INGESTION_ENABLED = os.getenv("FEED_INGESTION_ENABLED", "false").lower() == "true"
+FEED_FETCH_INTERVAL = int(os.getenv("FEED_FETCH_INTERVAL", "900"))  # seconds between cycles
+FEED_MAX_CONNECTIONS = int(os.getenv("FEED_MAX_CONNECTIONS", "20"))
+FEED_PER_HOST_LIMIT = int(os.getenv("FEED_PER_HOST_LIMIT", "2"))
+FEED_FETCH_TIMEOUT = float(os.getenv("FEED_FETCH_TIMEOUT", "15"))
+FEED_MAX_ITEMS = int(os.getenv("FEED_MAX_ITEMS", "100"))  # per source per fetch
+INSERT_CHUNK_SIZE = 200
+USER_AGENT = "EunoiaFlow/1.0 (+feed-ingestion)"
+FEED_INGESTION_LEASE = "feed_ingestion"
+
+
+@dataclass
+class ParsedEntry:
+    title: str
+    url: Optional[str] = None
+    content: Optional[str] = None
+    published_at: Optional[datetime] = None
+
+    @property
+    def content_hash(self) -> str:
+        """Dedup key: the URL when there is one, otherwise title + content."""
+        key = self.url.strip() if self.url else f"{self.title}\n{self.content or ''}"
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class FetchResult:
+    source_id: int
+    status: Optional[int] = None
+    entries: List[ParsedEntry] = field(default_factory=list)
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    error: Optional[str] = None
+
+
+def _chunks(items: list, size: int = INSERT_CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _child_text(element: ET.Element, *names: str) -> Optional[str]:
+    for child in element:
+        if _local_name(child.tag) in names and child.text and child.text.strip():
+            return child.text.strip()
+    return None
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)  # RSS: RFC 822
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))  # Atom: RFC 3339
+        except ValueError:
+            return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _entry_from_element(element: ET.Element) -> Optional[ParsedEntry]:
+    """Build an entry from an RSS <item> or Atom <entry> element."""
+    title = _child_text(element, "title")
+    url = None
+    for child in element:
+        if _local_name(child.tag) != "link":
+            continue
+        href = child.get("href")
+        if href and child.get("rel", "alternate") == "alternate":  # Atom
+            url = href
+            break
+        if child.text and child.text.strip():  # RSS
+            url = child.text.strip()
+            break
+    if url is None:
+        guid = _child_text(element, "guid", "id")
+        if guid and guid.startswith(("http://", "https://")):
+            url = guid
+    content = _child_text(element, "encoded", "content", "description", "summary")
+    if not title and not url:
+        return None
+    return ParsedEntry(
+        title=(title or url)[:500],
+        url=url,
+        content=content,
+        published_at=_parse_date(_child_text(element, "pubDate", "published", "updated", "date"))
+    )
+
+
+class IncrementalFeedParser:
+    """
+    Streaming RSS/Atom parser. Chunks are fed as they arrive from the network,
+    finished items are emitted and then cleared, so memory stays flat no
+    matter how large the document is.
+    """
+
+    def __init__(self, max_items: int = FEED_MAX_ITEMS):
+        self.max_items = max_items
+        self.entries: List[ParsedEntry] = []
+        self._parser = ET.XMLPullParser(events=("end",))
+
+    @property
+    def done(self) -> bool:
+        return len(self.entries) >= self.max_items
+
+    def feed(self, chunk: bytes):
+        self._parser.feed(chunk)
+        for _, element in self._parser.read_events():
+            if _local_name(element.tag) in ("item", "entry"):
+                entry = _entry_from_element(element)
+                if entry is not None and not self.done:
+                    self.entries.append(entry)
+                element.clear()
+
+    def close(self) -> List[ParsedEntry]:
+        try:
+            self._parser.close()
+        except ET.ParseError:
+            # Truncated on purpose once max_items was reached
+            if not self.done:
+                raise
+        return self.entries
+
+
+class FeedIngestionService:
+    """
+    Fetches subscribed feeds and fans new entries out to subscribers. Every
+    worker runs the loop, but a cycle only runs in the worker holding the
+    database's ingestion lease, so each source is fetched once per interval.
+    """
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        max_connections: int = FEED_MAX_CONNECTIONS,
+        per_host_limit: int = FEED_PER_HOST_LIMIT,
+        timeout: float = FEED_FETCH_TIMEOUT,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        allowed_hosts: Collection[str] = OUTBOUND_ALLOWED_HOSTS,
+        worker_id: str = WORKER_ID
+    ):
+        self.session_factory = session_factory
+        self.max_connections = max_connections
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.transport = transport  # injectable for local stand-in servers
+        self.allowed_hosts = allowed_hosts
+        self.worker_id = worker_id
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_limits[host]
+
+    def _client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=self.max_connections,
+                                max_keepalive_connections=self.max_connections),
+            timeout=self.timeout,
+            follow_redirects=True,
+            headers={"User-Agent": USER_AGENT},
+            # Feed URLs come from users: no requests to private addresses, redirects included
+            event_hooks={"request": [public_url_guard(self.allowed_hosts)]},
+            transport=self.transport
+        )
+
+    async def fetch_source(self, client: httpx.AsyncClient, source: dict) -> FetchResult:
+        """Fetch one source with a conditional request and parse it while streaming."""
+        result = FetchResult(source_id=source["id"])
+        headers = {}
+        if source.get("etag"):
+            headers["If-None-Match"] = source["etag"]
+        if source.get("last_modified"):
+            headers["If-Modified-Since"] = source["last_modified"]
+
+        try:
+            async with self._host_semaphore(source["url"]):
+                async with client.stream("GET", source["url"], headers=headers) as response:
+                    result.status = response.status_code
+                    if response.status_code == 304:
+                        return result
+                    response.raise_for_status()
+                    parser = IncrementalFeedParser()
+                    async for chunk in response.aiter_bytes():
+                        parser.feed(chunk)
+                        if parser.done:
+                            break
+                    result.entries = parser.close()
+                    result.etag = response.headers.get("etag")
+                    result.last_modified = response.headers.get("last-modified")
+        except (httpx.HTTPError, ET.ParseError, UnsafeURL) as e:
+            result.error = str(e)
+            logger.warning("Feed fetch failed for %s: %s", source["url"], e)
+        return result
+
+    def _load_sources(self, source_ids: Optional[Iterable[int]] = None) -> List[dict]:
+        """Sources with at least one subscriber, each listed once."""
+        db = self.session_factory()
+        try:
+            query = db.query(models.FeedSource).join(models.FeedSubscription).distinct()
+            if source_ids is not None:
+                query = query.filter(models.FeedSource.id.in_(list(source_ids)))
+            return [
+                {"id": s.id, "url": s.url, "etag": s.etag, "last_modified": s.last_modified}
+                for s in query.all()
+            ]
+        finally:
+            db.close()
+
+    def store_result(self, db: Session, result: FetchResult) -> int:
+        """Store new entries once and fan them out to every subscriber. Returns per-user rows inserted."""
+        source = db.query(models.FeedSource).filter(models.FeedSource.id == result.source_id).first()
+        if source is None:
+            return 0
+        source.last_fetched_at = datetime.now(timezone.utc)
+        source.last_status = result.status
+        if result.error or result.status == 304:
+            db.commit()
+            return 0
+        source.etag = result.etag
+        source.last_modified = result.last_modified
+
+        # Dedup within the document itself first
+        entries = {entry.content_hash: entry for entry in result.entries}
+        article_ids = self._upsert_articles(db, source, entries)
+        inserted = 0
+        subscriptions = db.query(models.FeedSubscription).filter(
+            models.FeedSubscription.source_id == source.id
+        ).all()
+        for subscription in subscriptions:
+            inserted += self._insert_for_user(db, source, subscription, article_ids)
+        db.commit()
+        return inserted
+
+    def _upsert_articles(self, db: Session, source, entries: Dict[str, ParsedEntry]) -> Dict[str, int]:
+        """Store each entry's content once, shared by all subscribers. Returns hash -> article id."""
+        hashes = list(entries.keys())
+        article_ids: Dict[str, int] = {}
+        for chunk in _chunks(hashes):
+            article_ids.update(db.query(models.Article.content_hash, models.Article.id).filter(
+                models.Article.content_hash.in_(chunk)
+            ))
+
+        rows = [
+            {
+                "content_hash": content_hash,
+                "source_id": source.id,
+                "title": entry.title,
+                "content": entry.content,
+                "url": entry.url,
+                "source": source.title or urlsplit(source.url).netloc,
+                "feed_type": source.feed_type or "article",
+                "published_at": entry.published_at,
+            }
+            for content_hash, entry in entries.items()
+            if content_hash not in article_ids
+        ]
+        if rows:
+            # Another source or cycle may store the same article concurrently
+            statement = insert_ignoring_duplicates(db, models.Article)
+            for chunk in _chunks(rows):
+                db.execute(statement, chunk)
+            for chunk in _chunks([row["content_hash"] for row in rows]):
+                article_ids.update(db.query(models.Article.content_hash, models.Article.id).filter(
+                    models.Article.content_hash.in_(chunk)
+                ))
+        return article_ids
+
+    def _insert_for_user(self, db: Session, source, subscription, article_ids: Dict[str, int]) -> int:
+        """Add per-user state rows for articles (hash -> id) the user doesn't have and hasn't had expire."""
+        existing = set()
+        for chunk in _chunks(list(article_ids.values())):
+            existing.update(article_id for (article_id,) in db.query(models.FeedItem.article_id).filter(
+                models.FeedItem.user_id == subscription.user_id,
+                models.FeedItem.article_id.in_(chunk)
+            ))
+        expired = set()
+        for chunk in _chunks(list(article_ids.keys())):
+            expired.update(content_hash for (content_hash,) in db.query(models.ExpiredFeedItem.content_hash).filter(
+                models.ExpiredFeedItem.user_id == subscription.user_id,
+                models.ExpiredFeedItem.content_hash.in_(chunk)
+            ))
+
+        category = subscription.category or source.category
+        rows = [
+            {"user_id": subscription.user_id, "article_id": article_id, "category": category}
+            for content_hash, article_id in article_ids.items()
+            if article_id not in existing and content_hash not in expired
+        ]
+        if not rows:
+            return 0
+
+        statement = insert_ignoring_duplicates(db, models.FeedItem).returning(models.FeedItem.id)
+        new_ids = []
+        for chunk in _chunks(rows):
+            new_ids.extend(db.execute(statement, chunk).scalars().all())
+        record_changes(db, subscription.user_id, versioning.FEEDS, new_ids)
+        count_new_items(db, subscription.user_id, category, len(new_ids))
+        return len(new_ids)
+
+    def _store_results(self, results: List[FetchResult]) -> int:
+        db = self.session_factory()
+        try:
+            inserted = 0
+            for result in results:
+                inserted += self.store_result(db, result)
+            return inserted
+        finally:
+            db.close()
+
+    async def run_cycle(self, source_ids: Optional[Iterable[int]] = None) -> dict:
+        """Fetch every subscribed source once, concurrently, and store new items."""
+        sources = await asyncio.to_thread(self._load_sources, source_ids)
+        if not sources:
+            return {"sources": 0, "not_modified": 0, "failed": 0, "inserted": 0}
+
+        async with self._client() as client:
+            results = await asyncio.gather(*(self.fetch_source(client, s) for s in sources))
+        inserted = await asyncio.to_thread(self._store_results, results)
+
+        stats = {
+            "sources": len(sources),
+            "not_modified": sum(1 for r in results if r.status == 304),
+            "failed": sum(1 for r in results if r.error),
+            "inserted": inserted,
+        }
+        logger.info("Feed ingestion cycle: %s", stats)
+        return stats
+
+    def _hold_lease(self, seconds: int) -> bool:
+        db = self.session_factory()
+        try:
+            return acquire_lease(db, FEED_INGESTION_LEASE, seconds, self.worker_id)
+        finally:
+            db.close()
+
+    async def _run_forever(self, interval: int):
+        while True:
+            try:
+                if await asyncio.to_thread(self._hold_lease, interval):
+                    await self.run_cycle()
+                    # Held until this worker's next cycle is due
+                    await asyncio.to_thread(self._hold_lease, interval)
+            except Exception:
+                logger.exception("Feed ingestion cycle failed")
+            await asyncio.sleep(interval)
+
+    def start(self, interval: int = FEED_FETCH_INTERVAL):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_forever(interval))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+feed_ingestion = FeedIngestionService()
@@ -0,0 +1,406 @@
+# backend/app/services/job_scheduler.py
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import heapq
+import logging
+import os
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal, insert_ignoring_duplicates
+from app import models
+from app.services.automation import automation_engine, next_time_based_fire, snapshot_rule
+from app.services.event_bus import TIME_BASED, Event
+from app.services.leases import WORKER_ID
+from app.sharding import SHARDING_ENABLED
+from app.services.websocket_manager import manager
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "true").lower() == "true"
+# Pending jobs due within this many seconds are kept in the in-memory heap
+SCHEDULER_LOOKAHEAD = int(os.getenv("SCHEDULER_LOOKAHEAD", "3600"))
+# How often the heap is rebuilt from the table and task deadlines are swept
+SCHEDULER_REFILL_INTERVAL = int(os.getenv("SCHEDULER_REFILL_INTERVAL", "300"))
+# Claimed jobs not finished within this many seconds are handed out again
+SCHEDULER_CLAIM_TIMEOUT = int(os.getenv("SCHEDULER_CLAIM_TIMEOUT", "300"))
+SCHEDULER_MAX_ATTEMPTS = int(os.getenv("SCHEDULER_MAX_ATTEMPTS", "3"))
+TASK_REMINDER_LEAD_MINUTES = int(os.getenv("TASK_REMINDER_LEAD_MINUTES", "15"))
+
+# Job kinds
+TASK_REMINDER = "task_reminder"
+AUTOMATION_RULE = "automation_rule"
+TIMER_END = "timer_end"
+
+
+def reminder_time(due_date: datetime) -> datetime:
+    # Jobs fire on naive UTC, like the due dates SQLite hands back
+    if due_date.tzinfo is not None:
+        due_date = due_date.astimezone(timezone.utc).replace(tzinfo=None)
+    return due_date - timedelta(minutes=TASK_REMINDER_LEAD_MINUTES)
+
+
+def schedule_job(db: Session, user_id: int, kind: str, ref_id: int, fire_at: datetime, payload: Optional[dict] = None):
+    """Add a pending job (no-op if the same one exists). Part of the caller's transaction."""
+    if SHARDING_ENABLED:
+        # No scheduler runs in sharded mode (see main.lifespan): the job would never fire
+        return
+    db.execute(insert_ignoring_duplicates(db, models.ScheduledJob).values(
+        user_id=user_id,
+        kind=kind,
+        ref_id=ref_id,
+        fire_at=fire_at,
+        payload=payload,
+        status="pending",
+        attempts=0
+    ))
+    job_scheduler.notify_after_commit(db, fire_at)
+
+
+def cancel_jobs(db: Session, kind: str, ref_id: int):
+    db.query(models.ScheduledJob).filter(
+        models.ScheduledJob.kind == kind,
+        models.ScheduledJob.ref_id == ref_id,
+        models.ScheduledJob.status == "pending"
+    ).update({models.ScheduledJob.status: "cancelled"}, synchronize_session=False)
+
+
+def schedule_task_reminder(db: Session, task: models.Task):
+    """Remind the owner shortly before the task is due. Stale reminders are dropped when they fire."""
+    if task.due_date is None or task.is_completed:
+        return
+    fire_at = reminder_time(task.due_date)
+    if fire_at > datetime.utcnow():
+        schedule_job(db, task.owner_id, TASK_REMINDER, task.id, fire_at)
+
+
+def schedule_rule(db: Session, rule: models.AutomationRule):
+    """(Re)plan a time_based rule's next run after it was created or changed."""
+    cancel_jobs(db, AUTOMATION_RULE, rule.id)
+    if not rule.is_active or rule.trigger_type != TIME_BASED:
+        return
+    fire_at = next_time_based_fire(rule.trigger_config or {}, datetime.utcnow())
+    if fire_at is not None:
+        schedule_job(db, rule.user_id, AUTOMATION_RULE, rule.id, fire_at)
+
+
+def schedule_timer_end(db: Session, session: models.TimerSession):
+    """Notify when a started timer's planned duration runs out."""
+    if session.duration_planned:
+        fire_at = datetime.utcnow() + timedelta(seconds=session.duration_planned)
+        schedule_job(db, session.user_id, TIMER_END, session.id, fire_at.replace(microsecond=0))
+
+
+def _notifications_enabled(db: Session, user_id: int) -> bool:
+    enabled = db.query(models.UserSettings.enable_notifications).filter(
+        models.UserSettings.user_id == user_id
+    ).scalar()
+    return enabled is not False
+
+
+class JobScheduler:
+    """
+    Fires scheduled jobs at their time. Each worker keeps the jobs due within
+    the lookahead in a min-heap and sleeps until the earliest one (or the next
+    refill), so idle cost is one indexed query per refill interval. Any number
+    of workers can run this: a job fires only in the worker whose conditional
+    pending -> claimed UPDATE succeeds.
+    """
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        notifier=manager,
+        engine=automation_engine,
+        lookahead: int = SCHEDULER_LOOKAHEAD,
+        refill_interval: int = SCHEDULER_REFILL_INTERVAL,
+        claim_timeout: int = SCHEDULER_CLAIM_TIMEOUT,
+        worker_id: str = WORKER_ID
+    ):
+        self.session_factory = session_factory
+        self.notifier = notifier
+        self.engine = engine
+        self.lookahead = lookahead
+        self.refill_interval = refill_interval
+        self.claim_timeout = claim_timeout
+        self.worker_id = worker_id
+        self.stats = {"fired": 0, "skipped": 0, "failed": 0, "claimed_elsewhere": 0, "refills": 0}
+        # (fire_at, job_id); job_id 0 means "look up whatever is due then"
+        self._heap: List[Tuple[datetime, int]] = []
+        self._next_refill = datetime.min
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    # Scheduling from request threads
+
+    def notify_after_commit(self, db: Session, fire_at: datetime):
+        """Wake this worker for a job due before its next refill, once the job is committed."""
+        if self._loop is None or fire_at > datetime.utcnow() + timedelta(seconds=self.lookahead):
+            return
+        loop = self._loop
+        event.listen(db, "after_commit", lambda session: loop.call_soon_threadsafe(self._push, fire_at), once=True)
+
+    def _push(self, fire_at: datetime):
+        heapq.heappush(self._heap, (fire_at, 0))
+        self._wakeup.set()
+
+    # Database work (runs in threads)
+
+    def _refill(self) -> List[Tuple[datetime, int]]:
+        now = datetime.utcnow()
+        horizon = now + timedelta(seconds=self.lookahead)
+        db = self.session_factory()
+        try:
+            # Jobs claimed by a worker that died are handed out again
+            db.query(models.ScheduledJob).filter(
+                models.ScheduledJob.status == "claimed",
+                models.ScheduledJob.claimed_at < now - timedelta(seconds=self.claim_timeout)
+            ).update({models.ScheduledJob.status: "pending", models.ScheduledJob.claimed_by: None},
+                     synchronize_session=False)
+            self._sweep_task_deadlines(db, now, horizon + timedelta(seconds=self.refill_interval))
+            db.commit()
+            return [
+                (fire_at, job_id) for fire_at, job_id in db.query(
+                    models.ScheduledJob.fire_at, models.ScheduledJob.id
+                ).filter(
+                    models.ScheduledJob.status == "pending",
+                    models.ScheduledJob.fire_at <= horizon
+                ).order_by(models.ScheduledJob.fire_at)
+            ]
+        finally:
+            db.close()
+
+    def _sweep_task_deadlines(self, db: Session, start: datetime, end: datetime):
+        """Reminders for tasks written by paths that don't schedule one (recurrence, sync, automation)."""
+        lead = timedelta(minutes=TASK_REMINDER_LEAD_MINUTES)
+        rows = [
+            {
+                "user_id": owner_id,
+                "kind": TASK_REMINDER,
+                "ref_id": task_id,
+                "fire_at": reminder_time(due_date),
+                "status": "pending",
+                "attempts": 0
+            }
+            for task_id, owner_id, due_date in db.query(
+                models.Task.id, models.Task.owner_id, models.Task.due_date
+            ).filter(
+                models.Task.due_date > start + lead,
+                models.Task.due_date <= end + lead,
+                models.Task.is_completed == False
+            )
+        ]
+        if rows:
+            db.execute(insert_ignoring_duplicates(db, models.ScheduledJob), rows)
+
+    def _due_job_ids(self, now: datetime) -> List[int]:
+        db = self.session_factory()
+        try:
+            return [job_id for (job_id,) in db.query(models.ScheduledJob.id).filter(
+                models.ScheduledJob.status == "pending",
+                models.ScheduledJob.fire_at <= now
+            ).order_by(models.ScheduledJob.fire_at)]
+        finally:
+            db.close()
+
+    def _claim(self, job_id: int) -> Optional[Dict]:
+        db = self.session_factory()
+        try:
+            claimed = db.query(models.ScheduledJob).filter(
+                models.ScheduledJob.id == job_id,
+                models.ScheduledJob.status == "pending"
+            ).update({
+                models.ScheduledJob.status: "claimed",
+                models.ScheduledJob.claimed_by: self.worker_id,
+                models.ScheduledJob.claimed_at: datetime.utcnow()
+            }, synchronize_session=False)
+            db.commit()
+            if not claimed:
+                return None
+            job = db.get(models.ScheduledJob, job_id)
+            return {
+                "id": job.id,
+                "user_id": job.user_id,
+                "kind": job.kind,
+                "ref_id": job.ref_id,
+                "fire_at": job.fire_at,
+                "payload": job.payload or {},
+                "attempts": job.attempts
+            }
+        finally:
+            db.close()
+
+    def _finish(self, job: Dict, status: str):
+        db = self.session_factory()
+        try:
+            values = {models.ScheduledJob.status: status, models.ScheduledJob.fired_at: datetime.utcnow()}
+            if status == "failed" and job["attempts"] + 1 < SCHEDULER_MAX_ATTEMPTS:
+                # Retry later with a growing delay
+                values = {
+                    models.ScheduledJob.status: "pending",
+                    models.ScheduledJob.claimed_by: None,
+                    models.ScheduledJob.fire_at: datetime.utcnow() + timedelta(minutes=job["attempts"] + 1),
+                }
+            values[models.ScheduledJob.attempts] = models.ScheduledJob.attempts + 1
+            db.query(models.ScheduledJob).filter(models.ScheduledJob.id == job["id"]).update(
+                values, synchronize_session=False
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def _prepare_reminder(self, job: Dict) -> Optional[dict]:
+        db = self.session_factory()
+        try:
+            task = db.get(models.Task, job["ref_id"])
+            # The task may have been completed, deleted or rescheduled since
+            if task is None or task.is_completed or task.due_date is None:
+                return None
+            if reminder_time(task.due_date) != job["fire_at"] or not _notifications_enabled(db, job["user_id"]):
+                return None
+            return {
+                "type": TASK_REMINDER,
+                "title": f"Due soon: {task.title}",
+                "message": f"Due at {task.due_date.strftime('%H:%M')}",
+                "task_id": task.id,
+                "due_date": task.due_date.isoformat(),
+                "timestamp": datetime.utcnow().isoformat()
+            }
+        finally:
+            db.close()
+
+    def _prepare_timer_end(self, job: Dict) -> Optional[dict]:
+        db = self.session_factory()
+        try:
+            session = db.get(models.TimerSession, job["ref_id"])
+            if session is None or session.ended_at is not None:
+                return None
+            if not _notifications_enabled(db, job["user_id"]):
+                return None
+            finished = "Pomodoro complete" if session.session_type == "pomodoro" else "Timer finished"
+            return {
+                "type": TIMER_END,
+                "title": finished,
+                "message": session.task_title or "",
+                "session_id": session.id,
+                "session_type": session.session_type,
+                "timestamp": datetime.utcnow().isoformat()
+            }
+        finally:
+            db.close()
+
+    def _prepare_rule(self, job: Dict):
+        """Load a time_based rule and queue its following run."""
+        db = self.session_factory()
+        try:
+            rule = db.get(models.AutomationRule, job["ref_id"])
+            if rule is None or not rule.is_active or rule.trigger_type != TIME_BASED:
+                return None
+            fire_at = next_time_based_fire(rule.trigger_config or {}, job["fire_at"])
+            if fire_at is not None:
+                schedule_job(db, rule.user_id, AUTOMATION_RULE, rule.id, fire_at)
+            snapshot = snapshot_rule(rule)
+            db.commit()
+            return snapshot
+        finally:
+            db.close()
+
+    # Firing (runs on the event loop)
+
+    async def _deliver(self, job: Dict) -> bool:
+        """Carry out a claimed job; False means it no longer applies."""
+        if job["kind"] == AUTOMATION_RULE:
+            rule = await asyncio.to_thread(self._prepare_rule, job)
+            if rule is None:
+                return False
+            await self.engine.execute(rule, Event(TIME_BASED, job["user_id"], {
+                "rule_id": rule.id,
+                "scheduled_for": job["fire_at"].isoformat()
+            }))
+            return True
+
+        prepare = self._prepare_reminder if job["kind"] == TASK_REMINDER else self._prepare_timer_end
+        notification = await asyncio.to_thread(prepare, job)
+        if notification is None:
+            return False
+        await self.notifier.send_notification(str(job["user_id"]), notification)
+        return True
+
+    async def _fire(self, job_id: int):
+        job = await asyncio.to_thread(self._claim, job_id)
+        if job is None:
+            self.stats["claimed_elsewhere"] += 1
+            return
+        try:
+            delivered = await self._deliver(job)
+        except Exception as e:
+            logger.warning("Scheduled job %s (%s) failed: %s", job["id"], job["kind"], e)
+            self.stats["failed"] += 1
+            await asyncio.to_thread(self._finish, job, "failed")
+            return
+        self.stats["fired" if delivered else "skipped"] += 1
+        await asyncio.to_thread(self._finish, job, "done" if delivered else "cancelled")
+
+    async def _run_forever(self):
+        while True:
+            now = datetime.utcnow()
+            if now >= self._next_refill:
+                self._next_refill = now + timedelta(seconds=self.refill_interval)
+                # Jobs committed during the refill are pushed onto the emptied
+                # heap and kept alongside the refilled ones
+                previous, self._heap = self._heap, []
+                try:
+                    self._heap += await asyncio.to_thread(self._refill)
+                    self.stats["refills"] += 1
+                except Exception:
+                    logger.exception("Scheduler refill failed")
+                    self._heap += previous
+                heapq.heapify(self._heap)
+
+            while self._heap and self._heap[0][0] <= datetime.utcnow():
+                _, job_id = heapq.heappop(self._heap)
+                job_ids = [job_id] if job_id else await asyncio.to_thread(self._due_job_ids, datetime.utcnow())
+                for due_id in job_ids:
+                    try:
+                        await self._fire(due_id)
+                    except Exception:
+                        logger.exception("Scheduled job %s could not be fired", due_id)
+
+            wake_at = min(self._heap[0][0], self._next_refill) if self._heap else self._next_refill
+            timeout = max(0.0, (wake_at - datetime.utcnow()).total_seconds())
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def get_stats(self) -> dict:
+        return {
+            **self.stats,
+            "heap_size": len(self._heap),
+            "next_fire_at": self._heap[0][0].isoformat() if self._heap else None,
+            "worker_id": self.worker_id,
+        }
+
+    def start(self):
+        if self._task is None:
+            self._loop = asyncio.get_running_loop()
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run_forever())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._loop = None
+
+
+job_scheduler = JobScheduler()
@@ -0,0 +1,41 @@
+# backend/app/services/leases.py
+from datetime import datetime, timedelta
+import os
+import socket
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.db import insert_ignoring_duplicates
+from app import models
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+def acquire_lease(db: Session, name: str, seconds: int, holder: str = WORKER_ID) -> bool:
+    """
+    Take the named lease, or extend it if ``holder`` already has it. False while
+    another worker holds an unexpired one. Commits.
+    """
+    now = datetime.utcnow()
+    # Created expired, so the UPDATE below decides who gets it
+    db.execute(insert_ignoring_duplicates(db, models.ServiceLease).values(name=name, holder=None, expires_at=now))
+    claimed = db.query(models.ServiceLease).filter(
+        models.ServiceLease.name == name,
+        or_(models.ServiceLease.expires_at <= now, models.ServiceLease.holder == holder)
+    ).update({
+        models.ServiceLease.holder: holder,
+        models.ServiceLease.expires_at: now + timedelta(seconds=seconds)
+    }, synchronize_session=False)
+    db.commit()
+    return claimed == 1
+
+
+def release_lease(db: Session, name: str, holder: str = WORKER_ID):
+    """Let the next worker take the lease right away instead of waiting for it to expire. Commits."""
+    db.query(models.ServiceLease).filter(
+        models.ServiceLease.name == name,
+        models.ServiceLease.holder == holder
+    ).update({models.ServiceLease.holder: None, models.ServiceLease.expires_at: datetime.utcnow()},
+             synchronize_session=False)
+    db.commit()
@@ -0,0 +1,357 @@
+# backend/app/services/maintenance.py
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+import asyncio
+import gzip
+import json
+import logging
+import os
+import time
+
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal, insert_ignoring_duplicates
+from app import models
+from app.services import versioning
+from app.services.change_log import record_changes
+from app.services.feed_counters import count_removed_items
+from app.services.leases import WORKER_ID, acquire_lease, release_lease
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+MAINTENANCE_ENABLED = os.getenv("MAINTENANCE_ENABLED", "false").lower() == "true"
+MAINTENANCE_INTERVAL = int(os.getenv("MAINTENANCE_INTERVAL", "3600"))  # seconds between runs
+MAINTENANCE_BATCH_SIZE = int(os.getenv("MAINTENANCE_BATCH_SIZE", "500"))
+# Pause between batches so request writes get the database in between
+MAINTENANCE_BATCH_PAUSE = float(os.getenv("MAINTENANCE_BATCH_PAUSE", "0.05"))
+# Read, unbookmarked feed items older than this are deleted (0 disables)
+FEED_RETENTION_DAYS = int(os.getenv("FEED_RETENTION_DAYS", "30"))
+# Expired feed items are remembered this long so ingestion doesn't bring them back
+FEED_TOMBSTONE_DAYS = int(os.getenv("FEED_TOMBSTONE_DAYS", "365"))
+# Timer sessions older than this are compacted into daily rollups (0 disables)
+TIMER_COMPACTION_MONTHS = int(os.getenv("TIMER_COMPACTION_MONTHS", "6"))
+# Directory for gzip NDJSON archives of removed rows (empty disables archival)
+MAINTENANCE_ARCHIVE_DIR = os.getenv("MAINTENANCE_ARCHIVE_DIR", "")
+# Run VACUUM every N maintenance runs on SQLite (ANALYZE runs every time)
+SQLITE_VACUUM_EVERY = int(os.getenv("SQLITE_VACUUM_EVERY", "24"))
+# Only the worker holding this lease runs maintenance; renewed before every batch
+MAINTENANCE_LEASE_SECONDS = int(os.getenv("MAINTENANCE_LEASE_SECONDS", "600"))
+MAINTENANCE_LEASE = "maintenance"
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+class NDJSONArchive:
+    """Appends removed rows to a gzip-compressed NDJSON file, one file per run and kind."""
+
+    def __init__(self, directory: str, kind: str):
+        self.path = None
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+            self.path = os.path.join(directory, f"{kind}-{stamp}.ndjson.gz")
+
+    def write(self, rows: List[dict]):
+        if self.path is None or not rows:
+            return
+        with gzip.open(self.path, "at", encoding="utf-8") as archive:
+            for row in rows:
+                archive.write(json.dumps(row, default=_json_default, separators=(",", ":")) + "\n")
+
+
+class MaintenanceService:
+    """
+    Retention, compaction and SQLite upkeep in batches. Every worker runs the
+    loop, but a run only goes ahead in the one holding the database's
+    maintenance lease, and stops if it loses the lease mid-run.
+    """
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        batch_size: int = MAINTENANCE_BATCH_SIZE,
+        batch_pause: float = MAINTENANCE_BATCH_PAUSE,
+        feed_retention_days: int = FEED_RETENTION_DAYS,
+        feed_tombstone_days: int = FEED_TOMBSTONE_DAYS,
+        timer_compaction_months: int = TIMER_COMPACTION_MONTHS,
+        archive_dir: str = MAINTENANCE_ARCHIVE_DIR,
+        vacuum_every: int = SQLITE_VACUUM_EVERY,
+        lease_seconds: int = MAINTENANCE_LEASE_SECONDS,
+        worker_id: str = WORKER_ID
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self.feed_retention_days = feed_retention_days
+        self.feed_tombstone_days = feed_tombstone_days
+        self.timer_compaction_months = timer_compaction_months
+        self.archive_dir = archive_dir
+        self.vacuum_every = vacuum_every
+        self.lease_seconds = lease_seconds
+        self.worker_id = worker_id
+        self.runs = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def _hold_lease(self, db: Session) -> bool:
+        """Take or renew the maintenance lease before a batch. Commits."""
+        if acquire_lease(db, MAINTENANCE_LEASE, self.lease_seconds, self.worker_id):
+            return True
+        logger.warning("Maintenance lease is held by another worker, stopping")
+        return False
+
+    def _pause(self):
+        if self.batch_pause:
+            time.sleep(self.batch_pause)
+
+    def expire_feed_items(self, now: Optional[datetime] = None) -> int:
+        """
+        Delete read, unbookmarked feed items past retention, then orphaned
+        articles and tombstones past FEED_TOMBSTONE_DAYS.
+        """
+        if self.feed_retention_days <= 0:
+            return 0
+        cutoff = (now or datetime.utcnow()) - timedelta(days=self.feed_retention_days)
+        archive = NDJSONArchive(self.archive_dir, "feed_items")
+        deleted = 0
+        db = self.session_factory()
+        try:
+            while True:
+                if not self._hold_lease(db):
+                    return deleted
+                items = db.query(models.FeedItem).filter(
+                    and_(
+                        models.FeedItem.fetched_at < cutoff,
+                        models.FeedItem.is_read == True,
+                        models.FeedItem.is_bookmarked == False
+                    )
+                ).order_by(models.FeedItem.id).limit(self.batch_size).all()
+                if not items:
+                    break
+
+                archive.write([{
+                    "id": item.id,
+                    "user_id": item.user_id,
+                    "category": item.category,
+                    "is_archived": item.is_archived,
+                    "fetched_at": item.fetched_at,
+                    "title": item.title,
+                    "url": item.url,
+                    "source": item.source,
+                    "feed_type": item.feed_type,
+                    "published_at": item.published_at,
+                } for item in items])
+
+                ids_by_user: Dict[int, List[int]] = defaultdict(list)
+                for item in items:
+                    ids_by_user[item.user_id].append(item.id)
+                for user_id, ids in ids_by_user.items():
+                    record_changes(db, user_id, versioning.FEEDS, ids, deleted=True)
+                count_removed_items(db, items)
+                # Ingestion would otherwise add items still in their feed back as unread
+                expired_at = datetime.utcnow()
+                db.execute(insert_ignoring_duplicates(db, models.ExpiredFeedItem), [
+                    {"user_id": item.user_id, "content_hash": item.article.content_hash, "expired_at": expired_at}
+                    for item in items
+                ])
+                db.query(models.FeedItem).filter(
+                    models.FeedItem.id.in_([item.id for item in items])
+                ).delete(synchronize_session=False)
+                db.commit()
+                db.expunge_all()
+                deleted += len(items)
+                self._pause()
+
+            # Shared articles nobody references any more
+            while True:
+                if not self._hold_lease(db):
+                    return deleted
+                orphan_ids = [article_id for (article_id,) in db.query(models.Article.id).filter(
+                    models.Article.fetched_at < cutoff,
+                    ~db.query(models.FeedItem.id).filter(
+                        models.FeedItem.article_id == models.Article.id
+                    ).exists()
+                ).limit(self.batch_size)]
+                if not orphan_ids:
+                    break
+                db.query(models.Article).filter(models.Article.id.in_(orphan_ids)).delete(
+                    synchronize_session=False
+                )
+                db.commit()
+                self._pause()
+
+            if self.feed_tombstone_days > 0:
+                tombstone_cutoff = (now or datetime.utcnow()) - timedelta(days=self.feed_tombstone_days)
+                while True:
+                    if not self._hold_lease(db):
+                        return deleted
+                    expired = db.query(models.ExpiredFeedItem.user_id, models.ExpiredFeedItem.content_hash).filter(
+                        models.ExpiredFeedItem.expired_at < tombstone_cutoff
+                    ).limit(self.batch_size).all()
+                    if not expired:
+                        break
+                    for user_id, content_hash in expired:
+                        db.query(models.ExpiredFeedItem).filter(
+                            models.ExpiredFeedItem.user_id == user_id,
+                            models.ExpiredFeedItem.content_hash == content_hash
+                        ).delete(synchronize_session=False)
+                    db.commit()
+                    self._pause()
+        finally:
+            db.close()
+        return deleted
+
+    def compact_timer_sessions(self, now: Optional[datetime] = None) -> int:
+        """Fold whole days of old timer sessions into per-day rollups and delete them."""
+        if self.timer_compaction_months <= 0:
+            return 0
+        # Cut on a day boundary so every compacted day is compacted completely
+        cutoff_day = ((now or datetime.utcnow()) - timedelta(days=30 * self.timer_compaction_months)).date()
+        cutoff = datetime.combine(cutoff_day, datetime.min.time())
+        archive = NDJSONArchive(self.archive_dir, "timer_sessions")
+        compacted = 0
+        db = self.session_factory()
+        try:
+            while True:
+                if not self._hold_lease(db):
+                    return compacted
+                sessions = db.query(models.TimerSession).filter(
+                    models.TimerSession.started_at < cutoff
+                ).order_by(models.TimerSession.id).limit(self.batch_size).all()
+                if not sessions:
+                    break
+
+                archive.write([{
+                    "id": s.id,
+                    "user_id": s.user_id,
+                    "session_type": s.session_type,
+                    "duration_planned": s.duration_planned,
+                    "duration_actual": s.duration_actual,
+                    "task_id": s.task_id,
+                    "task_title": s.task_title,
+                    "started_at": s.started_at,
+                    "ended_at": s.ended_at,
+                    "was_completed": s.was_completed,
+                    "interruptions": s.interruptions,
+                    "notes": s.notes,
+                } for s in sessions])
+
+                self._merge_rollups(db, sessions)
+                ids_by_user: Dict[int, List[int]] = defaultdict(list)
+                for s in sessions:
+                    ids_by_user[s.user_id].append(s.id)
+                for user_id, ids in ids_by_user.items():
+                    record_changes(db, user_id, versioning.TIMER, ids, deleted=True)
+                db.query(models.TimerSession).filter(
+                    models.TimerSession.id.in_([s.id for s in sessions])
+                ).delete(synchronize_session=False)
+                db.commit()
+                db.expunge_all()
+                compacted += len(sessions)
+                self._pause()
+        finally:
+            db.close()
+        return compacted
+
+    def _merge_rollups(self, db: Session, sessions: List[models.TimerSession]):
+        totals = defaultdict(lambda: {"session_count": 0, "completed_count": 0, "total_duration": 0, "interruptions": 0})
+        for s in sessions:
+            key = (s.user_id, s.started_at.date(), s.session_type or "custom_timer")
+            totals[key]["session_count"] += 1
+            totals[key]["completed_count"] += 1 if s.was_completed else 0
+            totals[key]["total_duration"] += s.duration_actual or 0
+            totals[key]["interruptions"] += s.interruptions or 0
+
+        for (user_id, day, session_type), values in totals.items():
+            rollup = db.query(models.TimerSessionRollup).filter(
+                and_(
+                    models.TimerSessionRollup.user_id == user_id,
+                    models.TimerSessionRollup.day == day,
+                    models.TimerSessionRollup.session_type == session_type
+                )
+            ).first()
+            if rollup is None:
+                db.add(models.TimerSessionRollup(user_id=user_id, day=day, session_type=session_type, **values))
+            else:
+                for field, value in values.items():
+                    setattr(rollup, field, (getattr(rollup, field) or 0) + value)
+        db.flush()
+
+    def optimize_database(self):
+        """ANALYZE every run and VACUUM periodically; only SQLite needs this from us."""
+        # The engine behind session_factory: the main database or, with sharded storage, a shard
+        db = self.session_factory()
+        try:
+            bind = db.get_bind()
+            if bind.dialect.name != "sqlite" or not self._hold_lease(db):
+                return
+        finally:
+            db.close()
+        with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.exec_driver_sql("ANALYZE")
+            if self.vacuum_every and self.runs % self.vacuum_every == 0:
+                connection.exec_driver_sql("VACUUM")
+
+    def run_once(self, hold_for: Optional[int] = None) -> dict:
+        """
+        One maintenance run, if no other worker holds the lease. With
+        ``hold_for`` the lease is kept that many seconds afterwards, so other
+        workers skip the rest of this interval.
+        """
+        started = time.perf_counter()
+        db = self.session_factory()
+        try:
+            if not acquire_lease(db, MAINTENANCE_LEASE, self.lease_seconds, self.worker_id):
+                logger.debug("Maintenance skipped: another worker holds the lease")
+                return {"skipped": True}
+            self.runs += 1
+            stats = {
+                "feed_items_deleted": self.expire_feed_items(),
+                "timer_sessions_compacted": self.compact_timer_sessions(),
+            }
+            self.optimize_database()
+            if hold_for:
+                acquire_lease(db, MAINTENANCE_LEASE, hold_for, self.worker_id)
+            else:
+                release_lease(db, MAINTENANCE_LEASE, self.worker_id)
+        finally:
+            db.close()
+        stats["duration_seconds"] = round(time.perf_counter() - started, 2)
+        logger.info("Maintenance run: %s", stats)
+        return stats
+
+    async def _run_forever(self, interval: int):
+        while True:
+            try:
+                await asyncio.to_thread(self.run_once, interval)
+            except Exception:
+                logger.exception("Maintenance run failed")
+            await asyncio.sleep(interval)
+
+    def start(self, interval: int = MAINTENANCE_INTERVAL):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_forever(interval))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+maintenance = MaintenanceService()
+
+
+if __name__ == "__main__":
+    # One-off run: python -m app.services.maintenance
+    logging.basicConfig(level=logging.INFO)
+    print(json.dumps(maintenance.run_once()))
@@ -0,0 +1,114 @@
+# backend/app/services/password_hasher.py
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional, Tuple
+import asyncio
+import multiprocessing
+import os
+
+# bcrypt work factor. Existing hashes with a different cost are upgraded on
+# the next successful login.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# Hashing runs off the request path on a dedicated pool so a burst of logins
+# can't starve the threadpool that sync endpoints run on.
+PASSWORD_HASH_EXECUTOR = os.getenv("PASSWORD_HASH_EXECUTOR", "process")  # process, thread
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Max hash/verify calls queued or running; further callers wait for a slot
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+# Seconds a caller may wait for a slot before we report the service as busy
+PASSWORD_HASH_QUEUE_TIMEOUT = float(os.getenv("PASSWORD_HASH_QUEUE_TIMEOUT", "10"))
+
+_crypt_context = None
+
+
+def _get_crypt_context():
+    """Per-process CryptContext, imported lazily so pool workers start fast."""
+    global _crypt_context
+    if _crypt_context is None:
+        from passlib.context import CryptContext
+        _crypt_context = CryptContext(
+            schemes=["bcrypt"],
+            deprecated="auto",
+            bcrypt__default_rounds=BCRYPT_ROUNDS,
+            bcrypt__min_rounds=BCRYPT_ROUNDS,
+            bcrypt__max_rounds=BCRYPT_ROUNDS,
+        )
+    return _crypt_context
+
+
+def hash_password_sync(password: str) -> str:
+    return _get_crypt_context().hash(password)
+
+
+def verify_password_sync(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password; also returns a new hash when the stored one needs an upgrade."""
+    return _get_crypt_context().verify_and_update(password, hashed_password)
+
+
+def _prewarm_worker():
+    _get_crypt_context()
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when no hashing slot frees up within the queue timeout."""
+
+
+class PasswordHasher:
+    def __init__(
+        self,
+        executor_kind: str = PASSWORD_HASH_EXECUTOR,
+        workers: int = PASSWORD_HASH_WORKERS,
+        max_pending: int = PASSWORD_HASH_MAX_PENDING,
+        queue_timeout: float = PASSWORD_HASH_QUEUE_TIMEOUT
+    ):
+        self.executor_kind = executor_kind
+        self.workers = workers
+        self.max_pending = max_pending
+        self.queue_timeout = queue_timeout
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_kind == "thread":
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pwhash")
+            else:
+                # spawn: forking a process that already runs an event loop and threads is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+        return self._executor
+
+    async def _run(self, fn, *args):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_pending)
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise PasswordHasherBusy("Password hashing is overloaded, try again shortly")
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self._semaphore.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password_sync, password)
+
+    async def verify(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        return await self._run(verify_password_sync, password, hashed_password)
+
+    def prewarm(self):
+        """Start the pool workers ahead of the first login."""
+        executor = self._get_executor()
+        for _ in range(self.workers):
+            executor.submit(_prewarm_worker)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher()
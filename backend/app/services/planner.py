@@ -0,0 +1,384 @@
+# backend/app/services/planner.py
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from itertools import dropwhile
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+import os
+import threading
+
+from sqlalchemy.orm import Session
+
+from app import models
+from app.metrics import registry
+from app.services import versioning
+from app.services.change_log import current_watermark
+
+# Configuration
+# Users whose open tasks each worker keeps in priority order
+PLANNER_CACHE_SIZE = int(os.getenv("PLANNER_CACHE_SIZE", "1000"))
+# Past this many task changes since the cached copy, reload it instead of patching
+PLANNER_INCREMENTAL_LIMIT = int(os.getenv("PLANNER_INCREMENTAL_LIMIT", "500"))
+# Focus blocks between long breaks
+POMODOROS_PER_LONG_BREAK = 4
+
+DEFAULT_WORK_HOURS = (time(9, 0), time(17, 0))
+
+FOCUS = "focus"
+BREAK = "break"
+LONG_BREAK = "long_break"
+
+planner_backlog_loads_total = registry.counter(
+    "planner_backlog_loads_total", "Open-task backlogs served to the planner, by how (hit, incremental, full).", ("kind",)
+)
+
+
+@dataclass(frozen=True)
+class BacklogTask:
+    id: int
+    title: str
+    priority: Optional[str]
+    priority_rank: int
+    # Naive UTC, like stored times
+    due_date: Optional[datetime]
+    project: Optional[str]
+
+    @property
+    def key(self) -> Tuple[int, datetime, int]:
+        # next_tasks order: priority, then earliest due date, undated last
+        return self.priority_rank, self.due_date or datetime.max, self.id
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # SQLite hands back naive UTC, PostgreSQL aware datetimes
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class Backlog:
+    """A user's open tasks in priority order, as of change log seq ``watermark``."""
+
+    def __init__(self, tasks: Iterable[BacklogTask] = (), watermark: int = 0):
+        self.watermark = watermark
+        self._tasks: Dict[int, BacklogTask] = {task.id: task for task in tasks}
+        self._order: List[Tuple[int, datetime, int]] = sorted(task.key for task in self._tasks.values())
+
+    def copy(self, watermark: int) -> "Backlog":
+        backlog = Backlog(watermark=watermark)
+        backlog._tasks = dict(self._tasks)
+        backlog._order = list(self._order)
+        return backlog
+
+    def remove(self, task_id: int):
+        task = self._tasks.pop(task_id, None)
+        if task is not None:
+            del self._order[bisect_left(self._order, task.key)]
+
+    def upsert(self, task: BacklogTask):
+        self.remove(task.id)
+        self._tasks[task.id] = task
+        insort(self._order, task.key)
+
+    def __len__(self):
+        return len(self._order)
+
+    def __iter__(self) -> Iterator[BacklogTask]:
+        tasks = self._tasks
+        return (tasks[key[2]] for key in self._order)
+
+
+def _open_tasks(db: Session, user_id: int, task_ids: Optional[List[int]] = None) -> List[BacklogTask]:
+    query = db.query(
+        models.Task.id, models.Task.title, models.Task.priority, models.Task.priority_rank,
+        models.Task.due_date, models.Task.project
+    ).filter(
+        models.Task.owner_id == user_id,
+        models.Task.is_completed == False
+    )
+    if task_ids is not None:
+        query = query.filter(models.Task.id.in_(task_ids))
+    return [
+        BacklogTask(task_id, title, priority, rank, _naive_utc(due_date), project)
+        for task_id, title, priority, rank, due_date, project in query
+    ]
+
+
+def _changed_task_ids(db: Session, user_id: int, since: int, limit: int) -> Optional[List[int]]:
+    """Tasks with change log entries after ``since``; None if there are more than ``limit``."""
+    rows = db.query(models.ChangeLogEntry.entity_id).filter(
+        models.ChangeLogEntry.user_id == user_id,
+        models.ChangeLogEntry.resource == versioning.TASKS,
+        models.ChangeLogEntry.seq > since
+    ).limit(limit + 1).all()
+    if len(rows) > limit:
+        return None
+    return list({entity_id for entity_id, in rows})
+
+
+class BacklogCache:
+    """
+    Per-worker LRU of users' open tasks in priority order. Every lookup reads
+    the user's change log watermark; when tasks changed since the cached copy,
+    only the changed rows are read back and moved in the order, so editing one
+    task costs one small query rather than reloading and sorting them all.
+    """
+
+    def __init__(self, max_size: int = PLANNER_CACHE_SIZE, incremental_limit: int = PLANNER_INCREMENTAL_LIMIT):
+        self.max_size = max_size
+        self.incremental_limit = incremental_limit
+        self._entries: "OrderedDict[int, Backlog]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, user_id: int) -> Backlog:
+        # Read first: changes committed while we load are picked up next time.
+        # A user's seq order is their commit order (see change_log), so no
+        # change below the watermark can still turn up later
+        watermark = current_watermark(db, user_id)
+        with self._lock:
+            cached = self._entries.get(user_id)
+            if cached is not None:
+                self._entries.move_to_end(user_id)
+        if cached is not None and cached.watermark >= watermark:
+            # A lagging replica may report an older watermark than the cached copy
+            planner_backlog_loads_total.inc(kind="hit")
+            return cached
+
+        backlog = None
+        if cached is not None:
+            changed_ids = _changed_task_ids(db, user_id, cached.watermark, self.incremental_limit)
+            if changed_ids is not None:
+                backlog = cached.copy(watermark)
+                if changed_ids:
+                    # Completed and deleted tasks don't come back
+                    for task_id in changed_ids:
+                        backlog.remove(task_id)
+                    for task in _open_tasks(db, user_id, changed_ids):
+                        backlog.upsert(task)
+                planner_backlog_loads_total.inc(kind="incremental")
+        if backlog is None:
+            backlog = Backlog(_open_tasks(db, user_id), watermark)
+            planner_backlog_loads_total.inc(kind="full")
+
+        if self.max_size > 0:
+            with self._lock:
+                current = self._entries.get(user_id)
+                if current is None or current.watermark <= backlog.watermark:
+                    self._entries[user_id] = backlog
+                    self._entries.move_to_end(user_id)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return backlog
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+backlog_cache = BacklogCache()
+
+registry.gauge(
+    "planner_backlog_entries", "Users whose open tasks this worker has cached for planning.",
+    function=lambda: len(backlog_cache)
+)
+
+
+@dataclass(frozen=True)
+class Block:
+    kind: str  # focus, break, long_break
+    # Naive UTC
+    start: datetime
+    end: datetime
+
+
+@dataclass(frozen=True)
+class PlannedBlock:
+    block: Block
+    # None for breaks and focus blocks left free
+    task: Optional[BacklogTask] = None
+    # Due before the block ends: overdue, or its deadline couldn't be met
+    late: bool = False
+
+
+@dataclass
+class Plan:
+    blocks: List[PlannedBlock]
+    open_tasks: int
+    # Open tasks due within the plan whose focus block ends after their due date, or that got none
+    missed_deadlines: List[int]
+
+    @property
+    def scheduled(self) -> int:
+        return sum(planned.task is not None for planned in self.blocks)
+
+
+def parse_work_hours(start: Optional[str], end: Optional[str]) -> Tuple[time, time]:
+    """Work hours from "HH:MM" settings; the defaults if either is unusable."""
+    try:
+        return time.fromisoformat(start), time.fromisoformat(end)
+    except (TypeError, ValueError):
+        return DEFAULT_WORK_HOURS
+
+
+def _utc(day: date, at: time, zone: ZoneInfo) -> datetime:
+    return datetime.combine(day, at, tzinfo=zone).astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def day_blocks(
+    day: date,
+    zone: ZoneInfo,
+    work_hours: Tuple[time, time],
+    work_minutes: int,
+    break_minutes: int,
+    long_break_minutes: int
+) -> List[Block]:
+    """Pomodoro focus blocks and the breaks between them, within the day's work hours."""
+    start, end = _utc(day, work_hours[0], zone), _utc(day, work_hours[1], zone)
+    work = timedelta(minutes=max(work_minutes, 1))
+    blocks = []
+    cursor, focus_count = start, 0
+    while cursor + work <= end:
+        blocks.append(Block(FOCUS, cursor, cursor + work))
+        cursor += work
+        focus_count += 1
+        long_break = focus_count % POMODOROS_PER_LONG_BREAK == 0
+        rest = timedelta(minutes=max(long_break_minutes if long_break else break_minutes, 0))
+        # No break after the day's last focus block
+        if cursor + rest + work > end:
+            break
+        if rest:
+            blocks.append(Block(LONG_BREAK if long_break else BREAK, cursor, cursor + rest))
+        cursor += rest
+    return blocks
+
+
+def _next_task(waiting: List[BacklogTask], deadlines: Dict[int, int], pending: List[int], index: int) -> int:
+    """
+    Position in ``waiting`` (priority order) of the task for focus block
+    ``index``: the most important one that keeps every waiting deadline
+    (``pending``, sorted) reachable in the blocks after it.
+    """
+    # The first block by which the waiting deadlines fill every block left:
+    # only a task due by then may go first
+    tight = None
+    for position, deadline in enumerate(pending):
+        last_of_its_value = position + 1 == len(pending) or pending[position + 1] != deadline
+        if last_of_its_value and deadline - index + 1 == position + 1:
+            tight = deadline
+            break
+    if tight is None:
+        return 0
+    for position, task in enumerate(waiting):
+        if deadlines.get(task.id, tight + 1) <= tight:
+            return position
+    raise AssertionError("waiting deadlines can't be met")
+
+
+def plan_blocks(backlog: Backlog, blocks: List[Block], now: datetime) -> Plan:
+    """
+    Assign open tasks to focus blocks, one task per block.
+
+    Due dates first: tasks due inside the plan are taken in priority order
+    and each is reserved the latest free focus block ending by its due date
+    (job sequencing with deadlines, with union-find over the blocks), so a
+    task only misses its deadline when the blocks before it are all taken by
+    more important ones. Free blocks then go to the remaining tasks in
+    priority order (overdue ones first within a priority, undated last).
+
+    The chosen tasks are then laid out front to back, each block getting the
+    most important task left unless that would leave too few blocks for the
+    deadlines still ahead. In that case it gets the most important task due
+    by the first block where the remaining deadlines leave no slack.
+
+    O(n + b²) for n open tasks and b blocks, past the cached sort.
+    """
+    focus = [block for block in blocks if block.kind == FOCUS]
+    ends = [block.end for block in focus]
+    horizon_end = ends[-1] if ends else now
+    free = len(focus)
+
+    # parent[k]: the latest free focus block at or before block k - 1, plus one (0: none)
+    parent = list(range(len(focus) + 1))
+
+    def latest_free(k: int) -> int:
+        root = k
+        while parent[root] != root:
+            root = parent[root]
+        while parent[k] != root:
+            parent[k], k = root, parent[k]
+        return root
+
+    # Task id -> index of the last focus block ending by its due date
+    deadlines: Dict[int, int] = {}
+    chosen: Dict[int, BacklogTask] = {}  # task id -> task
+    missed: List[int] = []
+    for task in backlog:
+        if task.due_date is None or not now <= task.due_date <= horizon_end:
+            continue
+        last = bisect_right(ends, task.due_date)
+        k = latest_free(last) if free else 0
+        if k:
+            parent[k] = k - 1
+            deadlines[task.id] = last - 1
+            chosen[task.id] = task
+            free -= 1
+        else:
+            missed.append(task.id)
+
+    if free:
+        for task in backlog:
+            if task.id not in chosen:
+                chosen[task.id] = task
+                free -= 1
+                if not free:
+                    break
+
+    waiting = sorted(chosen.values(), key=lambda task: task.key)
+    pending = sorted(deadlines.values())
+    planned = []
+    focus_index = 0
+    for block in blocks:
+        if block.kind != FOCUS or not waiting:
+            planned.append(PlannedBlock(block))
+            continue
+        task = waiting.pop(_next_task(waiting, deadlines, pending, focus_index))
+        focus_index += 1
+        if task.id in deadlines:
+            del pending[bisect_left(pending, deadlines[task.id])]
+        planned.append(PlannedBlock(block, task, late=task.due_date is not None and task.due_date < block.end))
+    return Plan(planned, len(backlog), missed)
+
+
+def plan_days(
+    backlog: Backlog,
+    first_day: date,
+    days: int,
+    zone: ZoneInfo,
+    settings,
+    now: Optional[datetime] = None
+) -> Plan:
+    """
+    Plan ``days`` days from ``first_day`` (in ``zone``) with the user's work
+    hours and pomodoro lengths. Blocks that already started are left out.
+    """
+    now = now or datetime.utcnow()
+    work_hours = parse_work_hours(settings.work_hours_start, settings.work_hours_end)
+    blocks = []
+    for offset in range(days):
+        upcoming = [
+            block for block in day_blocks(
+                first_day + timedelta(days=offset), zone, work_hours,
+                settings.pomodoro_work_duration or 25,
+                settings.pomodoro_break_duration or 0,
+                settings.pomodoro_long_break_duration or 0
+            ) if block.start >= now
+        ]
+        # A day planned part way through starts with focus, not the rest of a break
+        blocks.extend(dropwhile(lambda block: block.kind != FOCUS, upcoming))
+    return plan_blocks(backlog, blocks, now)
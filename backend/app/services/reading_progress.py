@@ -0,0 +1,189 @@
+# backend/app/services/reading_progress.py
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+import asyncio
+import logging
+import os
+import threading
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+from app import models
+from app.sharding import SHARDING_ENABLED, session_factory_for, user_shards
+from app.services import versioning
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+# Buffered page turns are written at most this often (seconds)
+READING_PROGRESS_FLUSH_INTERVAL = float(os.getenv("READING_PROGRESS_FLUSH_INTERVAL", "5"))
+
+
+@dataclass
+class PendingProgress:
+    user_id: int
+    total_pages: Optional[int]
+    status: str
+    current_page: int
+    progress_percentage: float
+
+
+# (user_id, item_id): item ids are only unique per database with sharded storage
+PendingKey = Tuple[int, int]
+
+
+class ReadingProgressBuffer:
+    """
+    Coalesces reading progress updates. Page turns only replace the item's
+    pending entry in memory; a background flush writes the latest value of
+    every pending item in one batched UPDATE. Status changes (starting or
+    finishing an item) don't go through here and are written immediately.
+
+    The buffer is per process: reads served by this worker flush the user's
+    pending entries first, other workers see them after the next flush.
+    """
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self.stats = {"updates": 0, "rows_written": 0, "flushes": 0}
+        self._pending: Dict[PendingKey, PendingProgress] = {}
+        self._lock = threading.Lock()
+        # Serializes flushes so a read never overtakes an in-flight write
+        self._flush_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def get(self, user_id: int, item_id: int) -> Optional[PendingProgress]:
+        with self._lock:
+            return self._pending.get((user_id, item_id))
+
+    def add(self, item_id: int, progress: PendingProgress):
+        with self._lock:
+            self._pending[(progress.user_id, item_id)] = progress
+            self.stats["updates"] += 1
+
+    def discard(self, user_id: int, item_id: int):
+        """Drop an item's pending progress, e.g. when a full update overwrites it."""
+        with self._lock:
+            self._pending.pop((user_id, item_id), None)
+
+    def has_pending(self, user_id: int) -> bool:
+        with self._lock:
+            return any(key[0] == user_id for key in self._pending)
+
+    def _take(self, user_id: Optional[int] = None) -> Dict[PendingKey, PendingProgress]:
+        with self._lock:
+            if user_id is None:
+                taken, self._pending = self._pending, {}
+                return taken
+            taken = {key: p for key, p in self._pending.items() if key[0] == user_id}
+            for key in taken:
+                del self._pending[key]
+            return taken
+
+    def _restore(self, taken: Dict[PendingKey, PendingProgress]):
+        """Put back entries from a failed flush unless newer progress arrived meanwhile."""
+        with self._lock:
+            for key, progress in taken.items():
+                self._pending.setdefault(key, progress)
+
+    def _write(self, db: Session, taken: Dict[PendingKey, PendingProgress]):
+        items = models.ReadingItem.__table__
+        # Core statement so the parameter list runs as one executemany
+        db.execute(
+            update(items).where(
+                items.c.id == bindparam("item_id"),
+                items.c.user_id == bindparam("owner_id")
+            ).values(
+                current_page=bindparam("page"),
+                progress_percentage=bindparam("percentage")
+            ),
+            [
+                {
+                    "item_id": item_id,
+                    "owner_id": user_id,
+                    "page": p.current_page,
+                    "percentage": p.progress_percentage
+                }
+                for (user_id, item_id), p in taken.items()
+            ]
+        )
+        for user_id in {p.user_id for p in taken.values()}:
+            versioning.bump_version(db, user_id, versioning.READING)
+
+    def _by_database(self, taken: Dict[PendingKey, PendingProgress]):
+        """Split entries by the database their users' data lives in (one unless sharded)."""
+        if not SHARDING_ENABLED:
+            return [(self.session_factory, taken)]
+        shards = user_shards({p.user_id for p in taken.values()})
+        groups: Dict[Optional[int], Dict[PendingKey, PendingProgress]] = {}
+        for key, progress in taken.items():
+            groups.setdefault(shards.get(progress.user_id), {})[key] = progress
+        return [(session_factory_for(shard), group) for shard, group in groups.items()]
+
+    def flush(self, db: Optional[Session] = None, user_id: Optional[int] = None) -> int:
+        """Write pending progress (all users, or just one) and commit. Returns rows written."""
+        with self._flush_lock:
+            taken = self._take(user_id)
+            if not taken:
+                return 0
+            written: Dict[PendingKey, PendingProgress] = {}
+            try:
+                if db is not None:
+                    self._write(db, taken)
+                    db.commit()
+                else:
+                    for session_factory, group in self._by_database(taken):
+                        session = session_factory()
+                        try:
+                            self._write(session, group)
+                            session.commit()
+                        finally:
+                            session.close()
+                        written.update(group)
+            except Exception:
+                if db is not None:
+                    db.rollback()
+                # Databases already written to (sharded storage) keep their rows
+                self._restore({key: p for key, p in taken.items() if key not in written})
+                raise
+            self.stats["rows_written"] += len(taken)
+            self.stats["flushes"] += 1
+            return len(taken)
+
+    def flush_user(self, db: Session, user_id: int):
+        """Make a user's buffered progress visible before serving their reads."""
+        if self.has_pending(user_id):
+            self.flush(db, user_id)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            pending = len(self._pending)
+        return {**self.stats, "pending": pending}
+
+    async def _run_forever(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception:
+                logger.exception("Reading progress flush failed")
+
+    def start(self, interval: float = READING_PROGRESS_FLUSH_INTERVAL):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_forever(interval))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # Don't lose the last page turns on shutdown
+        await asyncio.to_thread(self.flush)
+
+
+reading_progress = ReadingProgressBuffer()
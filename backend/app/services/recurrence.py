@@ -0,0 +1,307 @@
+# backend/app/services/recurrence.py
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterator, List, Optional
+import asyncio
+import logging
+import os
+
+from dateutil.rrule import DAILY, MONTHLY, WEEKLY, YEARLY, rrule, rrulestr, weekdays
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal, insert_ignoring_duplicates
+from app import models
+from app.services import versioning
+from app.services.change_log import record_changes
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+RECURRENCE_ENABLED = os.getenv("RECURRENCE_ENABLED", "true").lower() == "true"
+RECURRENCE_INTERVAL = int(os.getenv("RECURRENCE_INTERVAL", "900"))  # seconds between scheduler runs
+# Occurrences are materialized this many days ahead of today, never further
+RECURRENCE_WINDOW_DAYS = int(os.getenv("RECURRENCE_WINDOW_DAYS", "14"))
+RECURRENCE_BATCH_SIZE = int(os.getenv("RECURRENCE_BATCH_SIZE", "500"))  # series per transaction
+INSERT_CHUNK_SIZE = 500
+
+FREQUENCIES = {"daily": DAILY, "weekly": WEEKLY, "monthly": MONTHLY, "yearly": YEARLY}
+WEEKDAY_CODES = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+
+# Fields an occurrence copies from its series
+OCCURRENCE_FIELDS = ("title", "description", "priority", "priority_rank", "tags", "project", "owner_id")
+
+
+def _parse_weekday(value):
+    if isinstance(value, int) and 0 <= value <= 6:
+        return weekdays[value]
+    if isinstance(value, str) and value.upper()[:2] in WEEKDAY_CODES:
+        return weekdays[WEEKDAY_CODES[value.upper()[:2]]]
+    raise ValueError(f"Invalid weekday: {value!r}")
+
+
+def _parse_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def build_rule(pattern: dict, start: datetime) -> rrule:
+    """
+    Turn a recurrence_pattern into an rrule starting at start. Supported:
+    {"type": "daily"|"weekly"|"monthly"|"yearly", "interval": 1,
+     "days_of_week": ["MO", "WE"], "day_of_month": 15, "count": 10, "end_date": "2025-12-31"}
+    and {"type": "rrule", "rule": "FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,FR;UNTIL=20251231"}.
+    Raises ValueError for anything else.
+    """
+    if not isinstance(pattern, dict):
+        raise ValueError("recurrence_pattern must be an object")
+    start = start.replace(tzinfo=None)
+    kind = pattern.get("type")
+
+    if kind == "rrule":
+        text = pattern.get("rule")
+        if not isinstance(text, str) or not text.strip():
+            raise ValueError("rrule patterns need a 'rule' string")
+        text = text.strip()
+        if text.upper().startswith("RRULE:"):
+            text = text[6:]
+        # Occurrences are keyed by date, so sub-daily rules make no sense here
+        parts = dict(part.split("=", 1) for part in text.upper().split(";") if "=" in part)
+        if parts.get("FREQ") not in ("DAILY", "WEEKLY", "MONTHLY", "YEARLY"):
+            raise ValueError("rrule FREQ must be DAILY, WEEKLY, MONTHLY or YEARLY")
+        rule = rrulestr(text, dtstart=start, ignoretz=True)
+        if not isinstance(rule, rrule):
+            raise ValueError("Only a single RRULE is supported")
+        return rule
+
+    if kind not in FREQUENCIES:
+        raise ValueError(f"Unknown recurrence type: {kind!r}")
+
+    options = {"interval": int(pattern.get("interval") or 1)}
+    if options["interval"] < 1:
+        raise ValueError("interval must be at least 1")
+    if pattern.get("days_of_week"):
+        options["byweekday"] = [_parse_weekday(day) for day in pattern["days_of_week"]]
+    if pattern.get("day_of_month"):
+        options["bymonthday"] = int(pattern["day_of_month"])
+    if pattern.get("count"):
+        options["count"] = int(pattern["count"])
+    if pattern.get("end_date"):
+        options["until"] = datetime.combine(_parse_date(pattern["end_date"]), time.max)
+    return rrule(FREQUENCIES[kind], dtstart=start, **options)
+
+
+def _series_start(task: models.Task) -> datetime:
+    return task.due_date or task.created_at or datetime.now()
+
+
+def is_series(task: models.Task) -> bool:
+    return bool(task.is_recurring and task.recurrence_pattern and task.recurrence_parent_id is None)
+
+
+def validate_pattern(task: models.Task):
+    """Raise ValueError if the task is a series with an unusable pattern."""
+    if is_series(task):
+        build_rule(task.recurrence_pattern, _series_start(task))
+
+
+def default_horizon() -> date:
+    return datetime.now().date() + timedelta(days=RECURRENCE_WINDOW_DAYS)
+
+
+def _materialized_until(task: models.Task, start: datetime) -> datetime:
+    """Occurrences after this point don't exist yet; none are ever created before yesterday."""
+    yesterday = datetime.combine(datetime.now().date() - timedelta(days=1), time.max)
+    after = max(start.replace(tzinfo=None), yesterday)
+    if task.recurrence_generated_until:
+        after = max(after, datetime.combine(task.recurrence_generated_until, time.max))
+    return after
+
+
+def pending_occurrences(task: models.Task, start: datetime, end: datetime) -> Iterator[datetime]:
+    """
+    Occurrences of a series in [start, end) that aren't materialized yet but
+    will be once the window reaches them, in order. Lazy, so long windows
+    cost nothing until iterated. Raises ValueError for an invalid pattern.
+    """
+    series_start = _series_start(task)
+    rule = build_rule(task.recurrence_pattern, series_start)
+    after = _materialized_until(task, series_start)
+    occurrences = rule.xafter(start, inc=True) if start > after else rule.xafter(after)
+    for occurrence in occurrences:
+        if occurrence >= end:
+            return
+        yield occurrence
+
+
+def _plan_occurrences(task: models.Task, horizon: date) -> List[dict]:
+    """Occurrence rows the series needs up to horizon; advances its bookkeeping."""
+    start = _series_start(task)
+    rule = build_rule(task.recurrence_pattern, start)
+    after = _materialized_until(task, start)
+    until = datetime.combine(horizon, time.max)
+
+    rows = [
+        {
+            **{field: getattr(task, field) for field in OCCURRENCE_FIELDS},
+            "due_date": occurrence,
+            "is_completed": False,
+            "is_recurring": False,
+            "recurrence_parent_id": task.id,
+            "occurrence_date": occurrence.date(),
+        }
+        for occurrence in rule.between(after, until)
+    ]
+
+    following = rule.after(until)
+    task.recurrence_generated_until = horizon
+    task.recurrence_next_at = following.date() if following else None
+    return rows
+
+
+def _insert_occurrences(db: Session, rows: List[dict]) -> List[int]:
+    """Insert occurrence rows, skipping ones that already exist, and log them for sync."""
+    if not rows:
+        return []
+    statement = insert_ignoring_duplicates(db, models.Task).returning(models.Task.id, models.Task.owner_id)
+    ids_by_owner: Dict[int, List[int]] = defaultdict(list)
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        for task_id, owner_id in db.execute(statement, rows[start:start + INSERT_CHUNK_SIZE]):
+            ids_by_owner[owner_id].append(task_id)
+    for owner_id, ids in ids_by_owner.items():
+        record_changes(db, owner_id, versioning.TASKS, ids)
+    return [task_id for ids in ids_by_owner.values() for task_id in ids]
+
+
+def expand_series(db: Session, task: models.Task, horizon: Optional[date] = None) -> List[int]:
+    """
+    Materialize the series' occurrences up to horizon. Idempotent: the
+    (recurrence_parent_id, occurrence_date) constraint drops repeats. The
+    series task itself is the first occurrence; past dates are not backfilled.
+    """
+    return _insert_occurrences(db, _plan_occurrences(task, horizon or default_horizon()))
+
+
+def _pending_occurrences(db: Session, task: models.Task, from_date: Optional[date] = None):
+    query = db.query(models.Task).filter(
+        and_(
+            models.Task.recurrence_parent_id == task.id,
+            models.Task.is_completed == False
+        )
+    )
+    if from_date is not None:
+        query = query.filter(models.Task.occurrence_date >= from_date)
+    return query
+
+
+def refresh_series(db: Session, task: models.Task) -> List[int]:
+    """
+    Re-plan a series after its pattern, due date or recurring flag changed:
+    drop pending upcoming occurrences and generate the window again.
+    """
+    if task.id is not None:
+        stale_ids = [t.id for t in _pending_occurrences(db, task, datetime.now().date()).with_entities(models.Task.id)]
+        if stale_ids:
+            record_changes(db, task.owner_id, versioning.TASKS, stale_ids, deleted=True)
+            db.query(models.Task).filter(models.Task.id.in_(stale_ids)).delete(synchronize_session=False)
+
+    task.recurrence_generated_until = None
+    task.recurrence_next_at = None
+    if not is_series(task):
+        return []
+    db.flush()
+    return expand_series(db, task)
+
+
+def remove_series(db: Session, task: models.Task):
+    """Before deleting a series: drop its pending occurrences, keep completed ones."""
+    pending_ids = [t.id for t in _pending_occurrences(db, task).with_entities(models.Task.id)]
+    if pending_ids:
+        record_changes(db, task.owner_id, versioning.TASKS, pending_ids, deleted=True)
+        db.query(models.Task).filter(models.Task.id.in_(pending_ids)).delete(synchronize_session=False)
+    db.query(models.Task).filter(models.Task.recurrence_parent_id == task.id).update(
+        {models.Task.recurrence_parent_id: None}, synchronize_session=False
+    )
+
+
+class RecurrenceScheduler:
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        window_days: int = RECURRENCE_WINDOW_DAYS,
+        batch_size: int = RECURRENCE_BATCH_SIZE
+    ):
+        self.session_factory = session_factory
+        self.window_days = window_days
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+
+    def run_once(self) -> dict:
+        """
+        Extend every series whose next occurrence falls inside the window.
+        Series are found through the recurrence_next_at index, so the cost
+        is proportional to the series that are due, not to all series.
+        """
+        horizon = datetime.now().date() + timedelta(days=self.window_days)
+        stats = {"series": 0, "occurrences": 0, "invalid": 0}
+        last_id = 0
+        db = self.session_factory()
+        try:
+            while True:
+                series = db.query(models.Task).filter(
+                    and_(
+                        models.Task.recurrence_next_at <= horizon,
+                        models.Task.id > last_id
+                    )
+                ).order_by(models.Task.id).limit(self.batch_size).all()
+                if not series:
+                    break
+                last_id = series[-1].id
+
+                rows = []
+                for task in series:
+                    if not is_series(task):
+                        task.recurrence_next_at = None
+                        continue
+                    try:
+                        rows.extend(_plan_occurrences(task, horizon))
+                        stats["series"] += 1
+                    except ValueError:
+                        logger.warning("Invalid recurrence pattern on task %s", task.id)
+                        task.recurrence_next_at = None
+                        stats["invalid"] += 1
+                # One multi-row insert and one change-log write per owner for the whole batch
+                stats["occurrences"] += len(_insert_occurrences(db, rows))
+                db.commit()
+                db.expunge_all()
+        finally:
+            db.close()
+        logger.info("Recurrence run: %s", stats)
+        return stats
+
+    async def _run_forever(self, interval: int):
+        while True:
+            try:
+                await asyncio.to_thread(self.run_once)
+            except Exception:
+                logger.exception("Recurrence run failed")
+            await asyncio.sleep(interval)
+
+    def start(self, interval: int = RECURRENCE_INTERVAL):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_forever(interval))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+recurrence_scheduler = RecurrenceScheduler()
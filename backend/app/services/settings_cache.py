@@ -0,0 +1,242 @@
+# backend/app/services/settings_cache.py
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Optional, Set
+import asyncio
+import logging
+import os
+import threading
+import time
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+from app import models, schemas
+from app.metrics import registry
+from app.services import versioning
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+SETTINGS_CACHE_ENABLED = os.getenv("SETTINGS_CACHE_ENABLED", "true").lower() == "true"
+# Users whose settings each worker keeps
+SETTINGS_CACHE_SIZE = int(os.getenv("SETTINGS_CACHE_SIZE", "10000"))
+# Longest a cached copy is used; bounds staleness when an invalidation is missed
+SETTINGS_CACHE_TTL = float(os.getenv("SETTINGS_CACHE_TTL", "300"))
+# Seconds between change log polls for settings changed through other workers
+SETTINGS_CACHE_POLL_INTERVAL = float(os.getenv("SETTINGS_CACHE_POLL_INTERVAL", "2"))
+# A change_log seq missing below newer ones belongs to a transaction still in
+# flight or rolled back; polls keep looking for it this many seconds
+SETTINGS_CACHE_GAP_TIMEOUT = float(os.getenv("SETTINGS_CACHE_GAP_TIMEOUT", "60"))
+
+settings_cache_requests_total = registry.counter(
+    "settings_cache_requests_total", "User settings lookups by cache result (hit, miss).", ("result",)
+)
+settings_cache_invalidations_total = registry.counter(
+    "settings_cache_invalidations_total", "Cached user settings dropped or replaced, by cause.", ("source",)
+)
+
+
+@dataclass(frozen=True)
+class CachedSettings:
+    settings: schemas.UserSettings
+    # Settings resource version of this copy, for ETags without a query
+    version: int
+    expires_at: float
+
+
+class SettingsCache:
+    """
+    Per-worker LRU of users' settings. Writes through this worker replace the
+    entry after their commit (put); writes through other workers are picked up
+    by SettingsInvalidationPoller, with the TTL as a backstop.
+    """
+
+    def __init__(self, max_size: int = SETTINGS_CACHE_SIZE, ttl: float = SETTINGS_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[int, CachedSettings]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every put and invalidation; a load that overlapped one isn't cached
+        self._generation = 0
+
+    @property
+    def enabled(self) -> bool:
+        return SETTINGS_CACHE_ENABLED and self.max_size > 0
+
+    def _snapshot(self, settings: models.UserSettings, version: int) -> CachedSettings:
+        return CachedSettings(
+            settings=schemas.UserSettings.model_validate(settings),
+            version=version,
+            expires_at=time.monotonic() + self.ttl
+        )
+
+    def _store(self, user_id: int, entry: CachedSettings):
+        self._entries[user_id] = entry
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def load(self, db: Session, user_id: int) -> Optional[CachedSettings]:
+        settings = db.query(models.UserSettings).filter(models.UserSettings.user_id == user_id).first()
+        if settings is None:
+            return None
+        return self._snapshot(settings, versioning.get_version(db, user_id, versioning.SETTINGS))
+
+    def get(self, user_id: int, session_factory: Callable[..., Session] = SessionLocal) -> Optional[CachedSettings]:
+        """The user's settings, loaded with a session from ``session_factory`` on a miss; None if they have none."""
+        if self.enabled:
+            with self._lock:
+                entry = self._entries.get(user_id)
+                if entry is not None and entry.expires_at > time.monotonic():
+                    self._entries.move_to_end(user_id)
+                    self.hits += 1
+                    settings_cache_requests_total.inc(result="hit")
+                    return entry
+                self.misses += 1
+                generation = self._generation
+            settings_cache_requests_total.inc(result="miss")
+
+        db = session_factory()
+        try:
+            entry = self.load(db, user_id)
+        finally:
+            db.close()
+
+        if entry is not None and self.enabled:
+            with self._lock:
+                if generation == self._generation:
+                    self._store(user_id, entry)
+        return entry
+
+    def put(self, user_id: int, settings: models.UserSettings, version: int):
+        """Write-through: call after the commit that changed the user's settings."""
+        if not self.enabled:
+            return
+        entry = self._snapshot(settings, version)
+        with self._lock:
+            self._generation += 1
+            self._store(user_id, entry)
+        settings_cache_invalidations_total.inc(source="write")
+
+    def invalidate(self, user_ids: Iterable[int], source: str = "write"):
+        with self._lock:
+            self._generation += 1
+            dropped = sum(self._entries.pop(user_id, None) is not None for user_id in user_ids)
+        if dropped:
+            settings_cache_invalidations_total.inc(dropped, source=source)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+settings_cache = SettingsCache()
+
+registry.gauge(
+    "settings_cache_entries", "Users whose settings this worker has cached.", function=lambda: len(settings_cache)
+)
+
+
+class SettingsInvalidationPoller:
+    """
+    Drops cached settings changed through other workers: every interval, reads
+    the settings entries appended to change_log since the last poll. One per
+    database (main and each shard), all feeding the same cache.
+
+    Transactions of different users commit out of seq order, so a seq missing
+    below the newest one is looked up again on each poll until it shows up or
+    the gap timeout passes. Each poll reads only rows it hasn't seen.
+    """
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        cache: SettingsCache = settings_cache,
+        gap_timeout: float = SETTINGS_CACHE_GAP_TIMEOUT
+    ):
+        self.session_factory = session_factory
+        self.cache = cache
+        self.gap_timeout = gap_timeout
+        # Newest seq read so far; None until the first poll
+        self.last_seq: Optional[int] = None
+        # Missing seqs below last_seq, by when they were first missed
+        self._gaps: Dict[int, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def poll_once(self) -> int:
+        """Invalidate users with settings changes since the last poll; returns how many."""
+        db = self.session_factory()
+        try:
+            if self.last_seq is None:
+                # Anything cached before the watermark may predate changes we'd now skip
+                self.last_seq = db.query(func.max(models.ChangeLogEntry.seq)).scalar() or 0
+                self.cache.clear()
+                return 0
+            # Every resource above last_seq, to tell gaps from other users' changes
+            unseen = models.ChangeLogEntry.seq > self.last_seq
+            if self._gaps:
+                unseen = or_(unseen, models.ChangeLogEntry.seq.in_(list(self._gaps)))
+            rows = db.query(
+                models.ChangeLogEntry.seq, models.ChangeLogEntry.user_id, models.ChangeLogEntry.resource
+            ).filter(unseen).all()
+        finally:
+            db.close()
+        user_ids = {user_id for _, user_id, resource in rows if resource == versioning.SETTINGS}
+        self._advance({seq for seq, _, _ in rows}, time.monotonic())
+        if user_ids:
+            self.cache.invalidate(user_ids, source="poll")
+        return len(user_ids)
+
+    def _advance(self, present: Set[int], now: float):
+        top = max(present, default=self.last_seq)
+        for seq in range(self.last_seq + 1, top):
+            if seq not in present:
+                self._gaps[seq] = now
+        self.last_seq = max(top, self.last_seq)
+        self._gaps = {
+            seq: since for seq, since in self._gaps.items()
+            if seq not in present and now - since < self.gap_timeout
+        }
+
+    async def _run_forever(self, interval: float):
+        while True:
+            try:
+                await asyncio.to_thread(self.poll_once)
+            except Exception:
+                logger.exception("Settings invalidation poll failed")
+            await asyncio.sleep(interval)
+
+    def start(self, interval: float = SETTINGS_CACHE_POLL_INTERVAL):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_forever(interval))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+settings_invalidation = SettingsInvalidationPoller()
@@ -0,0 +1,50 @@
+# backend/app/services/url_safety.py
+from typing import Collection
+from urllib.parse import urlsplit
+import asyncio
+import ipaddress
+import os
+import socket
+
+import httpx
+
+# Configuration
+# Comma-separated hosts users may point feeds and webhooks at even though they
+# resolve to private addresses (e.g. an intranet feed server)
+OUTBOUND_ALLOWED_HOSTS = frozenset(
+    host.strip().lower() for host in os.getenv("OUTBOUND_ALLOWED_HOSTS", "").split(",") if host.strip()
+)
+
+
+class UnsafeURL(ValueError):
+    """A user-supplied URL that the server must not request."""
+
+
+def check_public_url(url: str, allowed_hosts: Collection[str] = OUTBOUND_ALLOWED_HOSTS):
+    """
+    Raise UnsafeURL unless ``url`` is http(s) and its host resolves only to
+    public addresses, so users can't make the server reach loopback, private
+    networks or cloud metadata endpoints.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise UnsafeURL("Only http(s) URLs are allowed")
+    host = parts.hostname.lower()
+    if host in allowed_hosts:
+        return
+    try:
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, port, proto=socket.IPPROTO_TCP)}
+    except (socket.gaierror, UnicodeError, ValueError):
+        raise UnsafeURL(f"Cannot resolve {host}")
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split("%", 1)[0])
+        if not ip.is_global or ip.is_multicast:
+            raise UnsafeURL(f"{host} resolves to a non-public address")
+
+
+def public_url_guard(allowed_hosts: Collection[str] = OUTBOUND_ALLOWED_HOSTS):
+    """httpx request hook running check_public_url before every request, redirects included."""
+    async def guard(request: httpx.Request):
+        await asyncio.to_thread(check_public_url, str(request.url), allowed_hosts)
+    return guard
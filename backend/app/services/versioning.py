@@ -0,0 +1,92 @@
+# backend/app/services/versioning.py
+from typing import Optional
+import hashlib
+
+from fastapi import Request, Response
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app import models
+
+# Resources with their own per-user change counter
+TASKS = "tasks"
+TIMER = "timer"
+FEEDS = "feeds"
+SETTINGS = "settings"
+AUTOMATION = "automation"
+READING = "reading"
+
+
+def get_version(db: Session, user_id: int, resource: str) -> int:
+    """Current change version of a user's resource (0 if never modified)."""
+    version = db.query(models.ResourceVersion.version).filter(
+        models.ResourceVersion.user_id == user_id,
+        models.ResourceVersion.resource == resource
+    ).scalar()
+    return version or 0
+
+
+def bump_version(db: Session, user_id: int, resource: str):
+    """Increment a user's resource version. Call before the mutation's commit."""
+    updated = db.query(models.ResourceVersion).filter(
+        models.ResourceVersion.user_id == user_id,
+        models.ResourceVersion.resource == resource
+    ).update({models.ResourceVersion.version: models.ResourceVersion.version + 1},
+             synchronize_session=False)
+    if updated:
+        return
+
+    # First mutation of this resource: create the counter. A concurrent request
+    # may have just done the same, in which case we fall back to the update.
+    try:
+        with db.begin_nested():
+            db.add(models.ResourceVersion(user_id=user_id, resource=resource, version=1))
+    except IntegrityError:
+        db.query(models.ResourceVersion).filter(
+            models.ResourceVersion.user_id == user_id,
+            models.ResourceVersion.resource == resource
+        ).update({models.ResourceVersion.version: models.ResourceVersion.version + 1},
+                 synchronize_session=False)
+
+
+def make_etag(user_id: int, resource: str, version: int, variant: str = "") -> str:
+    """Weak ETag for one representation of a versioned resource."""
+    variant_hash = hashlib.blake2s(variant.encode("utf-8"), digest_size=6).hexdigest()
+    return f'W/"{resource}-{user_id}-{version}-{variant_hash}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in [tag.strip() for tag in if_none_match.split(",")]
+
+
+def check_not_modified(
+    request: Request,
+    response: Response,
+    db: Optional[Session],
+    user_id: int,
+    resource: str,
+    variant: Optional[str] = None,
+    version: Optional[int] = None
+) -> Optional[Response]:
+    """
+    Conditional GET support. Returns a ready 304 response when the client's
+    If-None-Match still matches, otherwise sets the ETag on ``response`` and
+    returns None so the endpoint can run its query. Pass ``version`` when it
+    is already known (e.g. cached) to skip reading it from ``db``.
+    """
+    if variant is None:
+        # Different filters/pages of the same resource are different representations
+        variant = f"{request.url.path}?{request.url.query}"
+    if version is None:
+        version = get_version(db, user_id, resource)
+    etag = make_etag(user_id, resource, version, variant)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -1,34 +1,147 @@
 # backend/app/services/websocket_manager.py
 from fastapi import WebSocket
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Union
 import json
 import asyncio
 
+from app.metrics import registry
+
+try:
+    import msgpack  # Optional: compact binary frames for clients that ask for it
+except ImportError:  # pragma: no cover - msgpack is an optional dependency
+    msgpack = None
+
+# Supported wire encodings, negotiated through the Sec-WebSocket-Protocol header.
+# "json" is always available and is the default for clients that don't ask.
+ENCODING_JSON = "json"
+ENCODING_MSGPACK = "msgpack"
+SUPPORTED_ENCODINGS = [ENCODING_MSGPACK, ENCODING_JSON] if msgpack else [ENCODING_JSON]
+
+websocket_connects_total = registry.counter(
+    "websocket_connects_total", "WebSocket connections accepted.", ("encoding",)
+)
+websocket_messages_sent_total = registry.counter(
+    "websocket_messages_sent_total", "Frames sent to WebSocket clients.", ("encoding",)
+)
+websocket_bad_frames_total = registry.counter(
+    "websocket_bad_frames_total", "Received frames ignored because they couldn't be decoded."
+)
+websocket_send_failures_total = registry.counter(
+    "websocket_send_failures_total", "Sends that failed and dropped the connection."
+)
+
+
+def encode_message(message: Union[dict, str], encoding: str) -> Union[str, bytes]:
+    """Serialize a message for the given wire encoding."""
+    if encoding == ENCODING_MSGPACK:
+        if isinstance(message, str):
+            message = json.loads(message)
+        return msgpack.packb(message, use_bin_type=True, default=str)
+    if isinstance(message, str):
+        return message
+    return json.dumps(message, separators=(",", ":"), default=str)
+
+
+def decode_message(frame: dict, encoding: str) -> dict:
+    """
+    Parse a received frame with the connection's negotiated encoding.
+    Raises ValueError for frames that don't hold a message object.
+    """
+    data = frame.get("bytes")
+    if data is None:
+        data = frame.get("text")
+    if not data:
+        raise ValueError("Empty frame")
+    try:
+        if encoding == ENCODING_MSGPACK and isinstance(data, bytes):
+            message = msgpack.unpackb(data, raw=False)
+        else:
+            message = json.loads(data)
+    except Exception as e:
+        raise ValueError(f"Malformed {encoding} frame: {e}") from e
+    if not isinstance(message, dict):
+        raise ValueError("Frames must hold a message object")
+    return message
+
+
+class EncodedMessage:
+    """A message serialized at most once per encoding, shared by all recipients."""
+
+    __slots__ = ("message", "_frames")
+
+    def __init__(self, message: Union[dict, str]):
+        self.message = message
+        self._frames: Dict[str, Union[str, bytes]] = {}
+
+    def frame(self, encoding: str) -> Union[str, bytes]:
+        frame = self._frames.get(encoding)
+        if frame is None:
+            frame = encode_message(self.message, encoding)
+            self._frames[encoding] = frame
+        return frame
+
+
 class ConnectionManager:
     def __init__(self):
         # Store active connections by client_id (usually user_id)
         self.active_connections: Dict[str, WebSocket] = {}
-        
+        # Negotiated wire encoding per connection
+        self.connection_encodings: Dict[str, str] = {}
+
+    @staticmethod
+    def negotiate_encoding(websocket: WebSocket) -> Optional[str]:
+        """Pick the first subprotocol offered by the client that we support."""
+        for offered in websocket.scope.get("subprotocols", []):
+            if offered in SUPPORTED_ENCODINGS:
+                return offered
+        return None
+
     async def connect(self, websocket: WebSocket, client_id: str):
-        await websocket.accept()
+        subprotocol = self.negotiate_encoding(websocket)
+        # permessage-deflate is negotiated by the server (uvicorn) during the handshake
+        await websocket.accept(subprotocol=subprotocol)
         self.active_connections[client_id] = websocket
-        
+        self.connection_encodings[client_id] = subprotocol or ENCODING_JSON
+        websocket_connects_total.inc(encoding=subprotocol or ENCODING_JSON)
+
     def disconnect(self, client_id: str):
         if client_id in self.active_connections:
             del self.active_connections[client_id]
-            
-    async def send_personal_message(self, message: str, client_id: str):
-        if client_id in self.active_connections:
-            try:
-                await self.active_connections[client_id].send_text(message)
-            except:
-                # Connection might be closed, remove it
-                self.disconnect(client_id)
-                
-    async def broadcast_message(self, message: str):
-        for client_id in list(self.active_connections.keys()):
-            await self.send_personal_message(message, client_id)
-            
+        self.connection_encodings.pop(client_id, None)
+
+    def get_encoding(self, client_id: str) -> str:
+        return self.connection_encodings.get(client_id, ENCODING_JSON)
+
+    async def _send_frame(self, client_id: str, encoded: EncodedMessage):
+        websocket = self.active_connections.get(client_id)
+        if websocket is None:
+            return
+        encoding = self.get_encoding(client_id)
+        frame = encoded.frame(encoding)
+        try:
+            if encoding == ENCODING_JSON:
+                await websocket.send_text(frame)
+            else:
+                await websocket.send_bytes(frame)
+            websocket_messages_sent_total.inc(encoding=encoding)
+        except:
+            # Connection might be closed, remove it
+            websocket_send_failures_total.inc()
+            self.disconnect(client_id)
+
+    async def send_personal_message(self, message: Union[dict, str], client_id: str):
+        await self._send_frame(client_id, EncodedMessage(message))
+
+    async def send_to_many(self, message: Union[dict, str], client_ids: Iterable[str]):
+        """Fan a message out to several clients, serializing it once per encoding."""
+        encoded = EncodedMessage(message)
+        client_ids = [c for c in client_ids if c in self.active_connections]
+        if client_ids:
+            await asyncio.gather(*(self._send_frame(c, encoded) for c in client_ids))
+
+    async def broadcast_message(self, message: Union[dict, str]):
+        await self.send_to_many(message, list(self.active_connections.keys()))
+
     async def send_timer_update(self, client_id: str, timer_data: dict):
         """Send timer update to specific user."""
         message = {
@@ -36,8 +149,8 @@ class ConnectionManager:
             "data": timer_data,
             "timestamp": timer_data.get("current_time")
         }
-        await self.send_personal_message(json.dumps(message), client_id)
-        
+        await self.send_personal_message(message, client_id)
+
     async def send_notification(self, client_id: str, notification: dict):
         """Send notification to specific user."""
         message = {
@@ -45,8 +158,17 @@ class ConnectionManager:
             "data": notification,
             "timestamp": notification.get("timestamp")
         }
-        await self.send_personal_message(json.dumps(message), client_id)
-        
+        await self.send_personal_message(message, client_id)
+
+    async def send_notification_many(self, client_ids: Iterable[str], notification: dict):
+        """Send the same notification to several users."""
+        message = {
+            "type": "notification",
+            "data": notification,
+            "timestamp": notification.get("timestamp")
+        }
+        await self.send_to_many(message, client_ids)
+
     async def send_ai_response_stream(self, client_id: str, response_chunk: str, is_final: bool = False):
         """Send streaming AI response to specific user."""
         message = {
@@ -56,12 +178,21 @@ class ConnectionManager:
                 "is_final": is_final
             }
         }
-        await self.send_personal_message(json.dumps(message), client_id)
-        
+        await self.send_personal_message(message, client_id)
+
     def get_connected_users(self) -> List[str]:
         """Get list of currently connected user IDs."""
         return list(self.active_connections.keys())
-        
+
     def is_user_connected(self, client_id: str) -> bool:
         """Check if a specific user is connected."""
-        return client_id in self.active_connections
\ No newline at end of file
+        return client_id in self.active_connections
+
+
+# Shared by the WebSocket endpoint and background services that push to clients
+manager = ConnectionManager()
+
+registry.gauge(
+    "websocket_connections", "Open WebSocket connections in this worker.",
+    function=lambda: len(manager.active_connections)
+)
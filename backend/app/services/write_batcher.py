@@ -0,0 +1,203 @@
+# backend/app/services/write_batcher.py
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db import DATABASE_URL, engine
+from app.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+# Off by default: every write commits on its own, as before
+WRITE_BATCHING_ENABLED = os.getenv("WRITE_BATCHING_ENABLED", "false").lower() == "true"
+# How long the first write of a batch waits for others to join (milliseconds)
+WRITE_BATCH_WINDOW_MS = float(os.getenv("WRITE_BATCH_WINDOW_MS", "2"))
+# Writes per transaction at most
+WRITE_BATCH_MAX_SIZE = int(os.getenv("WRITE_BATCH_MAX_SIZE", "100"))
+
+write_batches_total = registry.counter(
+    "write_batches_total", "Group-committed write transactions."
+)
+write_batch_size = registry.histogram(
+    "write_batch_size", "Writes per group commit.", buckets=(1, 2, 4, 8, 16, 32, 64, 128)
+)
+
+
+@dataclass
+class PendingWrite:
+    work: Callable[[Session], Any]
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Any = None
+    error: Optional[BaseException] = None
+
+
+def _session_factory():
+    if not DATABASE_URL.startswith("sqlite"):
+        return sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    # pysqlite defers BEGIN until the first write, so the first SAVEPOINT would
+    # open (and its RELEASE commit) the transaction on its own. This engine
+    # hands transaction control to SQLAlchemy, which emits BEGIN itself.
+    batch_engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+
+    @event.listens_for(batch_engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(batch_engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    return sessionmaker(bind=batch_engine, autoflush=False, expire_on_commit=False)
+
+
+class WriteBatcher:
+    """
+    Group commit for small, frequent mutations (toggling a task, marking a feed
+    item read, ending a timer session). Writes that arrive within a few
+    milliseconds of each other run on one dedicated thread in one transaction,
+    each inside its own SAVEPOINT, and are committed together: one fsync for
+    the batch instead of one per request.
+
+    ``work(db)`` does the mutation; an exception it raises rolls back only its
+    savepoint and is re-raised to that caller. The session is shared and
+    closed after the batch, so ``work`` returns plain data (e.g. a response
+    schema built after ``db.flush()``) rather than ORM objects; that also
+    pins each caller's result to the state right after its own write. Side
+    effects that must follow the commit (events, notifications) belong to
+    the caller, after submit() returns. If the commit itself fails, every
+    write in the batch gets that error.
+    """
+
+    def __init__(
+        self,
+        window_ms: float = WRITE_BATCH_WINDOW_MS,
+        max_size: int = WRITE_BATCH_MAX_SIZE,
+        session_factory=None
+    ):
+        self.window = window_ms / 1000
+        self.max_size = max_size
+        self.session_factory = session_factory
+        self.stats = {"writes": 0, "batches": 0, "failed_writes": 0, "failed_batches": 0}
+        self._queue: "queue.Queue[Optional[PendingWrite]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def submit(self, work: Callable[[Session], Any]):
+        """Queue a write and block until its batch is committed. Returns work(db)."""
+        pending = PendingWrite(work)
+        self._queue.put(pending)
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def _collect(self, first: PendingWrite) -> List[PendingWrite]:
+        batch = [first]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_size:
+            try:
+                timeout = deadline - time.monotonic()
+                pending = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if pending is None:
+                # Stop after this batch
+                self._queue.put(None)
+                break
+            batch.append(pending)
+        return batch
+
+    def _commit_batch(self, batch: List[PendingWrite]):
+        db = self.session_factory()
+        try:
+            for pending in batch:
+                try:
+                    with db.begin_nested():
+                        pending.result = pending.work(db)
+                except Exception as e:
+                    pending.error = e
+            db.commit()
+            self.stats["batches"] += 1
+            write_batches_total.inc()
+            write_batch_size.observe(len(batch))
+        except Exception as e:
+            logger.exception("Group commit of %d writes failed", len(batch))
+            db.rollback()
+            self.stats["failed_batches"] += 1
+            for pending in batch:
+                if pending.error is None:
+                    pending.error = e
+        finally:
+            db.close()
+            self.stats["writes"] += len(batch)
+            self.stats["failed_writes"] += sum(1 for pending in batch if pending.error is not None)
+            for pending in batch:
+                pending.done.set()
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            self._commit_batch(self._collect(first))
+
+    def _drain(self):
+        # Writes submitted while stop() was joining the thread
+        while True:
+            try:
+                pending = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if pending is not None:
+                self._commit_batch([pending])
+
+    def get_stats(self) -> dict:
+        batches = self.stats["batches"] + self.stats["failed_batches"]
+        return {
+            **self.stats,
+            "queued": self._queue.qsize(),
+            "mean_batch_size": round(self.stats["writes"] / batches, 2) if batches else 0
+        }
+
+    def start(self):
+        if self._thread is None:
+            if self.session_factory is None:
+                self.session_factory = _session_factory()
+            self._thread = threading.Thread(target=self._run, name="write-batcher", daemon=True)
+            self._thread.start()
+
+    async def stop(self):
+        if self._thread is not None:
+            # Writes queued before the sentinel are still committed
+            self._queue.put(None)
+            await asyncio.to_thread(self._thread.join)
+            self._thread = None
+            await asyncio.to_thread(self._drain)
+
+
+write_batcher = WriteBatcher()
+
+
+def run_write(db: Session, work: Callable[[Session], Any]):
+    """
+    Run a small mutation and commit it: through the group-commit batcher when
+    it is running, otherwise on the request's own session. Returns work(db).
+    """
+    if write_batcher.running:
+        return write_batcher.submit(work)
+    result = work(db)
+    db.commit()
+    return result
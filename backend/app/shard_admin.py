@@ -0,0 +1,314 @@
+# backend/app/shard_admin.py
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import argparse
+import json
+import os
+import sqlite3
+
+from sqlalchemy import func, select, update
+from sqlalchemy.engine import Connection, Engine
+
+from app.db import Base, engine as directory_engine
+from app import models
+from app.sharding import SHARD_COUNT, SHARD_DIR, bucket_for, shard_engines, shard_path
+from app.services.change_log import RESOURCE_MODELS
+from app.services.job_scheduler import AUTOMATION_RULE, TASK_REMINDER, TIMER_END
+
+ALEMBIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic")
+
+# Shared by every user of a database; copied by natural key, not owned by the user
+SHARED_KEYS = {"feed_sources": "url", "articles": "content_hash"}
+
+# Columns referencing rows of a table chosen by another column: (discriminator, reference, targets)
+POLYMORPHIC_REFS = {
+    "change_log": ("resource", "entity_id", {
+        resource: model.__tablename__ for resource, model in RESOURCE_MODELS.items()
+    }),
+    "scheduled_jobs": ("kind", "ref_id", {
+        TASK_REMINDER: "tasks", AUTOMATION_RULE: "automation_rules", TIMER_END: "timer_sessions"
+    }),
+}
+
+
+def _user_column(table):
+    for name in ("user_id", "owner_id"):
+        if name in table.c:
+            return table.c[name]
+    return None
+
+
+def user_tables():
+    """Tables holding per-user rows, in an order where references are copied before they're needed."""
+    tables = [t for t in Base.metadata.sorted_tables if t.name != "users" and _user_column(t) is not None]
+    return sorted(tables, key=lambda t: t.name in POLYMORPHIC_REFS)
+
+
+def _engine(shard: Optional[int]) -> Engine:
+    return directory_engine if shard is None else shard_engines.get(shard)
+
+
+def _name(shard: Optional[int]) -> str:
+    return "main" if shard is None else f"shard {shard}"
+
+
+# Migrations
+
+def migrate_engine(engine: Engine) -> str:
+    """Upgrade one database to the latest migration; returns its revision."""
+    from alembic import command
+    from alembic.config import Config
+
+    # No ini file: alembic.ini's logging setup would replace the caller's
+    config = Config()
+    config.set_main_option("script_location", ALEMBIC_DIR)
+    with engine.begin() as conn:
+        config.attributes["connection"] = conn
+        command.upgrade(config, "head")
+        return conn.exec_driver_sql("SELECT version_num FROM alembic_version").scalar()
+
+
+def migrate(shard_count: int = SHARD_COUNT, directory: str = SHARD_DIR) -> Dict[str, str]:
+    """Upgrade the main database and every shard, creating missing shard files."""
+    os.makedirs(directory, exist_ok=True)
+    revisions = {"main": migrate_engine(directory_engine)}
+    for shard in range(shard_count):
+        revisions[_name(shard)] = migrate_engine(shard_engines.get(shard))
+    return revisions
+
+
+def status(shard_count: int = SHARD_COUNT, directory: str = SHARD_DIR) -> Dict[str, dict]:
+    """Users and file size per database, plus users not on their bucket's shard."""
+    with directory_engine.connect() as conn:
+        users = dict(conn.execute(
+            select(models.User.shard, func.count()).group_by(models.User.shard)
+        ).all())
+    report = {"main": {"users": users.pop(None, 0)}}
+    for shard in sorted(set(range(shard_count)) | set(users)):
+        path = shard_path(shard, directory)
+        report[_name(shard)] = {
+            "users": users.get(shard, 0),
+            "bytes": os.path.getsize(path) if os.path.exists(path) else None,
+        }
+    report["misplaced_users"] = len(plan_rebalance(shard_count))
+    return report
+
+
+# Moving users
+
+def plan_rebalance(shard_count: int = SHARD_COUNT) -> List[Tuple[int, Optional[int], int]]:
+    """(user_id, current shard, bucket) for every user not on their bucket's shard."""
+    with directory_engine.connect() as conn:
+        users = conn.execute(select(models.User.id, models.User.shard).order_by(models.User.id)).all()
+    return [
+        (user_id, shard, bucket_for(user_id, shard_count))
+        for user_id, shard in users
+        if shard != bucket_for(user_id, shard_count)
+    ]
+
+
+class _UserCopy:
+    """Copies one user's rows between databases. Row ids are reassigned by the target."""
+
+    def __init__(self, source: Connection, target: Connection, user_id: int):
+        self.source = source
+        self.target = target
+        self.user_id = user_id
+        self.id_maps: Dict[str, Dict[int, int]] = {}
+
+    def shared_id(self, table_name: str, old_id: int) -> Optional[int]:
+        """Id of the target's copy of a shared row (feed source, article), inserting it if needed."""
+        id_map = self.id_maps.setdefault(table_name, {})
+        if old_id in id_map:
+            return id_map[old_id]
+        table = Base.metadata.tables[table_name]
+        row = self.source.execute(select(table).where(table.c.id == old_id)).mappings().first()
+        if row is None:
+            return None
+        key = table.c[SHARED_KEYS[table_name]]
+        new_id = self.target.execute(select(table.c.id).where(key == row[key.name])).scalar()
+        if new_id is None:
+            values = {name: value for name, value in row.items() if name != "id"}
+            for column in table.c:
+                for fk in column.foreign_keys:
+                    if values[column.name] is not None:
+                        values[column.name] = self.shared_id(fk.column.table.name, values[column.name])
+            new_id = self.target.execute(table.insert().values(**values)).inserted_primary_key[0]
+        id_map[old_id] = new_id
+        return new_id
+
+    def _remap(self, table, row: dict) -> Optional[dict]:
+        """Point the row's references at the target's ids; None if a required one is gone."""
+        for column in table.c:
+            value = row[column.name]
+            if value is None:
+                continue
+            for fk in column.foreign_keys:
+                target_table = fk.column.table.name
+                if target_table in ("users", table.name):
+                    continue
+                if target_table in SHARED_KEYS:
+                    new_id = self.shared_id(target_table, value)
+                else:
+                    new_id = self.id_maps.get(target_table, {}).get(value)
+                if new_id is None and not column.nullable:
+                    return None
+                row[column.name] = new_id
+        if table.name in POLYMORPHIC_REFS:
+            discriminator, reference, targets = POLYMORPHIC_REFS[table.name]
+            new_id = self.id_maps.get(targets.get(row[discriminator]), {}).get(row[reference])
+            if new_id is None:
+                # Tombstones and jobs of deleted rows: nothing to point at
+                return None
+            row[reference] = new_id
+        return row
+
+    def copy_table(self, table) -> int:
+        rows = self.source.execute(
+            select(table).where(_user_column(table) == self.user_id).order_by(*table.primary_key.columns)
+        ).mappings().all()
+        if not rows:
+            return 0
+        pk = list(table.primary_key.columns)
+        if len(pk) != 1 or pk[0] is _user_column(table):
+            # Keyed by user (resource versions, feed counters): copied as is
+            self.target.execute(table.insert(), [dict(row) for row in rows])
+            return len(rows)
+
+        pk = pk[0]
+        self_refs = [c for c in table.c if any(fk.column.table is table for fk in c.foreign_keys)]
+        old_ids, values, deferred = [], [], []
+        for row in rows:
+            row = self._remap(table, dict(row))
+            if row is None:
+                continue
+            old_ids.append(row.pop(pk.name))
+            # References within the table are set once every row has its new id
+            deferred.append({c.name: row[c.name] for c in self_refs})
+            for column in self_refs:
+                row[column.name] = None
+            values.append(row)
+        if not values:
+            return 0
+        new_ids = self.target.execute(
+            table.insert().returning(pk, sort_by_parameter_order=True), values
+        ).scalars().all()
+        id_map = self.id_maps.setdefault(table.name, {})
+        id_map.update(zip(old_ids, new_ids))
+
+        for new_id, refs in zip(new_ids, deferred):
+            refs = {name: id_map.get(value) for name, value in refs.items() if value is not None}
+            if refs:
+                self.target.execute(update(table).where(pk == new_id).values(**refs))
+        return len(values)
+
+
+def _delete_user_rows(conn: Connection, user_id: int):
+    for table in reversed(user_tables()):
+        conn.execute(table.delete().where(_user_column(table) == user_id))
+
+
+def move_user(user_id: int, target: Optional[int]) -> Dict[str, int]:
+    """
+    Move a user's data to another shard (None: the main database) and point
+    the directory at it. Run with the API stopped, or at least while the user
+    is inactive: writes landing on the old shard during the copy are lost.
+
+    Ids are reassigned in the target, so the user's clients must sync from
+    scratch (since=0) afterwards; ETag-cached reads revalidate because resource
+    versions are bumped.
+    """
+    with directory_engine.connect() as conn:
+        source = conn.execute(select(models.User.shard).where(models.User.id == user_id)).one()[0]
+    if source == target:
+        return {}
+
+    counts = {}
+    with _engine(source).connect() as source_conn, _engine(target).begin() as target_conn:
+        # Leftovers of an interrupted move: the user isn't routed here yet
+        _delete_user_rows(target_conn, user_id)
+        copy = _UserCopy(source_conn, target_conn, user_id)
+        for table in user_tables():
+            counts[table.name] = copy.copy_table(table)
+        versions = models.ResourceVersion.__table__
+        target_conn.execute(
+            update(versions).where(versions.c.user_id == user_id).values(version=versions.c.version + 1)
+        )
+
+    # The switch: from here on the user's requests go to the target
+    with directory_engine.begin() as conn:
+        conn.execute(update(models.User.__table__).where(models.User.id == user_id).values(shard=target))
+
+    with _engine(source).begin() as conn:
+        _delete_user_rows(conn, user_id)
+    return counts
+
+
+def rebalance(shard_count: int = SHARD_COUNT, dry_run: bool = False) -> dict:
+    """Move every user to their bucket's shard, e.g. after changing SHARD_COUNT or turning sharding on."""
+    plan = plan_rebalance(shard_count)
+    moves = [{"user_id": user_id, "from": _name(source), "to": _name(target)} for user_id, source, target in plan]
+    if not dry_run:
+        for move, (user_id, _, target) in zip(moves, plan):
+            move["rows"] = sum(move_user(user_id, target).values())
+    return {"moved": 0 if dry_run else len(moves), "moves": moves}
+
+
+# Backups
+
+def _backup_file(source_path: str, destination_path: str):
+    # SQLite's online backup: a consistent copy while the API keeps writing
+    source = sqlite3.connect(source_path)
+    destination = sqlite3.connect(destination_path)
+    try:
+        with destination:
+            source.backup(destination)
+    finally:
+        destination.close()
+        source.close()
+
+
+def backup(destination: str, shard_count: int = SHARD_COUNT, directory: str = SHARD_DIR) -> Dict[str, str]:
+    """Copy the main database (if SQLite) and every shard into a timestamped folder."""
+    target_dir = os.path.join(destination, datetime.utcnow().strftime("%Y%m%dT%H%M%S"))
+    os.makedirs(target_dir)
+    copied = {}
+    if directory_engine.dialect.name == "sqlite":
+        path = directory_engine.url.database
+        copied["main"] = os.path.join(target_dir, os.path.basename(path))
+        _backup_file(path, copied["main"])
+    for shard in range(shard_count):
+        path = shard_path(shard, directory)
+        if os.path.exists(path):
+            copied[_name(shard)] = os.path.join(target_dir, os.path.basename(path))
+            _backup_file(path, copied[_name(shard)])
+    return copied
+
+
+if __name__ == "__main__":
+    # python -m app.shard_admin migrate|status|rebalance|move|backup
+    parser = argparse.ArgumentParser(description="Manage sharded storage (SHARDING_ENABLED)")
+    parser.add_argument("--shards", type=int, default=SHARD_COUNT, help="shard count (default SHARD_COUNT)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("migrate", help="upgrade the main database and all shards, creating missing ones")
+    commands.add_parser("status", help="users and size per shard")
+    rebalance_parser = commands.add_parser("rebalance", help="move users to their bucket's shard")
+    rebalance_parser.add_argument("--dry-run", action="store_true")
+    move_parser = commands.add_parser("move", help="move one user")
+    move_parser.add_argument("--user-id", type=int, required=True)
+    move_parser.add_argument("--to", required=True, help="shard number, or 'main'")
+    backup_parser = commands.add_parser("backup", help="online copy of every database file")
+    backup_parser.add_argument("destination")
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        result = migrate(args.shards)
+    elif args.command == "status":
+        result = status(args.shards)
+    elif args.command == "rebalance":
+        result = rebalance(args.shards, args.dry_run)
+    elif args.command == "move":
+        result = move_user(args.user_id, None if args.to == "main" else int(args.to))
+    else:
+        result = backup(args.destination, args.shards)
+    print(json.dumps(result, indent=2))
@@ -0,0 +1,148 @@
+# backend/app/sharding.py
+from collections import OrderedDict
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Optional
+import os
+import threading
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db import SchemaOutOfDate, SessionLocal, check_schema_version, create_db_engine
+from app import models
+from app.metrics import registry
+
+# Configuration
+# SQLite serializes writers per file. With sharding each user's data lives in
+# one of SHARD_COUNT shard files; the main database (DATABASE_URL) becomes the
+# directory holding the users table and each user's shard. New users are
+# placed by hash bucket and pinned there (users.shard), so changing
+# SHARD_COUNT only affects new users until `python -m app.shard_admin
+# rebalance` moves the rest. Users with shard NULL stay in the main database.
+# Off by default: everything lives in DATABASE_URL, as before
+SHARDING_ENABLED = os.getenv("SHARDING_ENABLED", "false").lower() == "true"
+# Buckets new users are spread over
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "16"))
+# Where the shard files live
+SHARD_DIR = os.getenv("SHARD_DIR", "./shards")
+# Shard engines (each with its own connection pool) kept open at once
+SHARD_ENGINE_CACHE_SIZE = int(os.getenv("SHARD_ENGINE_CACHE_SIZE", "32"))
+
+shard_engines_opened_total = registry.counter(
+    "shard_engines_opened_total", "Shard engines created, including reopens after eviction."
+)
+shard_engines_evicted_total = registry.counter(
+    "shard_engines_evicted_total", "Shard engines disposed to stay within SHARD_ENGINE_CACHE_SIZE."
+)
+
+
+def shard_path(shard: int, directory: str = SHARD_DIR) -> str:
+    return os.path.join(directory, f"shard-{shard:03d}.db")
+
+
+def shard_url(shard: int, directory: str = SHARD_DIR) -> str:
+    return f"sqlite:///{os.path.abspath(shard_path(shard, directory))}"
+
+
+def bucket_for(user_id: int, shard_count: int = SHARD_COUNT) -> int:
+    return user_id % shard_count
+
+
+def create_shard_engine(shard: int, directory: str = SHARD_DIR, **kwargs) -> Engine:
+    return create_db_engine(shard_url(shard, directory), **kwargs)
+
+
+_ShardSession = sessionmaker(autocommit=False, autoflush=False)
+
+
+class ShardEngines:
+    """
+    Bounded LRU of shard engines. An engine is created on first use of its
+    shard; past ``max_open`` the least recently used one is disposed, which
+    closes its idle connections. Sessions still using it finish normally and
+    the next use of that shard creates a fresh engine.
+    """
+
+    def __init__(self, directory: str = SHARD_DIR, max_open: int = SHARD_ENGINE_CACHE_SIZE):
+        self.directory = directory
+        self.max_open = max_open
+        # Called with every new engine, e.g. to instrument it
+        self.on_open: List[Callable[[Engine], None]] = []
+        self._engines: "OrderedDict[int, Engine]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, shard: int) -> Engine:
+        with self._lock:
+            engine = self._engines.get(shard)
+            if engine is not None:
+                self._engines.move_to_end(shard)
+                return engine
+            # create_engine doesn't connect, so this is cheap to do under the lock
+            engine = create_shard_engine(shard, self.directory)
+            for hook in self.on_open:
+                hook(engine)
+            self._engines[shard] = engine
+            shard_engines_opened_total.inc()
+            while len(self._engines) > self.max_open:
+                _, evicted = self._engines.popitem(last=False)
+                evicted.dispose()
+                shard_engines_evicted_total.inc()
+            return engine
+
+    def session(self, shard: int, **kwargs) -> Session:
+        return _ShardSession(bind=self.get(shard), **kwargs)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._engines)
+
+    def dispose(self):
+        with self._lock:
+            engines, self._engines = list(self._engines.values()), OrderedDict()
+        for engine in engines:
+            engine.dispose()
+
+
+shard_engines = ShardEngines()
+
+
+def shard_session(shard: Optional[int], **kwargs) -> Session:
+    """A session on one shard; shard None is the main database."""
+    if shard is None:
+        return SessionLocal(**kwargs)
+    return shard_engines.session(shard, **kwargs)
+
+
+def session_factory_for(shard: Optional[int]) -> Callable[..., Session]:
+    """session_factory for services that work on a single shard."""
+    if shard is None:
+        return SessionLocal
+    return partial(shard_session, shard)
+
+
+def user_shards(user_ids: Iterable[int]) -> Dict[int, Optional[int]]:
+    """Shard of each user, read from the directory."""
+    user_ids = list(user_ids)
+    if not user_ids:
+        return {}
+    db = SessionLocal()
+    try:
+        return dict(db.query(models.User.id, models.User.shard).filter(models.User.id.in_(user_ids)))
+    finally:
+        db.close()
+
+
+def check_shard_schemas(shard_count: int = SHARD_COUNT, directory: str = SHARD_DIR) -> List[str]:
+    """Startup check that every shard file exists and is at the latest migration."""
+    revisions = []
+    for shard in range(shard_count):
+        if not os.path.exists(shard_path(shard, directory)):
+            raise SchemaOutOfDate(
+                f"Shard file {shard_path(shard, directory)} is missing; run `python -m app.shard_admin migrate`"
+            )
+        engine = create_shard_engine(shard, directory)
+        try:
+            revisions.append(check_schema_version(engine, hint="python -m app.shard_admin migrate"))
+        finally:
+            engine.dispose()
+    return revisions
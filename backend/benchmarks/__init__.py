@@ -0,0 +1,2 @@
+# backend/benchmarks/__init__.py
+# Empty file to make benchmarks a package
@@ -0,0 +1,328 @@
+# backend/benchmarks/bench_api.py
+"""
+Latency and throughput of every router against a seeded database.
+
+Each scenario (one endpoint, e.g. "tasks.list") gets a few warmup requests
+and then --requests timed requests at --concurrency. Results (p50/p95/p99,
+mean, throughput, errors) are written as JSON and can be compared with a
+stored baseline; regressions beyond --tolerance are flagged.
+
+The app runs either in-process through httpx's ASGI transport (--mode asgi,
+no network or server overhead) or as a real multi-worker uvicorn server
+(--mode uvicorn --workers 4). Each run works on a fresh copy of the seeded
+database, so write scenarios don't skew later runs.
+
+Run from the backend directory:
+    python -m benchmarks.bench_api --tasks 10000
+    python -m benchmarks.bench_api --db /tmp/bench-1m.db --mode uvicorn --workers 4
+    python -m benchmarks.bench_api --only tasks feeds --save-baseline benchmarks/results/baseline.json
+    python -m benchmarks.bench_api --baseline benchmarks/results/baseline.json --fail-on-regression
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from benchmarks import seed as seeding
+from benchmarks.common import BACKEND_DIR, summarize
+
+RESULTS_DIR = os.path.join(BACKEND_DIR, "benchmarks", "results")
+
+APP_ENV = {
+    "SQL_ECHO": "false",
+    # Background services would compete with the measured requests
+    "FEED_INGESTION_ENABLED": "false",
+    "MAINTENANCE_ENABLED": "false",
+    "RECURRENCE_ENABLED": "false",
+    "SCHEDULER_ENABLED": "false",
+}
+
+
+def _pick(ids, rng):
+    return rng.choice(ids) if ids else 0
+
+
+# (name, method, request builder(ctx, rng) -> (url, request kwargs))
+SCENARIOS = [
+    ("health", "GET", lambda ctx, rng: ("/health", {})),
+    ("auth.me", "GET", lambda ctx, rng: ("/api/auth/me", {})),
+    ("auth.login", "POST", lambda ctx, rng: ("/api/auth/login", {"json": ctx["credentials"]})),
+    ("tasks.list", "GET", lambda ctx, rng: ("/api/tasks/", {"params": {"limit": 50, "skip": rng.randint(0, 500)}})),
+    ("tasks.list_filtered", "GET", lambda ctx, rng: ("/api/tasks/", {
+        "params": {"limit": 50, "completed": "false", "priority": rng.choice(seeding.PRIORITIES)}
+    })),
+    ("tasks.today", "GET", lambda ctx, rng: ("/api/tasks/today", {})),
+    ("tasks.overdue", "GET", lambda ctx, rng: ("/api/tasks/overdue", {})),
+    ("tasks.next", "GET", lambda ctx, rng: ("/api/tasks/next", {"params": {"limit": 10}})),
+    ("tasks.stats", "GET", lambda ctx, rng: ("/api/tasks/stats", {})),
+    ("tasks.get", "GET", lambda ctx, rng: (f"/api/tasks/{_pick(ctx['task_ids'], rng)}", {})),
+    ("tasks.projects", "GET", lambda ctx, rng: ("/api/tasks/projects/list", {})),
+    ("tasks.create", "POST", lambda ctx, rng: ("/api/tasks/", {
+        "json": {"title": f"Bench task {rng.random():.6f}", "priority": rng.choice(seeding.PRIORITIES)}
+    })),
+    ("tasks.toggle", "POST", lambda ctx, rng: (f"/api/tasks/{_pick(ctx['task_ids'], rng)}/toggle", {})),
+    ("timer.sessions", "GET", lambda ctx, rng: ("/api/timer/sessions", {"params": {"limit": 50}})),
+    ("timer.today", "GET", lambda ctx, rng: ("/api/timer/sessions/today", {})),
+    ("timer.daily_stats", "GET", lambda ctx, rng: ("/api/timer/stats/daily", {})),
+    ("timer.weekly_stats", "GET", lambda ctx, rng: ("/api/timer/stats/weekly", {})),
+    ("timer.start", "POST", lambda ctx, rng: ("/api/timer/sessions", {
+        "json": {"session_type": "pomodoro", "duration_planned": 1500}
+    })),
+    ("feeds.list", "GET", lambda ctx, rng: ("/api/feeds/", {"params": {"limit": 20}})),
+    ("feeds.list_unread", "GET", lambda ctx, rng: ("/api/feeds/", {"params": {"limit": 20, "unread_only": "true"}})),
+    ("feeds.stats", "GET", lambda ctx, rng: ("/api/feeds/stats", {})),
+    ("feeds.categories", "GET", lambda ctx, rng: ("/api/feeds/categories", {})),
+    ("feeds.mark_read", "PUT", lambda ctx, rng: (f"/api/feeds/{_pick(ctx['feed_ids'], rng)}", {
+        "json": {"is_read": rng.random() < 0.5}
+    })),
+    ("settings.get", "GET", lambda ctx, rng: ("/api/settings/", {})),
+    ("settings.widgets", "GET", lambda ctx, rng: ("/api/settings/widgets", {})),
+    ("sync.pull_recent", "GET", lambda ctx, rng: ("/api/sync/", {"params": {"since": ctx["watermark"]}})),
+    ("sync.pull_snapshot", "GET", lambda ctx, rng: ("/api/sync/", {"params": {"since": 0, "limit": 500}})),
+    ("automation.list", "GET", lambda ctx, rng: ("/api/automation/", {})),
+    ("automation.stats", "GET", lambda ctx, rng: ("/api/automation/stats", {})),
+    ("calendar.month", "GET", lambda ctx, rng: ("/api/calendar/", {
+        "params": {"start": ctx["month_start"], "end": ctx["month_end"], "tz": "Europe/Berlin"}
+    })),
+    ("plan.week", "GET", lambda ctx, rng: ("/api/plan/week", {"params": {"tz": "Europe/Berlin"}})),
+    ("reading.list", "GET", lambda ctx, rng: ("/api/reading/", {"params": {"limit": 20}})),
+    ("reading.progress", "PATCH", lambda ctx, rng: (f"/api/reading/{_pick(ctx['reading_ids'], rng)}/progress", {
+        "json": {"current_page": rng.randint(1, 300)}
+    })),
+]
+
+
+async def prepare(client) -> dict:
+    """Log in as the primary seeded user and collect ids for the scenarios."""
+    credentials = {"email": "bench0@example.com", "password": seeding.PASSWORD}
+    response = await client.post("/api/auth/login", json=credentials)
+    response.raise_for_status()
+    client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+
+    tasks = (await client.get("/api/tasks/", params={"limit": 500})).json()
+    feed_items = (await client.get("/api/feeds/", params={"limit": 200})).json()
+    reading_ids = []
+    for i in range(10):
+        item = await client.post("/api/reading/", json={"title": f"Bench book {i}", "total_pages": 300})
+        reading_ids.append(item.json()["id"])
+    await client.post("/api/automation/", json={
+        "name": "Bench rule",
+        "trigger_type": "task_completed",
+        "trigger_config": {"project": "Project 0"},
+        "action_type": "send_notification",
+        "action_config": {"message": "Done: {title}"},
+    })
+    sync = (await client.get("/api/sync/", params={"since": 0, "limit": 1})).json()
+    today = datetime.now().date()
+    return {
+        "credentials": credentials,
+        "task_ids": [t["id"] for t in tasks],
+        "feed_ids": [f["id"] for f in feed_items],
+        "reading_ids": reading_ids,
+        # Pull the last few hundred changes, like a client that was offline briefly
+        "watermark": max(0, sync.get("watermark", 0) - 200),
+        # The current month, as a calendar month view asks for it
+        "month_start": today.replace(day=1).isoformat(),
+        "month_end": (today.replace(day=1) + timedelta(days=32)).replace(day=1).isoformat(),
+    }
+
+
+async def run_scenario(client, ctx, name, method, build, args, rng) -> dict:
+    semaphore = asyncio.Semaphore(args.concurrency)
+    samples, errors = [], 0
+
+    async def one(record: bool):
+        nonlocal errors
+        url, kwargs = build(ctx, rng)
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            elapsed = (time.perf_counter() - start) * 1000
+        if not record:
+            return
+        if response.status_code >= 400:
+            errors += 1
+        samples.append(elapsed)
+
+    await asyncio.gather(*(one(False) for _ in range(args.warmup)))
+    started = time.perf_counter()
+    await asyncio.gather(*(one(True) for _ in range(args.requests)))
+    result = summarize(samples, time.perf_counter() - started)
+    result["errors"] = errors
+    return result
+
+
+async def run_all(client, args) -> dict:
+    ctx = await prepare(client)
+    rng = random.Random(args.seed)
+    results = {}
+    for name, method, build in SCENARIOS:
+        if args.only and name.split(".")[0] not in args.only:
+            continue
+        results[name] = await run_scenario(client, ctx, name, method, build, args, rng)
+        r = results[name]
+        print(f"  {name:<22} p50 {r['p50_ms']:>8.2f}  p95 {r['p95_ms']:>8.2f}  p99 {r['p99_ms']:>8.2f} ms"
+              f"  {r['throughput_per_s']:>8.1f}/s  errors {r['errors']}", file=sys.stderr)
+    return results
+
+
+async def run_asgi(args) -> dict:
+    import httpx
+    from app.main import app
+
+    # Run startup/shutdown like a server would
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            return await run_all(client, args)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run_uvicorn(args, env) -> dict:
+    import httpx
+
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(args.workers), "--log-level", "warning", "--no-access-log"],
+        cwd=BACKEND_DIR, env=env
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+            deadline = time.monotonic() + 60
+            while True:
+                try:
+                    if (await client.get("/health")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if server.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("uvicorn did not come up")
+                await asyncio.sleep(0.2)
+            return await run_all(client, args)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Print a comparison table; returns the scenarios that regressed."""
+    regressions = []
+    print(f"\n{'scenario':<22} {'p95 base':>10} {'p95 now':>10} {'Δp95':>8} {'rps base':>10} {'rps now':>10} {'Δrps':>8}")
+    for name, current in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None:
+            print(f"{name:<22} {'(new)':>10}")
+            continue
+        p95_change = (current["p95_ms"] - previous["p95_ms"]) / previous["p95_ms"] if previous["p95_ms"] else 0
+        rps_change = ((current["throughput_per_s"] - previous["throughput_per_s"]) / previous["throughput_per_s"]
+                      if previous["throughput_per_s"] else 0)
+        regressed = p95_change > tolerance or rps_change < -tolerance
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<22} {previous['p95_ms']:>10.2f} {current['p95_ms']:>10.2f} {p95_change:>+8.1%} "
+              f"{previous['throughput_per_s']:>10.1f} {current['throughput_per_s']:>10.1f} {rps_change:>+8.1%}"
+              f"{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                              capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", help="seeded database to use (created with the seed options if missing)")
+    seeding.add_arguments(parser)
+    parser.add_argument("--mode", choices=("asgi", "uvicorn"), default="asgi")
+    parser.add_argument("--workers", type=int, default=4, help="uvicorn workers (--mode uvicorn)")
+    parser.add_argument("--requests", type=int, default=200, help="timed requests per scenario")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--only", nargs="*", help="routers to run, e.g. tasks feeds")
+    parser.add_argument("--output", help="results file (default benchmarks/results/api-<mode>-<time>.json)")
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed p95/throughput change (0.10 = 10%%)")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--save-baseline", help="also write the results here")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="eunoiaflow-bench-")
+    seeded = args.db or os.path.join(workdir, "seed.db")
+    if not os.path.exists(seeded):
+        print(f"Seeding {seeded} ...", file=sys.stderr)
+        seed_args = argparse.Namespace(**{**vars(args), "db": seeded, "force": False})
+        seeding.seed(seed_args)
+    # Work on a copy so write scenarios leave the seeded file untouched
+    database = os.path.join(workdir, "run.db")
+    shutil.copy(seeded, database)
+
+    env = {**os.environ, **APP_ENV, "DATABASE_URL": f"sqlite:///{database}"}
+    os.environ.update(env)
+    print(f"Running {args.mode} benchmark against {seeded}", file=sys.stderr)
+    if args.mode == "asgi":
+        results = asyncio.run(run_asgi(args))
+    else:
+        results = asyncio.run(run_uvicorn(args, env))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "mode": args.mode,
+            "workers": args.workers if args.mode == "uvicorn" else 1,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "database": os.path.abspath(seeded),
+            "database_bytes": os.path.getsize(seeded),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"api-{args.mode}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    for path in filter(None, (output, args.save_baseline)):
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+    print(f"Results written to {output}", file=sys.stderr)
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        base_meta = baseline.get("meta", {})
+        if (base_meta.get("mode"), base_meta.get("workers")) != (report["meta"]["mode"], report["meta"]["workers"]):
+            print(f"\nNote: baseline was run with mode={base_meta.get('mode')} workers={base_meta.get('workers')}",
+                  file=sys.stderr)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} scenario(s) regressed beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+            if args.fail_on_regression:
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# backend/benchmarks/bench_auth.py
+"""
+Login storm benchmark: fire concurrent logins at the real app and, at the
+same time, measure latency of a cheap authenticated endpoint to check that
+password hashing doesn't degrade the rest of the API.
+
+Run from the backend directory:
+    python -m benchmarks.bench_auth --logins 200 --concurrency 32
+    PASSWORD_HASH_EXECUTOR=thread python -m benchmarks.bench_auth
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.common import summarize, timed
+from benchmarks.seed import migrate
+
+
+async def run(args):
+    import httpx
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        credentials = {"email": "bench@example.com", "password": "correct horse battery staple"}
+        await client.post("/api/auth/register", json={**credentials, "username": "bench"})
+        token = (await client.post("/api/auth/login", json=credentials)).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        semaphore = asyncio.Semaphore(args.concurrency)
+        login_samples, probe_samples = [], []
+        storm_done = asyncio.Event()
+
+        async def login_once():
+            async with semaphore:
+                elapsed, status = await timed(client, "POST", "/api/auth/login", json=credentials)
+                if status == 200:
+                    login_samples.append(elapsed)
+
+        async def probe():
+            # Cheap sync endpoint that shares the threadpool with everything else
+            while not storm_done.is_set():
+                elapsed, _ = await timed(client, "GET", "/api/tasks/stats", headers=headers)
+                probe_samples.append(elapsed)
+                await asyncio.sleep(0.01)
+
+        start = time.perf_counter()
+        probe_task = asyncio.create_task(probe())
+        await asyncio.gather(*(login_once() for _ in range(args.logins)))
+        elapsed = time.perf_counter() - start
+        storm_done.set()
+        await probe_task
+
+    from app.services.password_hasher import password_hasher
+    password_hasher.shutdown()
+    return {
+        "executor": os.environ.get("PASSWORD_HASH_EXECUTOR", "process"),
+        "bcrypt_rounds": int(os.environ["BCRYPT_ROUNDS"]),
+        "concurrency": args.concurrency,
+        "login": summarize(login_samples, elapsed),
+        "other_endpoint_during_storm": summarize(probe_samples, elapsed) if probe_samples else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=12)
+    args = parser.parse_args()
+
+    # Configure before the app modules are imported
+    workdir = tempfile.mkdtemp(prefix="eunoiaflow-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["SQL_ECHO"] = "false"
+    os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    # The app no longer creates tables itself
+    migrate(os.environ["DATABASE_URL"])
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# backend/benchmarks/bench_planner.py
+"""
+Latency of the auto-scheduling planner (/api/plan/week) for users with many
+open tasks, on an in-memory SQLite database:
+
+- full: nothing cached; read every open task, sort and plan
+- incremental: one task changed since the cached backlog; re-read that task,
+  move it in the order and plan
+- cached: nothing changed; one watermark query and plan
+- plan_only: packing the cached backlog into the week's blocks
+
+The target is planning 5k open tasks in under 100 ms.
+
+Run from the backend directory:
+    python -m benchmarks.bench_planner --tasks 1000 5000 20000
+"""
+import argparse
+import json
+import statistics
+import time
+from datetime import date, datetime, timedelta
+from typing import List
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db import Base
+from app import models
+from app.services import versioning
+from app.services.change_log import record_change
+from app.services.planner import BacklogCache, plan_days
+
+PRIORITIES = ("low", "medium", "high", "urgent")
+TARGET_MS = 100
+FIRST_DAY = date(2026, 10, 19)
+NOW = datetime(2026, 10, 19, 8, 0)
+
+
+def seed(session, n_tasks: int) -> int:
+    user = models.User(email="bench@example.com", username="bench", hashed_password="x")
+    session.add(user)
+    session.flush()
+    rows = []
+    for i in range(n_tasks):
+        # A mix of overdue, due this week, due later and undated tasks
+        due = None if i % 5 == 0 else NOW + timedelta(hours=(i * 7) % (24 * 30) - 48)
+        rows.append({
+            "title": f"Task {i}",
+            "priority": PRIORITIES[i % 4],
+            "priority_rank": models.priority_rank(PRIORITIES[i % 4]),
+            "due_date": due,
+            "project": f"Project {i % 5}",
+            "is_completed": False,
+            "owner_id": user.id,
+        })
+    # Completed tasks the planner must skip
+    rows.extend({**row, "is_completed": True} for row in rows[: n_tasks // 4])
+    session.bulk_insert_mappings(models.Task, rows)
+    session.commit()
+    return user.id
+
+
+def timeit(fn, repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def summarize(samples: List[float]) -> dict:
+    return {"median_ms": round(statistics.median(samples), 3), "max_ms": round(max(samples), 3)}
+
+
+def run(n_tasks: int, repeat: int) -> dict:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    user_id = seed(session, n_tasks)
+    settings = models.UserSettings(
+        work_hours_start="09:00", work_hours_end="17:00",
+        pomodoro_work_duration=25, pomodoro_break_duration=5, pomodoro_long_break_duration=15
+    )
+    zone = ZoneInfo("UTC")
+    task_ids = [task_id for task_id, in session.query(models.Task.id).filter(models.Task.is_completed == False)]
+    cache = BacklogCache()
+
+    def plan():
+        return plan_days(cache.get(session, user_id), FIRST_DAY, 7, zone, settings, now=NOW)
+
+    def full():
+        cache.clear()
+        plan()
+
+    edits = iter(range(10 ** 9))
+
+    def edit_one():
+        i = next(edits)
+        task = session.get(models.Task, task_ids[(i * 7919) % len(task_ids)])
+        task.priority = PRIORITIES[i % 4]
+        task.due_date = NOW + timedelta(hours=i % 100)
+        record_change(session, user_id, versioning.TASKS, task.id)
+        session.commit()
+
+    full()  # warm up
+    incremental = []
+    for _ in range(repeat):
+        edit_one()
+        start = time.perf_counter()
+        plan()
+        incremental.append((time.perf_counter() - start) * 1000)
+
+    backlog = cache.get(session, user_id)
+    results = {
+        "tasks": n_tasks,
+        "full": summarize(timeit(full, repeat)),
+        "incremental": summarize(incremental),
+        "cached": summarize(timeit(plan, repeat)),
+        "plan_only": summarize(timeit(lambda: plan_days(backlog, FIRST_DAY, 7, zone, settings, now=NOW), repeat)),
+    }
+    result = plan()
+    results["scheduled"] = result.scheduled
+    results["missed_deadlines"] = len(result.missed_deadlines)
+    results[f"full_under_{TARGET_MS}_ms"] = results["full"]["median_ms"] < TARGET_MS
+
+    session.close()
+    engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, nargs="+", default=[1000, 5000, 20000], help="open tasks per run")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    for n_tasks in args.tasks:
+        print(json.dumps(run(n_tasks, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# backend/benchmarks/bench_returning.py
+"""
+Per-write latency and statement count of the write endpoints' DB work:
+the old pattern (commit, then refresh() to read server defaults back, then
+serialize) against the current one (server defaults come back with
+RETURNING during the flush and the session keeps objects loaded after
+commit).
+
+Uses a file-backed SQLite database by default; pass --database-url to
+measure against PostgreSQL, where each saved round trip costs more.
+
+Run from the backend directory:
+    python -m benchmarks.bench_returning --writes 500
+    python -m benchmarks.bench_returning --database-url postgresql://localhost/bench
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base
+from app import models, schemas
+from app.profiler import QueryCounter
+
+
+def create_task(db, user_id, i):
+    task = models.Task(title=f"Task {i}", priority="medium", owner_id=user_id)
+    db.add(task)
+    return task, schemas.Task
+
+
+def update_task(db, user_id, i):
+    task = db.query(models.Task).filter(models.Task.owner_id == user_id).order_by(models.Task.id.desc()).first()
+    task.title = f"Renamed {i}"
+    return task, schemas.Task
+
+
+def start_session(db, user_id, i):
+    session = models.TimerSession(session_type="pomodoro", duration_planned=1500, user_id=user_id)
+    db.add(session)
+    return session, schemas.TimerSession
+
+
+def update_settings(db, user_id, i):
+    settings = db.query(models.UserSettings).filter(models.UserSettings.user_id == user_id).first()
+    settings.theme = "dark" if i % 2 else "light"
+    return settings, schemas.UserSettings
+
+
+OPERATIONS = {
+    "create_task": create_task,
+    "update_task": update_task,
+    "start_timer_session": start_session,
+    "update_settings": update_settings,
+}
+
+
+def refresh_after_commit(factory, operation, user_id, i):
+    db = factory()
+    try:
+        obj, schema = operation(db, user_id, i)
+        db.commit()
+        db.refresh(obj)
+        return schema.model_validate(obj)
+    finally:
+        db.close()
+
+
+def returning(factory, operation, user_id, i):
+    db = factory(expire_on_commit=False)
+    try:
+        obj, schema = operation(db, user_id, i)
+        db.commit()
+        return schema.model_validate(obj)
+    finally:
+        db.close()
+
+
+def run(engine, writes: int) -> dict:
+    factory = sessionmaker(bind=engine, autoflush=False)
+    with factory() as db:
+        user = models.User(email="bench@example.com", username="bench", hashed_password="x")
+        db.add(user)
+        db.flush()
+        db.add(models.UserSettings(user_id=user.id))
+        db.add(models.Task(title="Seed", owner_id=user.id))
+        db.commit()
+        user_id = user.id
+
+    results = {}
+    for name, operation in OPERATIONS.items():
+        results[name] = {}
+        for pattern, fn in (("refresh_after_commit", refresh_after_commit), ("returning", returning)):
+            fn(factory, operation, user_id, 0)  # warm up
+            samples = []
+            with QueryCounter(engine) as profile:
+                for i in range(writes):
+                    start = time.perf_counter()
+                    fn(factory, operation, user_id, i)
+                    samples.append((time.perf_counter() - start) * 1000)
+            results[name][pattern] = {
+                "median_ms": round(statistics.median(samples), 3),
+                "statements_per_write": round(profile.count / writes, 2),
+            }
+        before, after = results[name]["refresh_after_commit"], results[name]["returning"]
+        results[name]["speedup"] = round(before["median_ms"] / after["median_ms"], 2)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writes", type=int, default=500, help="writes per operation and pattern")
+    parser.add_argument("--database-url", help="empty database to use (default: a temporary SQLite file)")
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='eunoiaflow-bench-'), 'bench.db')}"
+    engine = create_engine(database_url)
+    Base.metadata.create_all(bind=engine)
+    try:
+        print(json.dumps(run(engine, args.writes), indent=2))
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# backend/benchmarks/bench_serialization.py
+"""
+Compare the default list-response path (ORM objects -> pydantic validation ->
+stdlib json) with the opt-in fast path (column tuples -> orjson) on large
+task lists.
+
+Run from the backend directory:
+    python -m benchmarks.bench_serialization --tasks 100 500 2000
+"""
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db import Base
+from app import models, schemas
+from app.serialization import fast_list_response, orjson
+
+
+def seed(session, n_tasks: int):
+    user = models.User(email="bench@example.com", username="bench", hashed_password="x")
+    session.add(user)
+    session.flush()
+    now = datetime.utcnow()
+    session.bulk_insert_mappings(models.Task, [
+        {
+            "title": f"Task {i}",
+            "description": "Lorem ipsum dolor sit amet " * 4,
+            "priority": ("low", "medium", "high", "urgent")[i % 4],
+            "priority_rank": models.priority_rank(("low", "medium", "high", "urgent")[i % 4]),
+            "due_date": now + timedelta(hours=i),
+            "tags": ["work", f"tag{i % 7}"],
+            "project": f"Project {i % 5}",
+            "is_completed": i % 3 == 0,
+            "owner_id": user.id,
+        }
+        for i in range(n_tasks)
+    ])
+    session.commit()
+    return user.id
+
+
+def default_path(session, user_id: int) -> bytes:
+    tasks = session.query(models.Task).filter(models.Task.owner_id == user_id).all()
+    adapter = TypeAdapter(List[schemas.Task])
+    validated = adapter.validate_python(tasks, from_attributes=True)
+    content = adapter.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def fast_path(session, user_id: int) -> bytes:
+    query = session.query(models.Task).filter(models.Task.owner_id == user_id)
+    return fast_list_response(query, models.Task, schemas.Task).body
+
+
+def timeit(fn, repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def run(n_tasks: int, repeat: int):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    user_id = seed(session, n_tasks)
+
+    results = {}
+    for name, fn in (("default", default_path), ("fast", fast_path)):
+        fn(session, user_id)  # warm up
+        session.expunge_all()
+        samples = timeit(lambda: (fn(session, user_id), session.expunge_all()), repeat)
+        results[name] = {"median_ms": round(statistics.median(samples), 3), "min_ms": round(min(samples), 3)}
+
+    session.close()
+    engine.dispose()
+    speedup = results["default"]["median_ms"] / results["fast"]["median_ms"]
+    return {"tasks": n_tasks, **results, "speedup": round(speedup, 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    print(f"encoder: {'orjson' if orjson else 'stdlib json (orjson not installed)'}")
+    for n_tasks in args.tasks:
+        print(json.dumps(run(n_tasks, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# backend/benchmarks/bench_shards.py
+"""
+Write throughput of sharded storage (SHARDING_ENABLED) by shard count:
+--users concurrent writers, one thread per user, each committing small
+transactions shaped like creating a task (the task, its change log entry and
+the resource version bump) on the shard its user id hashes to. One shard is
+the single-file layout every deployment had before; with more shards the
+writers stop queueing behind one SQLite write lock.
+
+Each shard count runs on freshly migrated shard files in a temporary folder.
+
+Run from the backend directory:
+    python -m benchmarks.bench_shards --users 16 --writes 200
+    python -m benchmarks.bench_shards --shards 1 4 16 --users 32
+"""
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+
+# Configure before the app modules are imported
+os.environ.setdefault("SQL_ECHO", "false")
+
+
+def run(shard_count: int, args) -> dict:
+    from app import models
+    from app.shard_admin import migrate_engine
+    from app.sharding import ShardEngines, bucket_for
+    from app.services.change_log import record_change
+    from app.services import versioning
+
+    engines = ShardEngines(directory=tempfile.mkdtemp(prefix="eunoiaflow-shards-"), max_open=shard_count)
+    for shard in range(shard_count):
+        migrate_engine(engines.get(shard))
+
+    errors = []
+    barrier = threading.Barrier(args.users + 1)
+
+    def writer(user_id: int):
+        shard = bucket_for(user_id, shard_count)
+        barrier.wait()
+        for i in range(args.writes):
+            db = engines.session(shard)
+            try:
+                task = models.Task(title=f"Task {i}", priority="medium", owner_id=user_id)
+                db.add(task)
+                db.flush()
+                record_change(db, user_id, versioning.TASKS, task.id)
+                db.commit()
+            except Exception as e:
+                errors.append(repr(e))
+                db.rollback()
+            finally:
+                db.close()
+
+    threads = [threading.Thread(target=writer, args=(user_id,)) for user_id in range(1, args.users + 1)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    engines.dispose()
+
+    commits = args.users * args.writes - len(errors)
+    return {
+        "shards": shard_count,
+        "commits": commits,
+        "seconds": round(elapsed, 2),
+        "commits_per_s": round(commits / elapsed, 1),
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, 8, 16], help="shard counts to compare")
+    parser.add_argument("--users", type=int, default=16, help="concurrent writers, one user each")
+    parser.add_argument("--writes", type=int, default=200, help="transactions per writer")
+    args = parser.parse_args()
+
+    results = [run(shard_count, args) for shard_count in args.shards]
+    base = results[0]["commits_per_s"]
+    for result in results:
+        result["speedup"] = round(result["commits_per_s"] / base, 2) if base else None
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# backend/benchmarks/bench_writes.py
+"""
+Write throughput with and without group commit: concurrent clients toggle
+tasks, mark feed items read and end timer sessions against the real app,
+first with every request committing on its own, then through the write
+batcher (WRITE_BATCHING_ENABLED).
+
+Run from the backend directory:
+    python -m benchmarks.bench_writes --writes 1000 --concurrency 12
+    python -m benchmarks.bench_writes --window-ms 0 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+
+from benchmarks import seed as seeding
+from benchmarks.common import summarize, timed
+
+
+def mixed_writes(ctx, rng):
+    kind = rng.random()
+    if kind < 0.5:
+        return "POST", f"/api/tasks/{rng.choice(ctx['task_ids'])}/toggle", {}
+    if kind < 0.9:
+        return "PUT", f"/api/feeds/{rng.choice(ctx['feed_ids'])}", {"json": {"is_read": rng.random() < 0.5}}
+    return "PUT", f"/api/timer/sessions/{rng.choice(ctx['session_ids'])}", {
+        "json": {"interruptions": rng.randint(0, 3)}
+    }
+
+
+async def run_writes(client, ctx, args, rng) -> dict:
+    semaphore = asyncio.Semaphore(args.concurrency)
+    samples, errors = [], 0
+
+    async def one():
+        nonlocal errors
+        method, url, kwargs = mixed_writes(ctx, rng)
+        async with semaphore:
+            elapsed, status = await timed(client, method, url, **kwargs)
+        if status >= 400:
+            errors += 1
+        samples.append(elapsed)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(args.writes)))
+    result = summarize(samples, time.perf_counter() - start)
+    result["errors"] = errors
+    return result
+
+
+async def run(args):
+    import httpx
+    from app.main import app
+    from app.services.write_batcher import write_batcher
+
+    results = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            credentials = {"email": "bench0@example.com", "password": seeding.PASSWORD}
+            token = (await client.post("/api/auth/login", json=credentials)).json()["access_token"]
+            client.headers["Authorization"] = f"Bearer {token}"
+            session_ids = []
+            for _ in range(20):
+                response = await client.post("/api/timer/sessions", json={"session_type": "pomodoro", "duration_planned": 1500})
+                session_ids.append(response.json()["id"])
+            ctx = {
+                "task_ids": [t["id"] for t in (await client.get("/api/tasks/", params={"limit": 500})).json()],
+                "feed_ids": [f["id"] for f in (await client.get("/api/feeds/", params={"limit": 500})).json()],
+                "session_ids": session_ids,
+            }
+
+            results["unbatched"] = await run_writes(client, ctx, args, random.Random(args.seed))
+            for window_ms in args.window_ms:
+                write_batcher.window = window_ms / 1000
+                write_batcher.stats = dict.fromkeys(write_batcher.stats, 0)
+                write_batcher.start()
+                result = await run_writes(client, ctx, args, random.Random(args.seed))
+                result["batcher"] = write_batcher.get_stats()
+                await write_batcher.stop()
+                results[f"batched_{window_ms:g}ms"] = result
+
+    base = results["unbatched"]["throughput_per_s"]
+    for name, result in results.items():
+        result["speedup"] = round(result["throughput_per_s"] / base, 2) if base else None
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writes", type=int, default=1000, help="write requests per run")
+    # Stay below the DB pool (5 + 10 overflow): requests hold a connection each
+    parser.add_argument("--concurrency", type=int, default=12)
+    parser.add_argument("--window-ms", type=float, nargs="+", default=[2.0], help="batch windows to compare")
+    parser.add_argument("--tasks", type=int, default=5000, help="tasks of the seeded user")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="eunoiaflow-bench-")
+    database = os.path.join(workdir, "bench.db")
+    seeding.seed(argparse.Namespace(
+        db=database, force=False, tasks=args.tasks, sessions=None, feed_items=None, users=2, seed=args.seed
+    ))
+    # Configure before the app modules are imported
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{database}",
+        "SQL_ECHO": "false",
+        "FEED_INGESTION_ENABLED": "false",
+        "MAINTENANCE_ENABLED": "false",
+        "RECURRENCE_ENABLED": "false",
+        "SCHEDULER_ENABLED": "false",
+        "AI_PREWARM": "false",
+    })
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+# backend/benchmarks/common.py
+"""Helpers shared by the benchmark scripts."""
+import os
+import statistics
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(samples, elapsed):
+    return {
+        "count": len(samples),
+        "throughput_per_s": round(len(samples) / elapsed, 2) if elapsed else 0,
+        "p50_ms": round(percentile(samples, 50), 2),
+        "p95_ms": round(percentile(samples, 95), 2),
+        "p99_ms": round(percentile(samples, 99), 2),
+        "mean_ms": round(statistics.mean(samples), 2),
+    }
+
+
+async def timed(client, method, url, **kwargs):
+    start = time.perf_counter()
+    response = await client.request(method, url, **kwargs)
+    return (time.perf_counter() - start) * 1000, response.status_code
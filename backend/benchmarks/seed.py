@@ -0,0 +1,236 @@
+# backend/benchmarks/seed.py
+"""
+Build a SQLite database with realistic data volumes for benchmarking. The
+schema comes from the real migrations; rows are bulk inserted with a fixed
+random seed, so the same arguments produce the same data (dates are relative
+to the time of seeding).
+
+One "primary" user (bench0@example.com) owns --tasks tasks and the
+configured sessions and feed items; --users - 1 further users get a tenth
+of that each, so per-user filters have something to skip. Every user's
+password is "benchpassword".
+
+Run from the backend directory:
+    python -m benchmarks.seed --db /tmp/bench.db --tasks 10000
+    python -m benchmarks.seed --db /tmp/bench-1m.db --tasks 1000000 --users 20
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.common import BACKEND_DIR
+
+PASSWORD = "benchpassword"
+BATCH_SIZE = 5000
+
+PRIORITIES = ("low", "medium", "high", "urgent")
+PROJECTS = [f"Project {i}" for i in range(12)]
+TAGS = ["work", "personal", "review", "deep-work", "admin", "health", "learning", "errand"]
+SESSION_TYPES = ("pomodoro", "pomodoro", "pomodoro", "break", "custom_timer", "stopwatch")
+FEED_CATEGORIES = ("AI/ML", "productivity", "news", "science", "design")
+FEED_TYPES = ("article", "news", "paper", "fact")
+
+
+def migrate(database_url: str):
+    env = {**os.environ, "DATABASE_URL": database_url, "SQL_ECHO": "false"}
+    subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"], cwd=BACKEND_DIR, env=env,
+                   check=True, capture_output=True)
+
+
+def batched(rows, size=BATCH_SIZE):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def insert_rows(conn, table, rows) -> int:
+    total = 0
+    for batch in batched(rows):
+        conn.execute(table.insert(), batch)
+        total += len(batch)
+    return total
+
+
+def task_rows(rng, owner_id, count, now):
+    from app.models import priority_rank
+
+    for i in range(count):
+        completed = rng.random() < 0.35
+        created = now - timedelta(days=rng.uniform(0, 365))
+        due = now + timedelta(days=rng.uniform(-30, 60)) if rng.random() < 0.7 else None
+        priority = rng.choice(PRIORITIES)
+        yield {
+            "owner_id": owner_id,
+            "title": f"Task {i} {rng.choice(TAGS)}",
+            "description": "Notes " * rng.randint(0, 30),
+            "priority": priority,
+            "priority_rank": priority_rank(priority),
+            "is_completed": completed,
+            "completed_at": created + timedelta(days=rng.uniform(0, 20)) if completed else None,
+            "due_date": due,
+            "created_at": created,
+            "tags": rng.sample(TAGS, rng.randint(0, 3)),
+            "project": rng.choice(PROJECTS) if rng.random() < 0.6 else None,
+            "is_recurring": False,
+        }
+
+
+def session_rows(rng, user_id, count, now):
+    for i in range(count):
+        session_type = rng.choice(SESSION_TYPES)
+        planned = 1500 if session_type == "pomodoro" else rng.choice((300, 900, 1800, 3600))
+        started = now - timedelta(days=rng.uniform(0, 120), seconds=rng.randint(0, 86400))
+        actual = int(planned * rng.uniform(0.3, 1.0))
+        yield {
+            "user_id": user_id,
+            "session_type": session_type,
+            "duration_planned": planned,
+            "duration_actual": actual,
+            "task_title": f"Task {rng.randint(0, 999)}",
+            "started_at": started,
+            "ended_at": started + timedelta(seconds=actual),
+            "was_completed": actual >= planned * 0.9,
+            "interruptions": rng.randint(0, 3),
+        }
+
+
+def feed_rows(rng, user_id, article_ids, now):
+    for article_id in article_ids:
+        yield {
+            "user_id": user_id,
+            "article_id": article_id,
+            "category": rng.choice(FEED_CATEGORIES),
+            "is_read": rng.random() < 0.5,
+            "is_bookmarked": rng.random() < 0.05,
+            "is_archived": False,
+            "fetched_at": now - timedelta(days=rng.uniform(0, 30)),
+        }
+
+
+def article_rows(rng, count, now):
+    for i in range(count):
+        yield {
+            "id": i + 1,
+            "content_hash": hashlib.sha256(f"bench-article-{i}".encode()).hexdigest(),
+            "title": f"Article {i}",
+            "content": "Lorem ipsum dolor sit amet. " * rng.randint(5, 60),
+            "url": f"https://example.com/articles/{i}",
+            "source": f"Source {i % 25}",
+            "feed_type": rng.choice(FEED_TYPES),
+            "published_at": now - timedelta(days=rng.uniform(0, 30)),
+            "fetched_at": now - timedelta(days=rng.uniform(0, 30)),
+        }
+
+
+def seed(args) -> dict:
+    database_url = f"sqlite:///{os.path.abspath(args.db)}"
+    if os.path.exists(args.db):
+        if not args.force:
+            sys.exit(f"{args.db} exists; pass --force to replace it")
+        os.remove(args.db)
+    migrate(database_url)
+
+    # Configure before the app modules are imported
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["SQL_ECHO"] = "false"
+    from sqlalchemy import create_engine, event, text
+    from sqlalchemy.orm import Session
+    from app import models
+    from app.services.feed_counters import rebuild_counters
+    from app.services.password_hasher import hash_password_sync
+
+    engine = create_engine(database_url)
+
+    @event.listens_for(engine, "connect")
+    def _fast_writes(dbapi_connection, connection_record):
+        # Seeding only: the file is thrown away if the process dies
+        dbapi_connection.execute("PRAGMA synchronous=OFF")
+
+    rng = random.Random(args.seed)
+    now = datetime.utcnow()
+    started = time.perf_counter()
+    counts = {"users": args.users, "tasks": 0, "timer_sessions": 0, "articles": 0, "feed_items": 0}
+    sessions_per_user = args.sessions if args.sessions is not None else args.tasks // 2
+    feed_per_user = args.feed_items if args.feed_items is not None else args.tasks // 2
+
+    hashed_password = hash_password_sync(PASSWORD)
+    with engine.begin() as conn:
+        insert_rows(conn, models.User.__table__, (
+            {
+                "id": user_id,
+                "email": f"bench{user_id - 1}@example.com",
+                "username": f"bench{user_id - 1}",
+                "hashed_password": hashed_password,
+                "full_name": f"Bench User {user_id - 1}",
+                "is_active": True,
+                "created_at": now,
+            }
+            for user_id in range(1, args.users + 1)
+        ))
+        # Column defaults fill in the rest, as on registration
+        insert_rows(conn, models.UserSettings.__table__, (
+            {"user_id": user_id} for user_id in range(1, args.users + 1)
+        ))
+        counts["articles"] = insert_rows(conn, models.Article.__table__, article_rows(rng, feed_per_user, now))
+
+    for user_id in range(1, args.users + 1):
+        # The primary user gets the full volume, everyone else a tenth
+        scale = 1 if user_id == 1 else 10
+        with engine.begin() as conn:
+            counts["tasks"] += insert_rows(
+                conn, models.Task.__table__, task_rows(rng, user_id, args.tasks // scale, now)
+            )
+            counts["timer_sessions"] += insert_rows(
+                conn, models.TimerSession.__table__, session_rows(rng, user_id, sessions_per_user // scale, now)
+            )
+            n_items = feed_per_user // scale
+            article_ids = range(1, n_items + 1) if user_id == 1 else rng.sample(range(1, feed_per_user + 1), n_items)
+            counts["feed_items"] += insert_rows(
+                conn, models.FeedItem.__table__, feed_rows(rng, user_id, article_ids, now)
+            )
+        print(f"  user {user_id}/{args.users} seeded ({time.perf_counter() - started:.1f}s)", file=sys.stderr)
+
+    with Session(engine) as db:
+        rebuild_counters(db)
+    with engine.connect() as conn:
+        conn.execute(text("ANALYZE"))
+    engine.dispose()
+
+    return {
+        "database": os.path.abspath(args.db),
+        "seed": args.seed,
+        "rows": counts,
+        "seconds": round(time.perf_counter() - started, 1),
+    }
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--tasks", type=int, default=10000, help="tasks of the primary user")
+    parser.add_argument("--sessions", type=int, default=None, help="timer sessions of the primary user (default tasks/2)")
+    parser.add_argument("--feed-items", type=int, default=None, help="feed items of the primary user (default tasks/2)")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", required=True, help="SQLite file to create")
+    parser.add_argument("--force", action="store_true", help="replace an existing file")
+    add_arguments(parser)
+    args = parser.parse_args()
+    print(json.dumps(seed(args), indent=2))
+
+
+if __name__ == "__main__":
+    main()
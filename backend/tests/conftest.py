@@ -0,0 +1,51 @@
+# backend/tests/conftest.py
+import os
+import tempfile
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# App modules read their configuration at import time: keep tests off the
+# development database and background services
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='eunoiaflow-tests-')}/test.db")
+os.environ.setdefault("SQL_ECHO", "false")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("PASSWORD_HASH_EXECUTOR", "thread")
+for flag in (
+    "FEED_INGESTION_ENABLED", "MAINTENANCE_ENABLED", "RECURRENCE_ENABLED", "AUTOMATION_ENABLED",
+    "SCHEDULER_ENABLED", "AI_PREWARM"
+):
+    os.environ.setdefault(flag, "false")
+
+
+@pytest.fixture
+def engine():
+    """An in-memory SQLite database with the current schema."""
+    from app.db import Base
+    from app import models  # noqa: F401 - registers the tables
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    """For services that take a session_factory."""
+    return sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+
+@pytest.fixture
+def user_id(session_factory):
+    from app import models
+
+    db = session_factory()
+    user = models.User(email="test@example.com", username="test", hashed_password="x")
+    db.add(user)
+    db.commit()
+    user_id = user.id
+    db.close()
+    return user_id
@@ -0,0 +1,33 @@
+# backend/tests/test_auth.py
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+
+from app import schemas
+from app.routers import auth
+
+
+def test_auth_keeps_database_work_off_the_event_loop(engine, session_factory):
+    threads = []
+    event.listen(engine, "before_cursor_execute", lambda *args: threads.append(threading.get_ident()))
+    db = session_factory()
+
+    async def register_and_login():
+        user = await auth.register(schemas.UserCreate(email="a@example.com", username="a", password="secret"), db)
+        with pytest.raises(HTTPException):
+            await auth.register(schemas.UserCreate(email="a@example.com", username="b", password="secret"), db)
+        token = await auth.login(schemas.UserLogin(email="a@example.com", password="secret"), db)
+        return user, token
+
+    try:
+        user, token = asyncio.run(register_and_login())
+    finally:
+        db.close()
+
+    assert user.email == "a@example.com" and token["token_type"] == "bearer"
+    assert threads and threading.get_ident() not in threads
+    # Sync dependency: FastAPI runs it in the threadpool
+    assert not asyncio.iscoroutinefunction(auth.get_current_user)
@@ -0,0 +1,62 @@
+# backend/tests/test_automation.py
+from datetime import datetime
+import asyncio
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app import schemas
+from app.routers import automation as automation_router
+from app.services.automation import AutomationEngine, RuleSnapshot, next_time_based_fire, validate_rule
+from app.services.event_bus import TASK_COMPLETED, Event
+from app.services.url_safety import UnsafeURL
+
+
+def webhook_rule(url: str) -> RuleSnapshot:
+    return RuleSnapshot(1, 1, "hook", {}, "webhook", {"url": url})
+
+
+@pytest.mark.parametrize("url", ["", "ftp://example.com/hook", "http://127.0.0.1:9000/hook", "http://169.254.169.254/"])
+def test_validate_rule_refuses_non_public_webhooks(url):
+    with pytest.raises(ValueError):
+        validate_rule(TASK_COMPLETED, {}, "webhook", {"url": url})
+
+
+def test_webhook_is_checked_when_sent():
+    sent = []
+    transport = httpx.MockTransport(lambda request: sent.append(str(request.url)) or httpx.Response(200))
+    event = Event(TASK_COMPLETED, 1, {"task_id": 1})
+
+    async def send(engine, url):
+        try:
+            await engine._webhook(webhook_rule(url), event)
+        finally:
+            await engine._client.aclose()
+
+    # Saved while it resolved publicly, now pointing at loopback
+    with pytest.raises(UnsafeURL):
+        asyncio.run(send(AutomationEngine(transport=transport, allowed_hosts=()), "http://127.0.0.1/hook"))
+    assert sent == []
+
+    asyncio.run(send(AutomationEngine(transport=transport, allowed_hosts={"127.0.0.1"}), "http://127.0.0.1/hook"))
+    assert sent == ["http://127.0.0.1/hook"]
+
+
+def test_time_based_at_with_offset_is_converted_to_utc():
+    after = datetime(2030, 1, 1)
+
+    assert next_time_based_fire({"at": "2030-06-01T09:00+02:00"}, after) == datetime(2030, 6, 1, 7, 0)
+    assert next_time_based_fire({"at": "2030-06-01T09:00"}, after) == datetime(2030, 6, 1, 9, 0)
+
+
+def test_rules_are_refused_in_sharded_mode(monkeypatch):
+    monkeypatch.setattr(automation_router, "SHARDING_ENABLED", True)
+    rule = schemas.AutomationRuleCreate(
+        name="daily", trigger_type="time_based", trigger_config={"time": "09:00"},
+        action_type="send_notification", action_config={}
+    )
+
+    with pytest.raises(HTTPException) as refused:
+        automation_router.create_rule(rule, current_user=None, db=None)
+    assert refused.value.status_code == 503
@@ -0,0 +1,89 @@
+# backend/tests/test_feed_counters.py
+import json
+import os
+import subprocess
+import sys
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base
+from app import models
+from app.services.feed_counters import apply_feed_item_update, check_counters, count_new_items
+from app.sharding import shard_path
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def add_unread_item(db, user_id: int, url: str = "https://example.com/1") -> int:
+    article = models.Article(content_hash=url, title="One", url=url)
+    db.add(article)
+    db.flush()
+    item = models.FeedItem(user_id=user_id, article_id=article.id, category="news")
+    db.add(item)
+    count_new_items(db, user_id, "news", 1)
+    db.commit()
+    return item.id
+
+
+def test_concurrent_mark_read_counts_once(session_factory, user_id):
+    db = session_factory()
+    item_id = add_unread_item(db, user_id)
+    db.close()
+
+    # Both requests loaded the item while it was still unread
+    first, second = session_factory(), session_factory()
+    first_item, second_item = first.get(models.FeedItem, item_id), second.get(models.FeedItem, item_id)
+    apply_feed_item_update(first, first_item, {"is_read": True, "is_bookmarked": True})
+    first.commit()
+    apply_feed_item_update(second, second_item, {"is_read": True, "is_bookmarked": True})
+    second.commit()
+    first.close()
+
+    assert check_counters(second, user_id) == []
+    counter = second.query(models.FeedCounter).one()
+    assert (counter.total, counter.unread, counter.bookmarked) == (1, 0, 1)
+    assert second_item.is_read and second_item.is_bookmarked
+
+    apply_feed_item_update(second, second_item, {"is_read": False, "is_archived": True})
+    second.commit()
+    assert check_counters(second, user_id) == []
+    assert second.get(models.FeedItem, item_id).is_archived
+    second.close()
+
+
+def run_cli(env, *args):
+    return subprocess.run(
+        [sys.executable, "-m", "app.services.feed_counters", *args],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+
+
+def test_cli_checks_and_rebuilds_every_shard(tmp_path):
+    shard_dir = tmp_path / "shards"
+    shard_dir.mkdir()
+    main_path, shard_file = tmp_path / "main.db", shard_path(0, str(shard_dir))
+    for path in (main_path, shard_file):
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(bind=engine)
+        engine.dispose()
+    engine = create_engine(f"sqlite:///{shard_file}")
+    db = sessionmaker(bind=engine)()
+    add_unread_item(db, 7)
+    db.query(models.FeedCounter).update({models.FeedCounter.unread: 5})
+    db.commit()
+    db.close()
+    engine.dispose()
+
+    env = {
+        **os.environ, "DATABASE_URL": f"sqlite:///{main_path}", "SQL_ECHO": "false",
+        "SHARDING_ENABLED": "true", "SHARD_COUNT": "2", "SHARD_DIR": str(shard_dir),
+    }
+    check = run_cli(env, "check")
+    assert check.returncode == 1, check.stderr
+    report = json.loads(check.stdout)
+    assert report["main"] == {"mismatches": []} and "shard 1" not in report
+    assert report["shard 0"]["mismatches"][0]["stored"]["unread"] == 5
+
+    assert json.loads(run_cli(env, "rebuild", "--shard", "0").stdout) == {"shard 0": {"rebuilt": 1}}
+    assert run_cli(env, "check").returncode == 0
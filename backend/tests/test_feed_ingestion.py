@@ -0,0 +1,119 @@
+# backend/tests/test_feed_ingestion.py
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import asyncio
+import threading
+
+import pytest
+
+from app import models
+from app.services.feed_ingestion import FeedIngestionService
+from app.services.url_safety import UnsafeURL, check_public_url
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Stand-in</title>
+<item><title>One</title><link>https://example.com/1</link></item>
+<item><title>Two</title><link>https://example.com/2</link></item>
+</channel></rss>"""
+
+
+@pytest.fixture
+def feed_server():
+    """Local stand-in feed server: /feed.xml, and /redirect pointing at localhost."""
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests.append(self.path)
+            if self.path == "/redirect":
+                self.send_response(302)
+                self.send_header("Location", f"http://localhost:{self.server.server_port}/feed.xml")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.end_headers()
+            self.wfile.write(RSS)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", requests
+    server.shutdown()
+    server.server_close()
+
+
+def subscribe(session_factory, user_id, url):
+    db = session_factory()
+    source = models.FeedSource(url=url)
+    db.add(source)
+    db.flush()
+    db.add(models.FeedSubscription(user_id=user_id, source_id=source.id))
+    db.commit()
+    db.close()
+
+
+@pytest.mark.parametrize("url", [
+    "ftp://example.com/feed.xml",
+    "file:///etc/passwd",
+    "http://127.0.0.1/feed.xml",
+    "http://localhost:8000/",
+    "http://10.1.2.3/",
+    "http://192.168.0.1/",
+    "http://169.254.169.254/latest/meta-data/",
+    "http://[::1]/",
+    "http://[::ffff:127.0.0.1]/",
+    "http://0.0.0.0/",
+])
+def test_non_public_urls_are_refused(url):
+    with pytest.raises(UnsafeURL):
+        check_public_url(url, allowed_hosts=())
+
+
+def test_public_and_allowed_hosts_pass():
+    check_public_url("https://93.184.216.34/feed.xml", allowed_hosts=())
+    check_public_url("http://127.0.0.1:8080/feed.xml", allowed_hosts={"127.0.0.1"})
+
+
+def test_cycle_fetches_from_allowed_stand_in_server(session_factory, user_id, feed_server):
+    base_url, requests = feed_server
+    subscribe(session_factory, user_id, f"{base_url}/feed.xml")
+    service = FeedIngestionService(session_factory, allowed_hosts={"127.0.0.1"})
+
+    stats = asyncio.run(service.run_cycle())
+
+    assert stats == {"sources": 1, "not_modified": 0, "failed": 0, "inserted": 2}
+    assert requests == ["/feed.xml"]
+
+
+def test_private_feed_is_never_requested(session_factory, user_id, feed_server):
+    base_url, requests = feed_server
+    subscribe(session_factory, user_id, f"{base_url}/feed.xml")
+    service = FeedIngestionService(session_factory, allowed_hosts=())
+
+    stats = asyncio.run(service.run_cycle())
+
+    assert stats["failed"] == 1 and stats["inserted"] == 0
+    assert requests == []
+
+
+def test_redirect_to_private_address_is_refused(session_factory, user_id, feed_server):
+    base_url, requests = feed_server
+    subscribe(session_factory, user_id, f"{base_url}/redirect")
+    service = FeedIngestionService(session_factory, allowed_hosts={"127.0.0.1"})
+
+    stats = asyncio.run(service.run_cycle())
+
+    assert stats["failed"] == 1 and stats["inserted"] == 0
+    assert requests == ["/redirect"]
+
+
+def test_one_worker_runs_the_ingestion_cycle(session_factory):
+    first = FeedIngestionService(session_factory, worker_id="worker-1")
+    second = FeedIngestionService(session_factory, worker_id="worker-2")
+
+    assert first._hold_lease(900)
+    assert not second._hold_lease(900)
+    assert first._hold_lease(900)
@@ -0,0 +1,86 @@
+# backend/tests/test_job_scheduler.py
+from datetime import datetime, timedelta
+import asyncio
+import time
+
+import pytest
+
+from app import models
+from app.services import job_scheduler
+from app.services.job_scheduler import TASK_REMINDER, JobScheduler, schedule_task_reminder
+
+
+@pytest.fixture
+def far_from_utc(monkeypatch):
+    """Local time 14 hours ahead of UTC, so mixing the two clocks shows."""
+    monkeypatch.setenv("TZ", "Pacific/Kiritimati")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def pending_jobs(db):
+    return [(job.kind, job.ref_id, job.fire_at) for job in db.query(models.ScheduledJob).filter_by(status="pending")]
+
+
+def test_reminders_are_planned_on_utc(far_from_utc, session_factory, user_id):
+    db = session_factory()
+    due = datetime.utcnow().replace(microsecond=0) + timedelta(minutes=30)
+    task = models.Task(title="soon", owner_id=user_id, due_date=due)
+    db.add(task)
+    db.flush()
+
+    schedule_task_reminder(db, task)
+    db.commit()
+
+    assert pending_jobs(db) == [(TASK_REMINDER, task.id, due - timedelta(minutes=15))]
+    db.close()
+
+
+def test_refill_sweeps_deadlines_on_utc(far_from_utc, session_factory, user_id):
+    db = session_factory()
+    due = datetime.utcnow().replace(microsecond=0) + timedelta(minutes=30)
+    db.add(models.Task(title="soon", owner_id=user_id, due_date=due))
+    db.commit()
+    db.close()
+
+    heap = JobScheduler(session_factory=session_factory, lookahead=3600)._refill()
+
+    assert [fire_at for fire_at, _ in heap] == [due - timedelta(minutes=15)]
+
+
+def test_jobs_pushed_during_refill_are_kept(session_factory):
+    pushed_at = datetime.utcnow() + timedelta(hours=1)
+    scheduler = JobScheduler(session_factory=session_factory)
+
+    def refill():
+        # A request commits a job while the refill query runs
+        scheduler._loop.call_soon_threadsafe(scheduler._push, pushed_at)
+        return [(pushed_at + timedelta(minutes=1), 1)]
+
+    scheduler._refill = refill
+
+    async def run():
+        scheduler.start()
+        while scheduler.stats["refills"] == 0:
+            await asyncio.sleep(0.01)
+        heap = sorted(scheduler._heap)
+        await scheduler.stop()
+        return heap
+
+    assert asyncio.run(run()) == [(pushed_at, 0), (pushed_at + timedelta(minutes=1), 1)]
+
+
+def test_no_jobs_are_queued_in_sharded_mode(monkeypatch, session_factory, user_id):
+    monkeypatch.setattr(job_scheduler, "SHARDING_ENABLED", True)
+    db = session_factory()
+    task = models.Task(title="soon", owner_id=user_id, due_date=datetime.utcnow() + timedelta(hours=1))
+    db.add(task)
+    db.flush()
+
+    schedule_task_reminder(db, task)
+    db.commit()
+
+    assert pending_jobs(db) == []
+    db.close()
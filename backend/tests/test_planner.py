@@ -0,0 +1,93 @@
+# backend/tests/test_planner.py
+from datetime import date, datetime
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+
+from app import models
+from app.models import priority_rank
+from app.services import versioning
+from app.services.change_log import record_change
+from app.services.planner import FOCUS, Backlog, BacklogCache, BacklogTask, plan_days
+
+DAY = date(2026, 10, 19)
+UTC = ZoneInfo("UTC")
+SETTINGS = SimpleNamespace(
+    work_hours_start="09:00", work_hours_end="17:00",
+    pomodoro_work_duration=25, pomodoro_break_duration=5, pomodoro_long_break_duration=15
+)
+
+
+def task(task_id, priority, due_date=None):
+    return BacklogTask(task_id, f"{priority} {task_id}", priority, priority_rank(priority), due_date, None)
+
+
+def focus_titles(plan):
+    return [planned.task.title if planned.task else None for planned in plan.blocks if planned.block.kind == FOCUS]
+
+
+def test_tasks_sharing_a_deadline_go_by_priority():
+    noon = datetime(2026, 10, 19, 12, 0)
+    backlog = Backlog([task(1, "low", noon), task(2, "medium", noon), task(3, "high", noon), task(4, "urgent", noon)])
+
+    plan = plan_days(backlog, DAY, 1, UTC, SETTINGS, now=datetime(2026, 10, 19, 8, 0))
+
+    assert focus_titles(plan)[:4] == ["urgent 4", "high 3", "medium 2", "low 1"]
+    assert not any(planned.late for planned in plan.blocks)
+    assert plan.missed_deadlines == []
+
+
+def test_deadline_moves_ahead_of_priority_only_when_needed():
+    # Two blocks end by 09:55: the low task due then must take one of them
+    backlog = Backlog([
+        task(1, "low", datetime(2026, 10, 19, 9, 55)),
+        task(2, "urgent"),
+        task(3, "high"),
+    ])
+
+    plan = plan_days(backlog, DAY, 1, UTC, SETTINGS, now=datetime(2026, 10, 19, 8, 0))
+
+    assert focus_titles(plan)[:3] == ["urgent 2", "low 1", "high 3"]
+    assert not any(planned.late for planned in plan.blocks)
+
+
+def test_missed_deadline_is_reported_and_marked_late():
+    # Only one block ends by 09:25 and the urgent task takes it
+    due = datetime(2026, 10, 19, 9, 25)
+    backlog = Backlog([task(1, "low", due), task(2, "urgent", due)])
+
+    plan = plan_days(backlog, DAY, 1, UTC, SETTINGS, now=datetime(2026, 10, 19, 8, 0))
+
+    assert focus_titles(plan)[:2] == ["urgent 2", "low 1"]
+    assert plan.missed_deadlines == [1]
+    assert [planned.late for planned in plan.blocks if planned.task][:2] == [False, True]
+
+
+def test_day_planned_mid_block_starts_with_focus():
+    # 09:20: the first block has started, the break after it hasn't
+    plan = plan_days(Backlog([task(1, "medium")]), DAY, 1, UTC, SETTINGS, now=datetime(2026, 10, 19, 9, 20))
+
+    assert plan.blocks[0].block.kind == FOCUS
+    assert plan.blocks[0].block.start == datetime(2026, 10, 19, 9, 30)
+    assert plan.blocks[0].task.id == 1
+
+
+def test_backlog_cache_picks_up_logged_changes(session_factory, user_id):
+    db = session_factory()
+    tasks = [models.Task(title=title, priority="medium", priority_rank=priority_rank("medium"), owner_id=user_id)
+             for title in ("first", "second")]
+    db.add_all(tasks)
+    db.flush()
+    for t in tasks:
+        record_change(db, user_id, versioning.TASKS, t.id)
+    db.commit()
+    cache = BacklogCache()
+    assert [t.title for t in cache.get(db, user_id)] == ["first", "second"]
+
+    tasks[1].priority, tasks[1].priority_rank = "urgent", priority_rank("urgent")
+    record_change(db, user_id, versioning.TASKS, tasks[1].id)
+    tasks[0].is_completed = True
+    record_change(db, user_id, versioning.TASKS, tasks[0].id)
+    db.commit()
+
+    assert [t.title for t in cache.get(db, user_id)] == ["second"]
+    db.close()
@@ -0,0 +1,50 @@
+# backend/tests/test_query_budget.py
+pytest_plugins = ["pytester"]
+
+BUDGETED_TESTS = """
+import pytest
+from sqlalchemy import text
+
+from app.db import engine
+
+
+def run_queries(count):
+    with engine.connect() as conn:
+        for _ in range(count):
+            conn.execute(text("SELECT 1"))
+
+
+@pytest.mark.query_budget(2)
+def test_marker_within_budget():
+    run_queries(2)
+
+
+@pytest.mark.query_budget(2)
+def test_marker_over_budget():
+    run_queries(3)
+
+
+def test_block_within_budget(query_budget):
+    run_queries(5)  # outside the block: not counted
+    with query_budget(1):
+        run_queries(1)
+
+
+def test_block_repeats(query_budget):
+    with query_budget(5, allow_repeats=False):
+        run_queries(3)
+"""
+
+
+def test_query_budget_plugin(pytester):
+    pytester.makepyfile(BUDGETED_TESTS)
+
+    result = pytester.runpytest("-p", "app.pytest_query_budget")
+
+    result.assert_outcomes(passed=2, failed=2)
+    result.stdout.fnmatch_lines([
+        "*test_marker_over_budget ran 3 SQL queries, budget is 2*",
+        "*Block repeated statements (possible N+1)*",
+    ])
+    # Budget failures are reported as test failures, not hook errors
+    result.stdout.no_fnmatch_line("*PluggyTeardownRaisedWarning*")
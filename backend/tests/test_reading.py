@@ -0,0 +1,30 @@
+# backend/tests/test_reading.py
+from fastapi import Response
+from starlette.requests import Request
+
+from app import models
+from app.routers import reading
+
+
+def list_items(db, user, **filters):
+    request = Request({"type": "http", "method": "GET", "path": "/api/reading/", "headers": [], "query_string": b""})
+    items = reading.get_reading_items(request, Response(), skip=0, limit=20, status=None, category=None,
+                                      current_user=user, db=db, **filters)
+    return sorted(item.title for item in items)
+
+
+def test_tag_filter_matches_one_tag_of_many(session_factory, user_id):
+    db = session_factory()
+    user = db.get(models.User, user_id)
+    db.add_all([
+        models.ReadingItem(user_id=user_id, title="both", tags=["x", "y"]),
+        models.ReadingItem(user_id=user_id, title="only y", tags=["y"]),
+        models.ReadingItem(user_id=user_id, title="prefix", tags=["xx"]),
+        models.ReadingItem(user_id=user_id, title="untagged", tags=None),
+    ])
+    db.commit()
+
+    assert list_items(db, user, tag="x") == ["both"]
+    assert list_items(db, user, tag="y") == ["both", "only y"]
+    assert list_items(db, user, tag="z") == []
+    db.close()
@@ -0,0 +1,91 @@
+# backend/tests/test_replicas.py
+import time
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base
+from app import models
+from app.replicas import LAST_WRITE_HEADER, LastWriteMiddleware, ReplicaRouter, parse_last_write
+
+
+@pytest.fixture
+def databases(tmp_path):
+    """A primary and a replica SQLite file; the replica hasn't caught up with the last write."""
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    for engine in (primary, replica):
+        Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=primary)()
+    user = models.User(email="a@example.com", username="a", hashed_password="x")
+    db.add(user)
+    db.flush()
+    db.add(models.Task(title="Just written", owner_id=user.id))
+    db.commit()
+    user_id = user.id
+    db.close()
+    yield primary, replica, user_id
+    primary.dispose()
+    replica.dispose()
+
+
+def worker(replica) -> ReplicaRouter:
+    router = ReplicaRouter([replica], sticky_seconds=5)
+    router.lag = [0.0]
+    return router
+
+
+def task_titles(router: ReplicaRouter, primary, user_id: int, last_write=None):
+    db = router.read_session(user_id, last_write) or sessionmaker(bind=primary)()
+    try:
+        return [title for title, in db.query(models.Task.title).filter(models.Task.owner_id == user_id)]
+    finally:
+        db.close()
+
+
+def test_last_write_token_keeps_reads_on_the_primary_in_another_worker(databases):
+    primary, replica, user_id = databases
+    wrote, other = worker(replica), worker(replica)
+    wrote.mark_write(user_id)
+
+    assert task_titles(wrote, primary, user_id) == ["Just written"]
+    # Without the token the other worker knows nothing of the write
+    assert task_titles(other, primary, user_id) == []
+    assert task_titles(other, primary, user_id, last_write=time.time()) == ["Just written"]
+
+
+def test_stale_or_far_future_tokens_are_ignored(databases):
+    primary, replica, user_id = databases
+    router = worker(replica)
+
+    assert router.choose(user_id, time.time() - 60) == (replica, "replica")
+    assert router.choose(user_id, time.time() + 3600) == (replica, "replica")
+    assert router.choose(user_id, time.time() - 1) == (None, "recent_write")
+
+
+def test_middleware_stamps_successful_writes_only():
+    app = FastAPI()
+
+    @app.post("/ok")
+    def write_ok():
+        return {}
+
+    @app.post("/bad")
+    def write_bad():
+        raise HTTPException(status_code=400, detail="no")
+
+    @app.get("/read")
+    def read():
+        return {}
+
+    app.add_middleware(LastWriteMiddleware)
+    client = TestClient(app)
+
+    stamp = parse_last_write(client.post("/ok").headers.get(LAST_WRITE_HEADER))
+    assert stamp is not None and abs(stamp - time.time()) < 5
+    assert LAST_WRITE_HEADER not in client.post("/bad").headers
+    assert LAST_WRITE_HEADER not in client.get("/read").headers
+    assert parse_last_write("garbage") is None
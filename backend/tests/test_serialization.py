@@ -0,0 +1,29 @@
+# backend/tests/test_serialization.py
+from datetime import date, datetime, timezone
+
+import pytest
+
+from app import serialization
+
+ROW = {
+    "due_date": datetime(2024, 1, 1, 12, 0),
+    "completed_at": datetime(2024, 1, 1, 12, 0, 30, 250000, tzinfo=timezone.utc),
+    "day": date(2024, 1, 1),
+}
+
+
+def test_stdlib_fallback_writes_iso_datetimes(monkeypatch):
+    monkeypatch.setattr(serialization, "orjson", None)
+
+    assert serialization.encode_json(ROW) == (
+        b'{"due_date":"2024-01-01T12:00:00","completed_at":"2024-01-01T12:00:30.250000+00:00","day":"2024-01-01"}'
+    )
+
+
+def test_stdlib_fallback_matches_orjson(monkeypatch):
+    if serialization.orjson is None:
+        pytest.skip("orjson not installed")
+    expected = serialization.encode_json(ROW)
+    monkeypatch.setattr(serialization, "orjson", None)
+
+    assert serialization.encode_json(ROW) == expected
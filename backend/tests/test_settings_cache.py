@@ -0,0 +1,75 @@
+# backend/tests/test_settings_cache.py
+from sqlalchemy import event
+
+from app import models
+from app.services import versioning
+from app.services.settings_cache import SettingsInvalidationPoller
+
+
+class RecordingCache:
+    def __init__(self):
+        self.invalidated = []
+
+    def clear(self):
+        pass
+
+    def invalidate(self, user_ids, source=None):
+        self.invalidated.append(sorted(user_ids))
+
+
+def log(session_factory, seq, user_id, resource=versioning.SETTINGS):
+    db = session_factory()
+    db.add(models.ChangeLogEntry(seq=seq, user_id=user_id, resource=resource, entity_id=1))
+    db.commit()
+    db.close()
+
+
+def test_change_committed_below_the_last_seen_seq_is_not_skipped(session_factory):
+    cache = RecordingCache()
+    poller = SettingsInvalidationPoller(session_factory, cache=cache, gap_timeout=60)
+    poller.poll_once()
+
+    # seq 2 is still in flight when seq 1 and 3 are polled
+    log(session_factory, 1, 10)
+    log(session_factory, 3, 30)
+    poller.poll_once()
+    assert cache.invalidated == [[10, 30]]
+    assert poller.last_seq == 3
+    assert list(poller._gaps) == [2]
+
+    log(session_factory, 2, 20)
+    log(session_factory, 4, 40, versioning.TASKS)
+    poller.poll_once()
+    assert cache.invalidated == [[10, 30], [20]]
+    assert poller.last_seq == 4
+    assert poller._gaps == {}
+
+    poller.poll_once()
+    assert cache.invalidated == [[10, 30], [20]]
+
+
+def test_gap_is_given_up_after_the_timeout(session_factory):
+    cache = RecordingCache()
+    poller = SettingsInvalidationPoller(session_factory, cache=cache, gap_timeout=0)
+    poller.poll_once()
+
+    # seq 1 rolled back
+    log(session_factory, 2, 20)
+    poller.poll_once()
+    assert poller.last_seq == 2
+    assert cache.invalidated == [[20]]
+
+
+def test_polls_read_only_new_rows_and_open_gaps(engine, session_factory):
+    poller = SettingsInvalidationPoller(session_factory, cache=RecordingCache(), gap_timeout=60)
+    poller.poll_once()
+    log(session_factory, 1, 10)
+    log(session_factory, 3, 30, versioning.TASKS)
+    poller.poll_once()
+
+    queried = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, params, *args: queried.append(params))
+    poller.poll_once()
+
+    # Only seq 2 (still missing) and anything after 3, not rows 1 and 3 again
+    assert queried == [(3, 2)]
@@ -0,0 +1,52 @@
+# backend/tests/test_sync.py
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+
+from app import models, schemas
+from app.routers import sync
+from app.services import versioning
+
+
+def push(session_factory, user_id, *mutations):
+    db = session_factory()
+    try:
+        user = db.get(models.User, user_id)
+        request = schemas.SyncPushRequest(mutations=[schemas.SyncMutation(**m) for m in mutations])
+        return sync.push_changes(request, current_user=user, db=db)
+    finally:
+        db.close()
+
+
+def test_failing_mutation_only_fails_itself(session_factory, user_id, monkeypatch):
+    created = push(
+        session_factory, user_id,
+        {"resource": "tasks", "op": "create", "client_ref": "a", "data": {"title": "Keep"}},
+        {"resource": "tasks", "op": "create", "client_ref": "b", "data": {"title": "Also keep"}},
+    )
+    first, second = (result["id"] for result in created["results"])
+
+    def apply_task_update(db, task, update_data):
+        if task.id == first:
+            raise HTTPException(status_code=400, detail="Invalid recurrence pattern")
+        if task.id == second:
+            raise IntegrityError("UPDATE tasks", {}, Exception("NOT NULL constraint failed: tasks.title"))
+        task.title = update_data["title"]
+
+    monkeypatch.setattr(sync, "apply_task_update", apply_task_update)
+    response = push(
+        session_factory, user_id,
+        {"resource": "tasks", "op": "update", "id": first, "data": {"title": "x"}},
+        {"resource": "tasks", "op": "update", "id": second, "data": {"title": "y"}},
+        {"resource": "tasks", "op": "create", "client_ref": "c", "data": {"title": "New"}},
+    )
+
+    assert [result["status"] for result in response["results"]] == ["error", "error", "applied"]
+    assert response["results"][0]["detail"] == "Invalid recurrence pattern"
+    assert "NOT NULL" in response["results"][1]["detail"]
+    db = session_factory()
+    assert sorted(title for title, in db.query(models.Task.title)) == ["Also keep", "Keep", "New"]
+    # Only the applied mutations were logged
+    assert db.query(models.ChangeLogEntry).filter(
+        models.ChangeLogEntry.resource == versioning.TASKS
+    ).count() == 3
+    db.close()
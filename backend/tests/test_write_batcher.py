@@ -0,0 +1,80 @@
+# backend/tests/test_write_batcher.py
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy import create_engine
+
+from app import models
+from app.db import Base
+from app.services import write_batcher as write_batcher_module
+from app.services.write_batcher import WriteBatcher
+
+
+@pytest.fixture
+def batcher(tmp_path, monkeypatch):
+    """A running batcher on its own file database (the batch engine needs a real file)."""
+    url = f"sqlite:///{tmp_path}/batch.db"
+    schema_engine = create_engine(url)
+    Base.metadata.create_all(bind=schema_engine)
+    schema_engine.dispose()
+    monkeypatch.setattr(write_batcher_module, "DATABASE_URL", url)
+    # Long enough that every submit below lands in one batch
+    batcher = WriteBatcher(window_ms=200)
+    batcher.start()
+    yield batcher
+    asyncio.run(batcher.stop())
+
+
+def add_user(name, fail=False):
+    def work(db):
+        db.add(models.User(email=f"{name}@example.com", username=name, hashed_password="x"))
+        db.flush()
+        if fail:
+            raise ValueError(name)
+        return name
+    return work
+
+
+def submit_all(batcher, works):
+    results = [None] * len(works)
+
+    def run(index, work):
+        try:
+            results[index] = batcher.submit(work)
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=run, args=(index, work)) for index, work in enumerate(works)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def usernames(batcher):
+    db = batcher.session_factory()
+    try:
+        return sorted(name for (name,) in db.query(models.User.username))
+    finally:
+        db.close()
+
+
+def test_concurrent_writes_share_one_transaction(batcher):
+    results = submit_all(batcher, [add_user(f"user{i}") for i in range(4)])
+
+    assert results == ["user0", "user1", "user2", "user3"]
+    assert usernames(batcher) == ["user0", "user1", "user2", "user3"]
+    assert batcher.stats["batches"] == 1
+    assert batcher.stats["writes"] == 4
+
+
+def test_failing_write_rolls_back_only_its_savepoint(batcher):
+    results = submit_all(batcher, [add_user("before"), add_user("broken", fail=True), add_user("after")])
+
+    assert results[0] == "before" and results[2] == "after"
+    assert isinstance(results[1], ValueError)
+    assert usernames(batcher) == ["after", "before"]
+    assert batcher.stats["batches"] == 1
+    assert batcher.stats["failed_writes"] == 1
@@ -11,6 +11,10 @@ const apiClient = axios.create({
   },
 })
 
+// Time of our last write, as reported by the server; sent back so reads
+// right after a write aren't served by a lagging read replica
+let lastWrite = null
+
 // Add auth token to requests
 apiClient.interceptors.request.use(
   (config) => {
@@ -18,6 +22,9 @@ apiClient.interceptors.request.use(
     if (token) {
       config.headers.Authorization = `Bearer ${token}`
     }
+    if (lastWrite) {
+      config.headers['X-Last-Write'] = lastWrite
+    }
     return config
   },
   (error) => {
@@ -27,7 +34,12 @@ apiClient.interceptors.request.use(
 
 // Handle auth errors
 apiClient.interceptors.response.use(
-  (response) => response,
+  (response) => {
+    if (response.headers['x-last-write']) {
+      lastWrite = response.headers['x-last-write']
+    }
+    return response
+  },
   (error) => {
     if (error.response?.status === 401) {
       localStorage.removeItem('token')